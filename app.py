@@ -5,82 +5,129 @@ Este módulo orquestra todos os componentes da aplicação de forma limpa e orga
 """
 
 import streamlit as st
-from src.config import config
-from src.services.pdf_processor import PDFProcessorService
+from src.services.agregados import AgregadosService
+from src.services.anotacoes import AnotacaoService
 from src.services.data_filter import DataFilterService
+from src.services.dataset_session import DatasetAtivo, DatasetSessionService
+from src.services.resumo_clientes import ResumoClientesService
 from src.ui.sidebar import SidebarComponents
 from src.ui.main_view import MainViewComponents
+from src.utils import perfil
 
 
-@st.cache_data
-def carregar_dados(arquivo_upload):
+def carregar_dataset() -> DatasetAtivo:
     """
-    Carrega os dados do relatório com cache do Streamlit.
-    
-    Args:
-        arquivo_upload: Arquivo enviado via upload ou None
-        
+    Resolve o dataset da sessão; roda apenas no rerun completo do app.
+
+    Carrega exatamente um dataset por rerun: o upload (um ou mais PDFs,
+    mesclados), se houver, ou o CSV padrão. O DataFrame preparado vem do cache da camada de sessão.
+
     Returns:
-        DataFrame com os dados carregados
+        Dataset ativo da sessão
     """
-    if arquivo_upload is not None:
-        return PDFProcessorService.processar_arquivo_upload(arquivo_upload)
-    
-    return PDFProcessorService.carregar_dados_padrao()
+    # Upload de arquivos (primeiro componente da sidebar)
+    arquivos_upload = SidebarComponents.upload_arquivos()
 
+    # Resolver o dataset do rerun (já preparado para os filtros)
+    return DatasetSessionService.resolver(arquivos_upload)
 
-def processar_dados():
+
+@st.fragment
+def processar_dados(dataset: DatasetAtivo, area_resultados) -> None:
     """
-    Processa os dados principais da aplicação.
-    
-    Returns:
-        Tupla com (dataframe_filtrado, nome_arquivo_processado)
+    Constrói os filtros, aplica-os e exibe os resultados.
+
+    É um fragmento chamado dentro de ``with st.sidebar``: mexer em um filtro
+    reexecuta só esta função, sem recarregar o dataset nem recalcular as
+    opções dos filtros.
+
+    Args:
+        dataset: Dataset ativo da sessão
+        area_resultados: Placeholder no corpo principal para os resultados
     """
-    # Carregar dados iniciais
-    df_inicial = carregar_dados(None)  # Carregar dados padrão primeiro
-    
-    if df_inicial.empty:
-        return df_inicial, None
-    
-    # Preparar dados para filtros
-    df_preparado = DataFilterService.preparar_dados_para_filtros(df_inicial)
-    
+    # Perfil do rerun (só quando pedido; no rerun completo já foi aberto)
+    perfil.iniciar("fragmento")
+
     # Construir sidebar e obter filtros
-    arquivo_upload, filtros = SidebarComponents.construir_sidebar(df_preparado)
-    
-    # Recarregar dados se novo arquivo foi enviado
-    if arquivo_upload is not None:
-        df_novo = carregar_dados(arquivo_upload)
-        if df_novo is not None and not df_novo.empty:
-            df_preparado = DataFilterService.preparar_dados_para_filtros(df_novo)
-            nome_arquivo = PDFProcessorService.obter_nome_arquivo_processado(arquivo_upload)
-        else:
-            nome_arquivo = None
-    else:
-        nome_arquivo = None
-    
-    # Aplicar filtros
-    df_filtrado = DataFilterService.aplicar_filtros(df_preparado, filtros)
-    
-    return df_filtrado, nome_arquivo
+    filtros = SidebarComponents.construir_sidebar(dataset)
+
+    # Ordenação da tabela: ordem do dataset inteiro, em cache por versão
+    chaves_ordenacao = SidebarComponents.controles_ordenacao()
+    permutacao = None
+    if chaves_ordenacao:
+        with perfil.etapa("permutacao_ordenacao"):
+            permutacao = DatasetSessionService.permutacao(dataset, chaves_ordenacao)
+
+    # Aplicar filtros (já na ordem pedida) e mesclar as anotações persistentes
+    with perfil.etapa("carregar_anotacoes"):
+        anotacoes = AnotacaoService.carregar()
+    with perfil.etapa("aplicar_filtros"):
+        df_filtrado = DataFilterService.aplicar_filtros(
+            dataset.df, filtros, anotacoes=anotacoes,
+            dias_atraso=DatasetSessionService.dias_atraso(dataset),
+            permutacao=permutacao
+        )
+
+    # Gráficos: fatias dos agregados do dataset, não das linhas filtradas
+    with perfil.etapa("graficos"):
+        graficos = AgregadosService.graficos(
+            DatasetSessionService.agregados(dataset), filtros,
+            lojas_clientes=DatasetSessionService.lojas_agregados(dataset)
+        )
+
+    # Maiores devedores: resumo por cliente da versão, sem voltar aos títulos
+    with perfil.etapa("resumo_clientes"):
+        devedores = ResumoClientesService.maiores_devedores(
+            DatasetSessionService.resumo_clientes(dataset), filtros,
+            lojas=DatasetSessionService.lojas_resumo(dataset)
+        )
+
+    # Exibir resultados no corpo principal
+    MainViewComponents.exibir_interface_principal(df_filtrado, area_resultados, graficos, devedores)
+
+    # Botão de download (widget: fica no corpo do fragmento)
+    if not df_filtrado.empty:
+        with perfil.etapa("botao_download"):
+            MainViewComponents.botao_download(df_filtrado)
+
+    # Relatório do perfil na sidebar
+    registro = perfil.finalizar()
+    if registro is not None:
+        SidebarComponents.relatorio_perfil(registro, perfil.historico())
 
 
 def main():
     """Função principal da aplicação."""
     # Configurar página
     MainViewComponents.configurar_pagina()
-    
+    perfil.iniciar("completo", forcar=True)
+
     try:
-        # Processar dados
-        df_filtrado, nome_arquivo = processar_dados()
-        
-        # Exibir interface principal
-        MainViewComponents.exibir_interface_principal(df_filtrado, nome_arquivo)
-        
+        # Carregar dados
+        with perfil.etapa("carregar_dataset"):
+            dataset = carregar_dataset()
+
+        # Cabeçalho e estado do upload
+        MainViewComponents.exibir_cabecalho(
+            dataset.nome_arquivo, dataset.job, DatasetSessionService.rejeicoes(dataset)
+        )
+        area_resultados = st.empty()
+
+        if dataset.df.empty:
+            area_resultados.warning("Nenhum dado encontrado com os filtros aplicados.")
+            return
+
+        # Filtros e resultados (rerun parcial)
+        with st.sidebar:
+            processar_dados(dataset, area_resultados)
+
+        # Anotações por título (fora do fragmento)
+        MainViewComponents.formulario_anotacao(dataset.df, AnotacaoService.carregar())
+
     except Exception as e:
         MainViewComponents.exibir_erro(f"Erro inesperado na aplicação: {str(e)}")
         st.exception(e)  # Para debug em desenvolvimento
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,223 @@
+# benchmarks/despacho_cobranca.py
+
+"""
+Exercita o despachante de cobranças contra um servidor stub local.
+
+O stub aceita POSTs em http://127.0.0.1:<porta>/cobrancas, responde 503 em
+uma fração das primeiras tentativas (para exercitar as novas tentativas),
+sempre 503 para algumas chaves e 400 para outras, e registra cada requisição
+(instante, cabeçalhos, corpo e requisições simultâneas). Além da vazão,
+confere o comportamento do despachante:
+    - cabeçalho Host com a porta do stub;
+    - Idempotency-Key igual à chave do corpo e à de (cliente, período);
+    - cada falha temporária repetida até ser aceita, uma vez por chave;
+    - 503 permanente repetido exatamente --tentativas vezes e 400 sem nova
+      tentativa, ambos nas falhas do relatório;
+    - no máximo --por-segundo requisições em qualquer janela de 1 s (com 10%
+      de folga para o agendamento);
+    - no máximo --concorrencia requisições simultâneas.
+
+Uso:
+    python benchmarks/despacho_cobranca.py [--clientes 500] [--por-segundo 200]
+        [--concorrencia 8] [--taxa-falha 0.1] [--tentativas 3] [--atraso-ms 5]
+
+Imprime a vazão em mensagens por segundo e sai com código 1 se alguma das
+verificações falhar.
+"""
+
+import argparse
+import bisect
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.cobranca import CobrancaService  # noqa: E402
+from src.services.despachante import ConfigDespacho, despachar_cobrancas  # noqa: E402
+
+# Chaves que o stub recusa sempre com 503 e com 400
+CHAVES_PERMANENTES = 2
+
+
+class _Stub(BaseHTTPRequestHandler):
+    aceitas: Counter = Counter()
+    recusadas: Counter = Counter()
+    recebidas: Counter = Counter()
+    requisicoes: list = []
+    sempre_503: set = set()
+    sempre_400: set = set()
+    taxa_falha = 0.0
+    atraso = 0.0
+    simultaneas = 0
+    max_simultaneas = 0
+    lock = threading.Lock()
+
+    def do_POST(self) -> None:
+        with _Stub.lock:
+            _Stub.simultaneas += 1
+            _Stub.max_simultaneas = max(_Stub.max_simultaneas, _Stub.simultaneas)
+        try:
+            instante = time.monotonic()
+            corpo = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            chave = self.headers["Idempotency-Key"]
+            time.sleep(_Stub.atraso)
+            with _Stub.lock:
+                _Stub.recebidas[chave] += 1
+                _Stub.requisicoes.append((instante, self.headers["Host"], chave, corpo))
+                if chave in _Stub.sempre_503:
+                    status = 503
+                elif chave in _Stub.sempre_400:
+                    status = 400
+                elif not _Stub.recusadas[chave] and random.random() < _Stub.taxa_falha:
+                    _Stub.recusadas[chave] += 1
+                    status = 503
+                else:
+                    _Stub.aceitas[chave] += 1
+                    status = 202
+        finally:
+            with _Stub.lock:
+                _Stub.simultaneas -= 1
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _dados_sinteticos(clientes: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = clientes * 5
+    return pd.DataFrame({
+        "Cliente": [f"CLIENTE {i}" for i in rng.integers(0, clientes, n)],
+        "Título": np.arange(n).astype(str),
+        "Vencimento": pd.Timestamp.today().normalize() - pd.to_timedelta(rng.integers(1, 400, n), unit="D"),
+        "R$ Total": rng.uniform(10, 5000, n).round(2),
+    })
+
+
+def _maximo_por_janela(instantes: list, janela: float = 1.0) -> int:
+    """Maior quantidade de requisições em qualquer janela de ``janela`` segundos."""
+    ordenados = sorted(instantes)
+    return max(
+        (bisect.bisect_left(ordenados, t + janela) - i for i, t in enumerate(ordenados)),
+        default=0
+    )
+
+
+def verificar(mensagens: list, relatorio, args, host: str) -> list:
+    """
+    Confere o comportamento do despachante a partir do que o stub registrou.
+
+    Args:
+        mensagens: Payloads enviados
+        relatorio: RelatorioDespacho do lote
+        args: Argumentos da linha de comando
+        host: Cabeçalho Host esperado
+
+    Returns:
+        Lista de falhas (vazia se tudo estiver certo)
+    """
+    falhas = []
+    chaves = [m["chave"] for m in mensagens]
+    permanentes = _Stub.sempre_503 | _Stub.sempre_400
+    com_sucesso = [c for c in chaves if c not in permanentes]
+
+    hosts = {h for _, h, _, _ in _Stub.requisicoes}
+    if hosts != {host}:
+        falhas.append(f"cabeçalho Host {sorted(hosts)} em vez de {host!r}")
+
+    if len(set(chaves)) != len(chaves):
+        falhas.append("chave de idempotência repetida entre mensagens")
+    divergentes = [
+        chave for _, _, chave, corpo in _Stub.requisicoes
+        if chave != corpo["chave"] or chave != CobrancaService.chave_idempotencia(corpo["cliente"], corpo["periodo"])
+    ]
+    if divergentes:
+        falhas.append(f"{len(divergentes)} Idempotency-Key diferente(s) da chave de (cliente, período)")
+
+    if relatorio.enviados != len(com_sucesso) or any(_Stub.aceitas[c] != 1 for c in com_sucesso):
+        falhas.append(f"{relatorio.enviados} de {len(com_sucesso)} mensagens aceitas uma única vez")
+    if relatorio.tentativas_extras != sum(_Stub.recusadas.values()):
+        falhas.append(
+            f"{relatorio.tentativas_extras} novas tentativas para {sum(_Stub.recusadas.values())} falhas temporárias"
+        )
+
+    chaves_com_falha = {chave for chave, _ in relatorio.falhas}
+    if chaves_com_falha != permanentes:
+        falhas.append(f"falhas do relatório ({len(chaves_com_falha)}) diferentes das recusas permanentes")
+    if any(_Stub.recebidas[c] != args.tentativas for c in _Stub.sempre_503):
+        falhas.append(f"503 permanente não repetido exatamente {args.tentativas} vezes")
+    if any(_Stub.recebidas[c] != 1 for c in _Stub.sempre_400):
+        falhas.append("400 repetido (não é falha temporária)")
+
+    por_janela = _maximo_por_janela([t for t, _, _, _ in _Stub.requisicoes])
+    if por_janela > args.por_segundo * 1.1 + 1:
+        falhas.append(f"{por_janela} requisições em 1 s com limite de {args.por_segundo}/s")
+    if _Stub.max_simultaneas > args.concorrencia:
+        falhas.append(f"{_Stub.max_simultaneas} requisições simultâneas com limite de {args.concorrencia}")
+
+    return falhas
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=500)
+    parser.add_argument("--por-segundo", type=float, default=200.0)
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--taxa-falha", type=float, default=0.1)
+    parser.add_argument("--tentativas", type=int, default=3)
+    parser.add_argument("--atraso-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    _Stub.taxa_falha = args.taxa_falha
+    _Stub.atraso = args.atraso_ms / 1000
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    porta = servidor.server_address[1]
+    url = f"http://127.0.0.1:{porta}/cobrancas"
+
+    resumos = CobrancaService.montar_resumos(_dados_sinteticos(args.clientes))
+    mensagens = CobrancaService.para_mensagens(resumos)
+    _Stub.sempre_503 = {m["chave"] for m in mensagens[:CHAVES_PERMANENTES]}
+    _Stub.sempre_400 = {m["chave"] for m in mensagens[CHAVES_PERMANENTES:2 * CHAVES_PERMANENTES]}
+
+    relatorio = despachar_cobrancas(mensagens, ConfigDespacho(
+        url=url,
+        concorrencia=args.concorrencia,
+        por_segundo=args.por_segundo,
+        tentativas=args.tentativas,
+        espera_inicial=0.05,
+    ))
+    servidor.shutdown()
+
+    print(json.dumps({
+        "mensagens": len(mensagens),
+        "enviadas": relatorio.enviados,
+        "falhas": len(relatorio.falhas),
+        "novas_tentativas": relatorio.tentativas_extras,
+        "duracao_s": round(relatorio.duracao, 3),
+        "mensagens_por_segundo": round(relatorio.mensagens_por_segundo, 1),
+        "limite_por_segundo": args.por_segundo,
+        "max_requisicoes_em_1s": _maximo_por_janela([t for t, _, _, _ in _Stub.requisicoes]),
+        "max_simultaneas": _Stub.max_simultaneas,
+        "limite_concorrencia": args.concorrencia,
+    }, indent=2, ensure_ascii=False))
+
+    falhas = verificar(mensagens, relatorio, args, f"127.0.0.1:{porta}")
+    for falha in falhas:
+        print(f"[REGRESSÃO] {falha}", file=sys.stderr)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+# benchmarks/ingestao_http.py
+
+"""
+Exercita a API de ingestão (``src/api/ingestao.py``) inteiramente em localhost.
+
+Copia src/ para um diretório temporário (sem tocar nos dados reais), inicia
+ali ``python -m src.api.cli receber`` e envia ao mesmo tempo vários
+relatórios sintéticos distintos (``benchmarks/pdf_sintetico.py``), mais do que
+a fila aceita. Cada envio recusado com 429 espera o Retry-After e tenta de
+novo. Enquanto os PDFs são processados, uma thread consulta a rota de status
+sem parar. Mede:
+    - tempo até o 202 de cada envio aceito (o PDF já gravado em disco);
+    - recusas 429 (a fila precisa recusar quando há mais envios que vagas);
+    - latência da rota de status durante o parsing (o laço não pode travar);
+    - tempo total até todas as versões publicadas.
+
+Antes da carga, envia um corpo que não é PDF, que precisa receber 415. Ao
+fim, consulta a rota de status de cada job aceito.
+
+Uso:
+    python benchmarks/ingestao_http.py [--envios 6] [--fila 2] [--processos 2]
+        [--titulos 3000] [--limite-status-ms 100]
+
+Sai com código 1 se o corpo que não é PDF não receber 415, se algum 202 não
+trouxer o job e sua rota de status, se algum 429 vier sem Retry-After, se
+algum job não chegar a "concluido" com versão publicada na própria rota de
+status, se nenhum envio for recusado com mais envios que vagas ou se o p95 da
+rota de status passar do limite informado.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ / "benchmarks"))
+
+from pdf_sintetico import gerar_pdf  # noqa: E402
+
+_SCRIPT_CONFERIR = """
+from pathlib import Path
+from src.config import config
+destino = Path.cwd().resolve()
+for caminho in (config.CAMINHO_CSV, config.CAMINHO_MEDIA):
+    if destino not in Path(caminho).resolve().parents:
+        raise SystemExit(f"{caminho} fora da cópia")
+"""
+
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _requisicao(porta: int, metodo: str, caminho: str, corpo: bytes = None):
+    conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=120)
+    try:
+        conexao.request(metodo, caminho, body=corpo, headers={"Content-Type": "application/pdf"} if corpo else {})
+        resposta = conexao.getresponse()
+        return resposta.status, dict(resposta.getheaders()), json.loads(resposta.read() or b"{}")
+    finally:
+        conexao.close()
+
+
+def _percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    posicao = (len(ordenados) - 1) * p / 100
+    base = int(posicao)
+    proximo = min(base + 1, len(ordenados) - 1)
+    return ordenados[base] + (ordenados[proximo] - ordenados[base]) * (posicao - base)
+
+
+def medir(envios: int, fila: int, processos: int, titulos: int) -> dict:
+    """
+    Inicia a API em uma cópia do código e envia os relatórios.
+
+    Args:
+        envios: Relatórios enviados ao mesmo tempo
+        fila: Fila máxima da API (--fila)
+        processos: Processos de parsing (--processos)
+        titulos: Títulos por relatório
+
+    Returns:
+        Dicionário com as medidas e os jobs
+    """
+    pdfs = [gerar_pdf(titulos, semente=k, inicio_titulo=100000 + k * titulos) for k in range(envios)]
+    porta = _porta_livre()
+
+    with tempfile.TemporaryDirectory(prefix="ingestao-") as temporario:
+        destino = Path(temporario)
+        shutil.copytree(RAIZ / "src", destino / "src", ignore=shutil.ignore_patterns("__pycache__"))
+        ambiente = {**os.environ, "PYTHONPATH": str(destino)}
+        subprocess.run([sys.executable, "-c", _SCRIPT_CONFERIR], cwd=destino, env=ambiente, check=True)
+
+        servidor = subprocess.Popen(
+            [sys.executable, "-m", "src.api.cli", "receber", "--porta", str(porta),
+             "--fila", str(fila), "--processos", str(processos)],
+            cwd=destino, env=ambiente, stdout=subprocess.DEVNULL
+        )
+        try:
+            for _ in range(200):
+                try:
+                    _requisicao(porta, "GET", "/saude")
+                    break
+                except OSError:
+                    time.sleep(0.05)
+
+            status_nao_pdf, _, _ = _requisicao(porta, "POST", "/ingestao?nome=texto.pdf", b"nao sou um PDF" * 100)
+
+            aceites, recusas, jobs = [], [], {}
+            respostas_202_invalidas, sem_retry_after = 0, 0
+            lock = threading.Lock()
+
+            def enviar(k: int) -> None:
+                nonlocal respostas_202_invalidas, sem_retry_after
+                while True:
+                    inicio = time.perf_counter()
+                    status, cabecalhos, corpo = _requisicao(porta, "POST", f"/ingestao?nome=loja{k}.pdf", pdfs[k])
+                    decorrido = (time.perf_counter() - inicio) * 1000
+                    with lock:
+                        if status == 202:
+                            aceites.append(decorrido)
+                            jobs[corpo["job"]] = None
+                            if corpo.get("status") != f"/ingestao/{corpo['job']}":
+                                respostas_202_invalidas += 1
+                            return
+                        recusas.append(status)
+                        if status == 429 and not cabecalhos.get("Retry-After", "").isdigit():
+                            sem_retry_after += 1
+                    if status != 429:
+                        return
+                    espera = cabecalhos.get("Retry-After", "")
+                    time.sleep(int(espera) if espera.isdigit() else 1)
+
+            consultas = []
+            terminou = threading.Event()
+
+            def consultar() -> None:
+                while not terminou.is_set():
+                    inicio = time.perf_counter()
+                    _, _, corpo = _requisicao(porta, "GET", "/ingestao")
+                    consultas.append((time.perf_counter() - inicio) * 1000)
+                    with lock:
+                        for job in corpo["jobs"]:
+                            if job["job"] in jobs:
+                                jobs[job["job"]] = job
+                    time.sleep(0.02)
+
+            inicio = time.perf_counter()
+            consultor = threading.Thread(target=consultar, daemon=True)
+            consultor.start()
+            threads = [threading.Thread(target=enviar, args=(k,)) for k in range(envios)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            while True:
+                with lock:
+                    if all(job and job["status"] != "executando" for job in jobs.values()):
+                        break
+                time.sleep(0.05)
+            total = time.perf_counter() - inicio
+            terminou.set()
+            consultor.join()
+            finais = [_requisicao(porta, "GET", f"/ingestao/{chave}")[2] for chave in jobs]
+        finally:
+            servidor.send_signal(signal.SIGTERM)
+            servidor.wait(timeout=120)
+
+    return {
+        "envios": envios,
+        "fila": fila,
+        "processos": processos,
+        "titulos_por_envio": titulos,
+        "aceite_p50_ms": round(_percentil(aceites, 50), 1),
+        "aceite_p95_ms": round(_percentil(aceites, 95), 1),
+        "status_nao_pdf": status_nao_pdf,
+        "respostas_202_invalidas": respostas_202_invalidas,
+        "recusas_429": recusas.count(429),
+        "recusas_429_sem_retry_after": sem_retry_after,
+        "outras_recusas": [s for s in recusas if s != 429],
+        "consultas_status": len(consultas),
+        "status_p50_ms": round(_percentil(consultas, 50), 1),
+        "status_p95_ms": round(_percentil(consultas, 95), 1),
+        "total_s": round(total, 2),
+        "paginas_por_s": round(sum(j["total_paginas"] for j in finais) / total, 1),
+        "duracao_job_mediana_s": round(statistics.median(j["duracao_s"] for j in finais), 2) if finais else None,
+        "jobs": [
+            {"arquivo": j["arquivo"], "status": j["status"], "titulos": j["titulos_encontrados"],
+             "versao": j["versao"], "erro": j["erro"]}
+            for j in finais
+        ],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--envios", type=int, default=6)
+    parser.add_argument("--fila", type=int, default=2)
+    parser.add_argument("--processos", type=int, default=2)
+    parser.add_argument("--titulos", type=int, default=3000)
+    parser.add_argument("--limite-status-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    resultado = medir(args.envios, args.fila, args.processos, args.titulos)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+    falhas = []
+    if resultado["status_nao_pdf"] != 415:
+        falhas.append(f"corpo que não é PDF recebeu {resultado['status_nao_pdf']} em vez de 415")
+    if resultado["respostas_202_invalidas"]:
+        falhas.append(f"{resultado['respostas_202_invalidas']} resposta(s) 202 sem o job e sua rota de status")
+    if resultado["recusas_429_sem_retry_after"]:
+        falhas.append(f"{resultado['recusas_429_sem_retry_after']} recusa(s) 429 sem Retry-After")
+    incompletos = [j["arquivo"] for j in resultado["jobs"] if j["status"] != "concluido" or not j["versao"]]
+    if incompletos or len(resultado["jobs"]) != args.envios or resultado["outras_recusas"]:
+        falhas.append(f"envios não concluídos com versão publicada: {incompletos or resultado['outras_recusas']}")
+    if args.envios > args.fila and not resultado["recusas_429"]:
+        falhas.append("nenhum envio recusado com a fila cheia")
+    if args.limite_status_ms and resultado["status_p95_ms"] > args.limite_status_ms:
+        falhas.append(f"p95 da rota de status acima de {args.limite_status_ms} ms")
+
+    for falha in falhas:
+        print(f"[REGRESSÃO] {falha}", file=sys.stderr)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# benchmarks/inicializacao.py
+
+"""
+Benchmark de partida a frio do app.
+
+Mede, em processos novos (sem cache de módulos nem do Streamlit):
+    - o tempo de ``import app``;
+    - o tempo até a primeira renderização completa (AppTest);
+    - se dependências pesadas de PDF foram importadas sem necessidade.
+
+Uso:
+    python benchmarks/inicializacao.py [--repeticoes 5]
+        [--limite-import-ms 1500] [--limite-primeira-ms 5000]
+
+Sai com código 1 se algum limite for excedido ou se o ``pdfplumber`` for
+carregado na partida, para que regressões sejam detectadas.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Módulos que só devem ser carregados quando um PDF é processado
+MODULOS_PESADOS = ["pdfplumber", "pdfminer"]
+
+_SCRIPT_IMPORT = f"""
+import json, sys, time
+sys.path.insert(0, {str(RAIZ)!r})
+inicio = time.perf_counter()
+import app
+duracao = time.perf_counter() - inicio
+print(json.dumps({{
+    "ms": duracao * 1000,
+    "pesados": [m for m in {MODULOS_PESADOS!r} if m in sys.modules],
+}}))
+"""
+
+_SCRIPT_PRIMEIRA = f"""
+import json, sys, time
+sys.path.insert(0, {str(RAIZ)!r})
+from streamlit.testing.v1 import AppTest
+inicio = time.perf_counter()
+at = AppTest.from_file({str(RAIZ / "app.py")!r}, default_timeout=600)
+at.run()
+duracao = time.perf_counter() - inicio
+print(json.dumps({{"ms": duracao * 1000, "erro": bool(at.exception)}}))
+"""
+
+
+def _executar(script: str) -> dict:
+    resultado = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(resultado.stdout.strip().splitlines()[-1])
+
+
+def medir(repeticoes: int) -> dict:
+    """
+    Executa as medições em processos novos.
+
+    Args:
+        repeticoes: Número de processos por medição
+
+    Returns:
+        Dicionário com medianas e módulos pesados detectados
+    """
+    imports = [_executar(_SCRIPT_IMPORT) for _ in range(repeticoes)]
+    primeiras = [_executar(_SCRIPT_PRIMEIRA) for _ in range(repeticoes)]
+    return {
+        "import_ms": statistics.median(r["ms"] for r in imports),
+        "primeira_renderizacao_ms": statistics.median(r["ms"] for r in primeiras),
+        "modulos_pesados": sorted({m for r in imports for m in r["pesados"]}),
+        "erro_renderizacao": any(r["erro"] for r in primeiras),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--limite-import-ms", type=float, default=None)
+    parser.add_argument("--limite-primeira-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    resultado = medir(args.repeticoes)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+    falhas = []
+    if resultado["modulos_pesados"]:
+        falhas.append(f"módulos pesados na partida: {resultado['modulos_pesados']}")
+    if resultado["erro_renderizacao"]:
+        falhas.append("a primeira renderização gerou exceção")
+    if args.limite_import_ms and resultado["import_ms"] > args.limite_import_ms:
+        falhas.append(f"import acima de {args.limite_import_ms:.0f} ms")
+    if args.limite_primeira_ms and resultado["primeira_renderizacao_ms"] > args.limite_primeira_ms:
+        falhas.append(f"primeira renderização acima de {args.limite_primeira_ms:.0f} ms")
+
+    for falha in falhas:
+        print(f"[REGRESSÃO] {falha}", file=sys.stderr)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+# benchmarks/latencia_reruns.py
+
+"""
+Mede a latência dos reruns do app em interações típicas.
+
+Para cada tamanho de dataset (padrão: 10k, 100k e 1M títulos sintéticos):
+    - copia app.py e src/ para um diretório temporário e publica ali o
+      dataset sintético (DatasetStore), sem tocar nos dados reais;
+    - abre o app com AppTest em um processo novo e repete, por rodada, as
+      interações: escolher o cliente com mais títulos (e voltar a "Todos"),
+      ligar e desligar "atrasados", estreitar e restaurar a faixa de valor,
+      ligar e desligar o filtro de funcionários;
+    - registra p50/p95 de cada interação e do conjunto, o tempo da primeira
+      renderização e o pico de memória residente do processo.
+
+O resultado vai para um JSON (--saida) que pode ser comparado com o de outra
+versão do código (--comparar).
+
+Uso:
+    python benchmarks/latencia_reruns.py [--tamanhos 10000 100000 1000000]
+        [--rodadas 3] [--saida latencia.json]
+        [--comparar base.json] [--tolerancia 0.25]
+
+Sai com código 1 se o p95 de algum tamanho piorar mais que a tolerância em
+relação ao arquivo de --comparar.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+_SCRIPT_PREPARAR = """
+import shutil, sys
+from pathlib import Path
+destino, linhas = Path(sys.argv[1]), int(sys.argv[2])
+sys.path.insert(0, str(destino))
+import numpy as np
+import pandas as pd
+from src.config import config
+if destino.resolve() not in config.CAMINHO_CSV.resolve().parents:
+    raise SystemExit(f"config.CAMINHO_CSV fora da cópia: {config.CAMINHO_CSV}")
+from src.services.dataset_store import DatasetStore
+from src.utils import funcionarios
+if not funcionarios.CAMINHO_DIRETORIO.exists() and Path(sys.argv[3]).exists():
+    funcionarios.CAMINHO_DIRETORIO.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(sys.argv[3], funcionarios.CAMINHO_DIRETORIO)
+
+rng = np.random.default_rng(0)
+n_clientes = max(linhas // 8, 10)
+clientes = np.array([f"CLIENTE {i}" for i in range(n_clientes)], dtype=object)
+nomes_funcionarios = [nome for nomes in funcionarios.obter_diretorio().por_loja.values() for nome in nomes]
+clientes[:len(nomes_funcionarios)] = [f"{nome} (FUNCIONÁRIO)" for nome in nomes_funcionarios][:n_clientes]
+# Distribuição desigual: poucos clientes concentram muitos títulos
+indices = np.minimum(rng.zipf(1.3, linhas) - 1, n_clientes - 1)
+original = rng.uniform(10, 5000, linhas).round(2)
+acres = rng.uniform(-5, 5, linhas).round(2)
+juros = rng.uniform(0, 50, linhas).round(2)
+vencimentos = pd.Timestamp.today().normalize() + pd.to_timedelta(rng.integers(-700, 120, linhas), unit="D")
+df = pd.DataFrame({
+    "Cliente": clientes[rng.permutation(n_clientes)[indices]],
+    "Status": "Aberto",
+    "Título": np.arange(100000, 100000 + linhas).astype(str),
+    "Fatura": rng.integers(1000, 99999, linhas).astype(str),
+    "Local": "Loja",
+    "Espécie": "CR",
+    "Vencimento": vencimentos.strftime("%d/%m/%Y"),
+    "Conta Corrente": "CAIXA GERAL",
+    "Acres/Desc": acres,
+    "Juros/Multa": juros,
+    "R$ Original": original,
+    "R$ Total": (original + acres + juros).round(2),
+})
+DatasetStore.publicar(df)
+print(df["Cliente"].value_counts().index[0])
+"""
+
+_SCRIPT_MEDIR = """
+import json, resource, sys, time
+from pathlib import Path
+destino, rodadas, cliente = Path(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+sys.path.insert(0, str(destino))
+from streamlit.testing.v1 import AppTest
+
+def _widget(lista, rotulo):
+    return next(w for w in lista if w.label == rotulo)
+
+def _rerun(nome):
+    inicio = time.perf_counter()
+    at.run()
+    tempos.setdefault(nome, []).append((time.perf_counter() - inicio) * 1000)
+    if at.exception:
+        raise SystemExit(str(at.exception))
+
+at = AppTest.from_file(str(destino / "app.py"), default_timeout=1800)
+inicio = time.perf_counter()
+at.run()
+primeira = (time.perf_counter() - inicio) * 1000
+if at.exception:
+    raise SystemExit(str(at.exception))
+
+tempos = {}
+for _ in range(rodadas):
+    _widget(at.sidebar.selectbox, "Filtrar por cliente").select(cliente)
+    _rerun("cliente")
+    _widget(at.sidebar.selectbox, "Filtrar por cliente").select("Todos")
+    _rerun("cliente")
+
+    _widget(at.sidebar.checkbox, "Mostrar apenas títulos atrasados").check()
+    _rerun("atrasados")
+    _widget(at.sidebar.checkbox, "Mostrar apenas títulos atrasados").uncheck()
+    _rerun("atrasados")
+
+    slider = _widget(at.sidebar.slider, "Filtrar por valor total (R$)")
+    minimo, maximo = slider.min, slider.max
+    slider.set_range(minimo + (maximo - minimo) * 0.25, minimo + (maximo - minimo) * 0.75)
+    _rerun("valor")
+    _widget(at.sidebar.slider, "Filtrar por valor total (R$)").set_range(minimo, maximo)
+    _rerun("valor")
+
+    _widget(at.sidebar.checkbox, "Filtrar somente funcionários").check()
+    _rerun("funcionarios")
+    _widget(at.sidebar.checkbox, "Filtrar somente funcionários").uncheck()
+    _rerun("funcionarios")
+
+pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+pico_mb = pico / 1024 / 1024 if sys.platform == "darwin" else pico / 1024
+print(json.dumps({"primeira_ms": primeira, "tempos": tempos, "pico_rss_mb": pico_mb}))
+"""
+
+
+def _percentil(valores: list, p: float) -> float:
+    """Percentil com interpolação linear (como ``numpy.percentile``)."""
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    base = int(posicao)
+    proximo = min(base + 1, len(ordenados) - 1)
+    return ordenados[base] + (ordenados[proximo] - ordenados[base]) * (posicao - base)
+
+
+def _resumo(tempos: list) -> dict:
+    return {
+        "reruns": len(tempos),
+        "p50_ms": round(_percentil(tempos, 50), 1),
+        "p95_ms": round(_percentil(tempos, 95), 1),
+    }
+
+
+def _executar(script: str, *argumentos: str) -> str:
+    ambiente = {k: v for k, v in os.environ.items() if k != "RELATORIO_PERFIL"}
+    resultado = subprocess.run(
+        [sys.executable, "-c", script, *argumentos],
+        capture_output=True,
+        text=True,
+        env=ambiente,
+    )
+    if resultado.returncode != 0:
+        raise RuntimeError(resultado.stderr.strip().splitlines()[-1] if resultado.stderr.strip() else "falha")
+    return resultado.stdout.strip().splitlines()[-1]
+
+
+def _copiar_app(destino: Path) -> None:
+    """Copia o código do app (sem dados) para o diretório do benchmark."""
+    shutil.copy2(RAIZ / "app.py", destino / "app.py")
+    shutil.copytree(RAIZ / "src", destino / "src", ignore=shutil.ignore_patterns("__pycache__"))
+
+
+def medir(linhas: int, rodadas: int) -> dict:
+    """
+    Publica um dataset sintético em uma cópia do app e mede os reruns.
+
+    Args:
+        linhas: Quantidade de títulos sintéticos
+        rodadas: Repetições do roteiro de interações
+
+    Returns:
+        Dicionário com p50/p95 por interação e geral, primeira renderização
+        e pico de memória
+    """
+    with tempfile.TemporaryDirectory(prefix="latencia-") as temporario:
+        destino = Path(temporario)
+        _copiar_app(destino)
+        cliente = _executar(
+            _SCRIPT_PREPARAR, str(destino), str(linhas), str(RAIZ / "parser" / "funcionarios.csv")
+        )
+        medidas = json.loads(_executar(_SCRIPT_MEDIR, str(destino), str(rodadas), cliente))
+
+    todos = [t for tempos in medidas["tempos"].values() for t in tempos]
+    return {
+        "linhas": linhas,
+        "primeira_renderizacao_ms": round(medidas["primeira_ms"], 1),
+        "geral": _resumo(todos),
+        "interacoes": {nome: _resumo(tempos) for nome, tempos in medidas["tempos"].items()},
+        "pico_rss_mb": round(medidas["pico_rss_mb"], 1),
+    }
+
+
+def _versao_codigo() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecida"
+
+
+def comparar(resultado: dict, base: dict, tolerancia: float) -> list:
+    """
+    Compara o p95 geral de cada tamanho com o de uma execução anterior.
+
+    Args:
+        resultado: Resultado atual
+        base: Resultado anterior (mesmo formato)
+        tolerancia: Piora relativa aceita (0.25 = 25%)
+
+    Returns:
+        Lista de falhas (vazia se não houver regressão)
+    """
+    anteriores = {t["linhas"]: t for t in base.get("tamanhos", [])}
+    falhas = []
+    for atual in resultado["tamanhos"]:
+        anterior = anteriores.get(atual["linhas"])
+        if anterior is None:
+            continue
+        p95_atual, p95_anterior = atual["geral"]["p95_ms"], anterior["geral"]["p95_ms"]
+        atual["variacao_p95"] = round(p95_atual / p95_anterior - 1, 3) if p95_anterior else None
+        if p95_anterior and p95_atual > p95_anterior * (1 + tolerancia):
+            falhas.append(
+                f"{atual['linhas']} linhas: p95 {p95_atual:.0f} ms contra {p95_anterior:.0f} ms "
+                f"({base.get('versao', '?')})"
+            )
+    return falhas
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--rodadas", type=int, default=3)
+    parser.add_argument("--saida", type=Path, default=None)
+    parser.add_argument("--comparar", type=Path, default=None)
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    args = parser.parse_args()
+
+    # A medição (_SCRIPT_MEDIR) usa resource para o pico de memória
+    if importlib.util.find_spec("resource") is None:
+        print("Benchmark disponível apenas em sistemas Unix.", file=sys.stderr)
+        return 0
+
+    resultado = {
+        "versao": _versao_codigo(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "rodadas": args.rodadas,
+        "tamanhos": [medir(linhas, args.rodadas) for linhas in args.tamanhos],
+    }
+
+    falhas = []
+    if args.comparar:
+        falhas = comparar(resultado, json.loads(args.comparar.read_text(encoding="utf-8")), args.tolerancia)
+
+    saida = json.dumps(resultado, indent=2, ensure_ascii=False)
+    print(saida)
+    if args.saida:
+        args.saida.write_text(saida + "\n", encoding="utf-8")
+
+    for falha in falhas:
+        print(f"[REGRESSÃO] {falha}", file=sys.stderr)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
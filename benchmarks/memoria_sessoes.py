@@ -0,0 +1,148 @@
+# benchmarks/memoria_sessoes.py
+
+"""
+Mede o custo de memória de cada sessão e de cada processo adicional.
+
+Usa a versão vigente do dataset (DatasetStore) e mede em processos novos:
+    - sessões: abre N sessões AppTest no mesmo processo, mantendo todas
+      vivas, e registra o crescimento do RSS a cada sessão adicional;
+    - processos: abre a versão em K processos, pelo caminho mapeado em
+      memória (``carregar_mapeado``) e pelo caminho antigo (CSV lido e
+      preparado em cada processo), e compara a memória anônima, que não é
+      compartilhada entre processos, com o RSS.
+
+Uso:
+    python benchmarks/memoria_sessoes.py [--sessoes 5] [--processos 3]
+        [--limite-mb-por-sessao 50]
+
+Requer Linux (lê /proc/self/smaps_rollup). Sai com código 1 se o crescimento
+médio por sessão adicional passar do limite informado.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+_MEMORIA = """
+def _memoria():
+    campos = {}
+    with open("/proc/self/smaps_rollup") as arquivo:
+        for linha in arquivo:
+            partes = linha.split()
+            if len(partes) == 3 and partes[2] == "kB":
+                campos[partes[0].rstrip(":")] = int(partes[1]) / 1024
+    return {"rss_mb": campos["Rss"], "anonimo_mb": campos["Anonymous"]}
+"""
+
+_SCRIPT_SESSOES = f"""
+import gc, json, sys
+sys.path.insert(0, {str(RAIZ)!r})
+from streamlit.testing.v1 import AppTest
+{_MEMORIA}
+sessoes, medidas = [], []
+for _ in range(int(sys.argv[1])):
+    at = AppTest.from_file({str(RAIZ / "app.py")!r}, default_timeout=600)
+    at.run()
+    if at.exception:
+        raise SystemExit(str(at.exception))
+    sessoes.append(at)
+    gc.collect()
+    medidas.append(_memoria())
+print(json.dumps(medidas))
+"""
+
+_SCRIPT_PROCESSO = f"""
+import json, sys
+sys.path.insert(0, {str(RAIZ)!r})
+import pandas as pd
+from src.services.data_filter import DataFilterService
+from src.services.dataset_store import DatasetStore
+{_MEMORIA}
+versao = DatasetStore.versao_atual()
+antes = _memoria()
+if sys.argv[1] == "mapeado":
+    df = DatasetStore.carregar_mapeado(versao)
+else:
+    df = DataFilterService.preparar_dados_para_filtros(DatasetStore.carregar(versao))
+# Tocar todas as colunas, como faria uma sessão filtrando
+for coluna in df.columns:
+    df[coluna].isna().sum()
+depois = _memoria()
+print(json.dumps({{
+    "linhas": len(df),
+    "rss_mb": depois["rss_mb"] - antes["rss_mb"],
+    "anonimo_mb": depois["anonimo_mb"] - antes["anonimo_mb"],
+}}))
+"""
+
+
+def _executar(script: str, *argumentos: str):
+    resultado = subprocess.run(
+        [sys.executable, "-c", script, *argumentos],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(resultado.stdout.strip().splitlines()[-1])
+
+
+def medir(sessoes: int, processos: int) -> dict:
+    """
+    Executa as medições em processos novos.
+
+    Args:
+        sessoes: Número de sessões AppTest simultâneas
+        processos: Número de processos por modo de leitura
+
+    Returns:
+        Dicionário com o crescimento por sessão e a memória por processo
+    """
+    medidas = _executar(_SCRIPT_SESSOES, str(sessoes))
+    crescimentos = [b["rss_mb"] - a["rss_mb"] for a, b in zip(medidas, medidas[1:])]
+
+    por_modo = {}
+    for modo in ("mapeado", "csv"):
+        execucoes = [_executar(_SCRIPT_PROCESSO, modo) for _ in range(processos)]
+        por_modo[modo] = {
+            "linhas": execucoes[0]["linhas"],
+            "rss_mb": round(statistics.median(e["rss_mb"] for e in execucoes), 1),
+            "anonimo_mb": round(statistics.median(e["anonimo_mb"] for e in execucoes), 1),
+        }
+
+    return {
+        "rss_primeira_sessao_mb": round(medidas[0]["rss_mb"], 1),
+        "crescimento_por_sessao_mb": [round(c, 1) for c in crescimentos],
+        "crescimento_medio_mb": round(statistics.mean(crescimentos), 1) if crescimentos else 0.0,
+        "por_processo": por_modo,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessoes", type=int, default=5)
+    parser.add_argument("--processos", type=int, default=3)
+    parser.add_argument("--limite-mb-por-sessao", type=float, default=None)
+    args = parser.parse_args()
+
+    if not Path("/proc/self/smaps_rollup").exists():
+        print("Benchmark disponível apenas no Linux.", file=sys.stderr)
+        return 0
+
+    resultado = medir(args.sessoes, args.processos)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+    limite = args.limite_mb_por_sessao
+    if limite and resultado["crescimento_medio_mb"] > limite:
+        print(f"[REGRESSÃO] crescimento por sessão acima de {limite:.0f} MB", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# benchmarks/montagem_parser.py
+
+"""
+Compara a montagem dos títulos do parser: por coluna contra por registro.
+
+Gera N pares de linhas sintéticas no formato do relatório (os mesmos de
+``benchmarks/validacao.py``) e mede, para cada forma de montagem, o tempo e o
+pico de memória alocada (tracemalloc) do recorte das linhas até o DataFrame
+validado:
+    - por coluna: ``ColunasTitulos``, como faz ``PDFParserService``;
+    - por registro (referência): um dicionário por título e
+      ``pd.DataFrame(lista)``, como o parser fazia antes.
+
+Os dois caminhos precisam produzir o mesmo resultado validado.
+
+Uso:
+    python benchmarks/montagem_parser.py [--linhas 100000] [--repeticoes 3]
+        [--limite-razao-tempo 1.0] [--limite-razao-memoria 1.0]
+
+Sai com código 1 se os resultados divergirem ou se a montagem por coluna
+passar das razões informadas (por coluna / por registro).
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from src.services.pdf_parser import ColunasTitulos, PDFParserService  # noqa: E402
+from src.services.validacao import ValidacaoService  # noqa: E402
+from validacao import gerar_linhas  # noqa: E402
+
+
+def _registro(l1: str, l2: str, cliente: str) -> dict:
+    """Montagem de referência: um dicionário por título, valores limpos em texto."""
+    (cliente, status, titulo, fatura, local, especie, vencimento, conta,
+     acres, juros, original, total) = PDFParserService._recortar_linha(l1, l2, cliente)
+    limpar = PDFParserService.limpar_valor
+    return {
+        "Cliente": cliente, "Status": status, "Título": titulo, "Fatura": fatura,
+        "Local": local, "Espécie": especie, "Vencimento": vencimento,
+        "Conta Corrente": conta, "Acres/Desc": limpar(acres), "Juros/Multa": limpar(juros),
+        "R$ Original": limpar(original), "R$ Total": limpar(total),
+    }
+
+
+def montar_por_registro(linhas: list) -> pd.DataFrame:
+    dados = []
+    for numero, (l1, l2) in enumerate(linhas):
+        registro = _registro(l1, l2, f"CLIENTE {numero // 5}")
+        registro["Página"] = numero // 40 + 1
+        registro["Linha"] = numero % 40 + 1
+        dados.append(registro)
+    return pd.DataFrame(dados)
+
+
+def montar_por_coluna(linhas: list) -> pd.DataFrame:
+    titulos = ColunasTitulos()
+    for numero, (l1, l2) in enumerate(linhas):
+        titulos.acrescentar(
+            PDFParserService._recortar_linha(l1, l2, f"CLIENTE {numero // 5}"),
+            numero // 40 + 1, numero % 40 + 1
+        )
+    return titulos.para_dataframe()
+
+
+def _medir(montar, linhas: list, repeticoes: int) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        relatorio = ValidacaoService.validar(montar(linhas))
+        tempos.append(time.perf_counter() - inicio)
+
+    gc.collect()
+    tracemalloc.start()
+    df = montar(linhas)
+    _, pico_montagem = tracemalloc.get_traced_memory()
+    del df
+    tracemalloc.reset_peak()
+    ValidacaoService.validar(montar(linhas))
+    _, pico_total = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "tempo_s": round(statistics.median(tempos), 3),
+        "pico_montagem_mb": round(pico_montagem / 1024 / 1024, 1),
+        "pico_com_validacao_mb": round(pico_total / 1024 / 1024, 1),
+        "relatorio": relatorio,
+    }
+
+
+def medir(n: int, repeticoes: int) -> dict:
+    """
+    Mede as duas formas de montagem sobre N títulos sintéticos.
+
+    Args:
+        n: Quantidade de títulos
+        repeticoes: Repetições da medição de tempo (vale a mediana)
+
+    Returns:
+        Dicionário com tempo e pico de memória de cada forma e as razões
+    """
+    linhas, _ = gerar_linhas(n, taxa_erro=0.01)
+    registro = _medir(montar_por_registro, linhas, repeticoes)
+    coluna = _medir(montar_por_coluna, linhas, repeticoes)
+
+    a, b = registro.pop("relatorio"), coluna.pop("relatorio")
+    iguais = (
+        a.aceitos.reset_index(drop=True).equals(b.aceitos.reset_index(drop=True))
+        and a.resumo() == b.resumo()
+    )
+    return {
+        "linhas": n,
+        "por_registro": registro,
+        "por_coluna": coluna,
+        "razao_tempo": round(coluna["tempo_s"] / registro["tempo_s"], 3),
+        "razao_memoria": round(coluna["pico_montagem_mb"] / registro["pico_montagem_mb"], 3),
+        "resultados_iguais": iguais,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--limite-razao-tempo", type=float, default=None)
+    parser.add_argument("--limite-razao-memoria", type=float, default=None)
+    args = parser.parse_args()
+
+    resultado = medir(args.linhas, args.repeticoes)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+    falhas = []
+    if not resultado["resultados_iguais"]:
+        falhas.append("montagem por coluna diverge da montagem por registro")
+    if args.limite_razao_tempo and resultado["razao_tempo"] > args.limite_razao_tempo:
+        falhas.append(f"razão de tempo acima de {args.limite_razao_tempo}")
+    if args.limite_razao_memoria and resultado["razao_memoria"] > args.limite_razao_memoria:
+        falhas.append(f"razão de memória acima de {args.limite_razao_memoria}")
+
+    for falha in falhas:
+        print(f"[REGRESSÃO] {falha}", file=sys.stderr)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
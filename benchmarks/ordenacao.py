@@ -0,0 +1,150 @@
+# benchmarks/ordenacao.py
+
+"""
+Compara a ordenação da tabela filtrada: permutação em cache contra sort_values.
+
+Monta um dataset sintético preparado (sem tocar nos dados reais) e, para
+algumas combinações de colunas e filtros, mede:
+    - permutação: ``DataFilterService.aplicar_filtros`` com a ordem do dataset
+      inteiro já calculada (``OrdenacaoService.permutacao``, uma vez por
+      versão no app), que seleciona as linhas já ordenadas;
+    - referência: os mesmos filtros sem ordem e ``sort_values`` estável sobre
+      o resultado, como a tabela seria ordenada a cada rerun.
+
+As duas ordens precisam ser idênticas (nulos por último).
+
+Uso:
+    python benchmarks/ordenacao.py [--linhas 1000000] [--repeticoes 3]
+        [--limite-razao 1.0]
+
+Sai com código 1 se as ordens divergirem ou se a razão mediana
+(permutação / referência) passar do limite informado.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import FiltroRelatorio  # noqa: E402
+from src.services.data_filter import DataFilterService  # noqa: E402
+from src.services.ordenacao import OrdenacaoService  # noqa: E402
+
+ORDENACOES = [
+    (("Vencimento", True),),
+    (("R$ Total", False),),
+    (("Vencimento", True), ("R$ Total", False), ("Cliente", True)),
+]
+
+
+def gerar_dataset(linhas: int, semente: int = 0) -> pd.DataFrame:
+    """Dataset preparado sintético, com vencimentos ausentes e valores repetidos."""
+    rng = np.random.default_rng(semente)
+    clientes = np.array([f"CLIENTE {i}" for i in range(max(linhas // 8, 10))], dtype=object)
+    vencimentos = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 900, linhas), unit="D")
+    vencimentos = vencimentos.where(rng.random(linhas) > 0.001)
+    return pd.DataFrame({
+        "Cliente": pd.array(clientes[rng.integers(0, len(clientes), linhas)], dtype="string[pyarrow]"),
+        "Título": pd.array(np.arange(linhas).astype(str), dtype="string[pyarrow]"),
+        "Vencimento": vencimentos,
+        "R$ Total": rng.uniform(10, 5000, linhas).round(0),
+    })
+
+
+def _filtros(df: pd.DataFrame) -> dict:
+    return {
+        "sem filtro": FiltroRelatorio(),
+        "valor (30%)": FiltroRelatorio(valor_min=3500.0, valor_max=5000.0),
+        "um cliente": FiltroRelatorio(cliente=str(df["Cliente"].iloc[0])),
+    }
+
+
+def _mediana(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def medir(linhas: int, repeticoes: int) -> dict:
+    """
+    Mede as duas formas de ordenação em cada combinação.
+
+    Args:
+        linhas: Tamanho do dataset
+        repeticoes: Repetições por medida (vale a mediana)
+
+    Returns:
+        Dicionário com os tempos, as razões e as divergências
+    """
+    df = gerar_dataset(linhas)
+    resultados, divergencias = [], []
+    for chaves in ORDENACOES:
+        inicio = time.perf_counter()
+        permutacao = OrdenacaoService.permutacao(df, chaves)
+        tempo_permutacao = time.perf_counter() - inicio
+
+        colunas = [coluna for coluna, _ in chaves]
+        crescentes = [crescente for _, crescente in chaves]
+        for nome, filtros in _filtros(df).items():
+            def por_permutacao():
+                return DataFilterService.aplicar_filtros(df, filtros, permutacao=permutacao)
+
+            def referencia():
+                return DataFilterService.aplicar_filtros(df, filtros).sort_values(
+                    colunas, ascending=crescentes, kind="stable", na_position="last"
+                )
+
+            if not por_permutacao().index.equals(referencia().index):
+                divergencias.append(f"{colunas} / {nome}")
+            t_permutacao = _mediana(por_permutacao, repeticoes)
+            t_referencia = _mediana(referencia, repeticoes)
+            resultados.append({
+                "ordem": ", ".join(f"{c} {'↑' if a else '↓'}" for c, a in chaves),
+                "filtro": nome,
+                "permutacao_unica_ms": round(tempo_permutacao * 1000, 1),
+                "permutacao_ms": round(t_permutacao * 1000, 1),
+                "referencia_ms": round(t_referencia * 1000, 1),
+                "razao": round(t_permutacao / t_referencia, 3),
+            })
+
+    return {
+        "linhas": linhas,
+        "medidas": resultados,
+        "razao_mediana": statistics.median(r["razao"] for r in resultados),
+        "divergencias": divergencias,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--limite-razao", type=float, default=None)
+    args = parser.parse_args()
+
+    resultado = medir(args.linhas, args.repeticoes)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+    falhas = []
+    if resultado["divergencias"]:
+        falhas.append(f"ordens divergentes: {', '.join(resultado['divergencias'])}")
+    if args.limite_razao and resultado["razao_mediana"] > args.limite_razao:
+        falhas.append(f"razão mediana acima de {args.limite_razao}")
+
+    for falha in falhas:
+        print(f"[REGRESSÃO] {falha}", file=sys.stderr)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
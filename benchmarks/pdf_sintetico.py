@@ -0,0 +1,186 @@
+# benchmarks/pdf_sintetico.py
+
+"""
+Gera relatórios de títulos a receber sintéticos em PDF, sem dependências.
+
+O PDF imita o layout do relatório real: cabeçalho maior na primeira página,
+cabeçalho curto e rodapé nas demais, títulos em duas linhas por cliente e,
+no fim, páginas de resumo por loja (sem títulos). O texto usa a fonte
+Helvetica padrão, então o pdfplumber o lê como um PDF gerado pelo sistema.
+
+Uso como script:
+    python benchmarks/pdf_sintetico.py saida.pdf [--titulos 4000] [--semente 0]
+"""
+
+import argparse
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+LARGURA, ALTURA = 595, 842
+MARGEM_ESQUERDA = 20
+TAMANHO_FONTE = 8
+PASSO_LINHA = 11
+
+# Texto posicionado: (x, y, texto)
+Linha = Tuple[float, float, str]
+
+
+def _brl(valor: float) -> str:
+    return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def _escapar(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def montar_pdf(paginas: List[List[Linha]]) -> bytes:
+    """
+    Monta um PDF mínimo (1.4) com uma página A4 por lista de linhas.
+
+    Args:
+        paginas: Linhas posicionadas de cada página
+
+    Returns:
+        Conteúdo do PDF
+    """
+    objetos: List[bytes] = []
+
+    def acrescentar(objeto: bytes) -> int:
+        objetos.append(objeto)
+        return len(objetos)
+
+    fonte = acrescentar(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    conteudos = []
+    for linhas in paginas:
+        fluxo = "".join(
+            f"BT /F1 {TAMANHO_FONTE} Tf {x:.2f} {y:.2f} Td ({_escapar(texto)}) Tj ET\n"
+            for x, y, texto in linhas
+        ).encode("latin-1")
+        conteudos.append(acrescentar(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(fluxo), fluxo)))
+
+    id_paginas = len(objetos) + len(paginas) + 1
+    filhas = [
+        acrescentar(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (id_paginas, LARGURA, ALTURA, fonte, conteudo)
+        )
+        for conteudo in conteudos
+    ]
+    acrescentar(
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % filha for filha in filhas), len(filhas))
+    )
+    catalogo = acrescentar(b"<< /Type /Catalog /Pages %d 0 R >>" % id_paginas)
+
+    saida = bytearray(b"%PDF-1.4\n")
+    posicoes = []
+    for numero, objeto in enumerate(objetos, 1):
+        posicoes.append(len(saida))
+        saida += b"%d 0 obj\n%s\nendobj\n" % (numero, objeto)
+    inicio_xref = len(saida)
+    saida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    saida += b"".join(b"%010d 00000 n \n" % posicao for posicao in posicoes)
+    saida += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objetos) + 1, catalogo, inicio_xref
+    )
+    return bytes(saida)
+
+
+def _linhas_titulos(n: int, semente: int, inicio_titulo: int, taxa_erro: float) -> List[str]:
+    """Linhas de cliente e de títulos (duas por título), na ordem do relatório."""
+    rng = np.random.default_rng(semente)
+    linhas: List[str] = []
+    gerados = cliente = 0
+    while gerados < n:
+        cliente += 1
+        nome = f"CLIENTE {semente} {cliente}"
+        linhas.append(f"{cliente:05d} - {nome}")
+        for _ in range(min(int(rng.integers(1, 6)), n - gerados)):
+            original = round(float(rng.uniform(10, 5000)), 2)
+            acres = round(float(rng.uniform(0, 5)), 2)
+            juros = round(float(rng.uniform(0, 50)), 2)
+            total = round(original + acres + juros, 2)
+            if rng.random() < taxa_erro:
+                total += 10
+            vencimento = (pd.Timestamp("2024-01-01") + pd.Timedelta(days=int(rng.integers(0, 700)))).strftime("%d/%m/%Y")
+            titulo = inicio_titulo + gerados
+            linhas.append(f"{titulo} {nome} {1000 + gerados % 97} Loja CR {_brl(original)}")
+            linhas.append(f"Aberto {vencimento} CAIXA GERAL {_brl(acres)} {_brl(juros)} {_brl(total)}")
+            gerados += 1
+    return linhas
+
+
+def gerar_pdf(
+    n_titulos: int,
+    semente: int = 0,
+    inicio_titulo: int = 100000,
+    taxa_erro: float = 0.0,
+    paginas_resumo: int = 3,
+) -> bytes:
+    """
+    Gera um relatório sintético.
+
+    Args:
+        n_titulos: Quantidade de títulos
+        semente: Semente dos valores e nomes de clientes
+        inicio_titulo: Número do primeiro título
+        taxa_erro: Fração de títulos com R$ Total inconsistente
+        paginas_resumo: Páginas de resumo por loja no fim (sem títulos)
+
+    Returns:
+        Conteúdo do PDF
+    """
+    linhas = _linhas_titulos(n_titulos, semente, inicio_titulo, taxa_erro)
+    colunas = "Titulo Cliente Fatura Local Especie Vencimento Conta Acres/Desc Juros/Multa Valor"
+    topo = ALTURA - 30
+    base = 50
+
+    paginas: List[List[Linha]] = []
+    proxima = 0
+    while proxima < len(linhas) or not paginas:
+        if not paginas:
+            cabecalho = [
+                "BEMACON MATERIAIS DE CONSTRUCAO",
+                "RELATORIO DE TITULOS A RECEBER",
+                "Emissao 01/10/2026 Clientes: todos Situacao: em aberto",
+                "",
+                colunas,
+            ]
+        else:
+            cabecalho = ["RELATORIO DE TITULOS A RECEBER", colunas]
+        pagina = [(MARGEM_ESQUERDA, topo - k * PASSO_LINHA, texto) for k, texto in enumerate(cabecalho) if texto]
+        y = topo - (len(cabecalho) + 1) * PASSO_LINHA
+        while proxima < len(linhas) and y >= base + PASSO_LINHA:
+            pagina.append((MARGEM_ESQUERDA, y, linhas[proxima]))
+            proxima += 1
+            y -= PASSO_LINHA
+        paginas.append(pagina)
+
+    for numero in range(paginas_resumo):
+        pagina = [(MARGEM_ESQUERDA, topo, "RESUMO POR LOJA")]
+        for k in range(60):
+            pagina.append((MARGEM_ESQUERDA, topo - (k + 2) * PASSO_LINHA, f"Loja {numero * 60 + k + 1} Total {_brl(1000.0 * (k + 1))}"))
+        paginas.append(pagina)
+
+    total = len(paginas)
+    for numero, pagina in enumerate(paginas, 1):
+        pagina.append((LARGURA - 90, 30, f"Pagina {numero} de {total}"))
+    return montar_pdf(paginas)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("saida", type=Path)
+    parser.add_argument("--titulos", type=int, default=4000)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--taxa-erro", type=float, default=0.0)
+    args = parser.parse_args()
+    args.saida.write_bytes(gerar_pdf(args.titulos, args.semente, taxa_erro=args.taxa_erro))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# benchmarks/triagem_paginas.py
+
+"""
+Mede a triagem de páginas e o recorte da tabela no parser de PDF.
+
+Gera um corpus de relatórios sintéticos (``benchmarks/pdf_sintetico.py``:
+cabeçalho, rodapé, páginas de resumo e alguns totais inconsistentes) e extrai
+cada um de duas formas:
+    - referência: ``page.extract_text()`` em todas as páginas, como o parser
+      fazia antes;
+    - atual: ``PDFParserService.extrair_dados_pdf`` (triagem pelos
+      caracteres, faixa da tabela e texto montado sem ``page.chars``).
+
+Os dois caminhos precisam produzir o mesmo resultado validado, inclusive a
+página e a linha das rejeições.
+
+Uso:
+    python benchmarks/triagem_paginas.py [--arquivos 3] [--titulos 4000]
+        [--limite-razao 1.0]
+
+Sai com código 1 se os resultados divergirem ou se o tempo atual passar da
+razão informada (atual / referência).
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from src.services.pdf_parser import MARCADOR_TITULO, ColunasTitulos, PDFParserService  # noqa: E402
+from src.services.validacao import ValidacaoService  # noqa: E402
+from pdf_sintetico import gerar_pdf  # noqa: E402
+
+
+def extrair_referencia(caminho: Path) -> pd.DataFrame:
+    """Extração de referência: texto completo de todas as páginas."""
+    import pdfplumber
+
+    titulos = ColunasTitulos()
+    cliente_atual = None
+    with pdfplumber.open(caminho) as pdf:
+        for numero, page in enumerate(pdf.pages):
+            linhas = page.extract_text().split("\n")
+            page.close()
+            for i in range(len(linhas) - 1):
+                l1, l2 = linhas[i].strip(), linhas[i + 1].strip()
+                if PDFParserService._e_linha_cliente(l1):
+                    cliente_atual = l1.split("-", 1)[1].strip()
+                    continue
+                if PDFParserService._e_linha_dados(l1, l2, cliente_atual):
+                    titulos.acrescentar(PDFParserService._recortar_linha(l1, l2, cliente_atual), numero + 1, i + 1)
+    return titulos.para_dataframe()
+
+
+def _paginas(caminho: Path) -> tuple:
+    """Total de páginas e páginas sem títulos (puladas pela triagem)."""
+    import pdfplumber
+
+    with pdfplumber.open(caminho) as pdf:
+        sem_titulos = sum(MARCADOR_TITULO not in page.extract_text() for page in pdf.pages)
+        return len(pdf.pages), sem_titulos
+
+
+def _cronometrar(extrair, caminhos: list) -> tuple:
+    inicio = time.perf_counter()
+    relatorios = [ValidacaoService.validar(extrair(caminho)) for caminho in caminhos]
+    return time.perf_counter() - inicio, relatorios
+
+
+def _iguais(a, b) -> bool:
+    return (
+        a.aceitos.reset_index(drop=True).equals(b.aceitos.reset_index(drop=True))
+        and a.rejeicoes.reset_index(drop=True).equals(b.rejeicoes.reset_index(drop=True))
+    )
+
+
+def medir(arquivos: int, titulos: int) -> dict:
+    """
+    Extrai o corpus sintético pelas duas formas.
+
+    Args:
+        arquivos: Quantidade de PDFs do corpus
+        titulos: Títulos por PDF
+
+    Returns:
+        Dicionário com páginas, tempos, razão e conferência dos resultados
+    """
+    with tempfile.TemporaryDirectory(prefix="triagem-") as temporario:
+        caminhos = []
+        for semente in range(arquivos):
+            caminho = Path(temporario) / f"relatorio_{semente}.pdf"
+            caminho.write_bytes(gerar_pdf(titulos, semente, inicio_titulo=100000 + semente * titulos, taxa_erro=0.01))
+            caminhos.append(caminho)
+
+        paginas = [_paginas(caminho) for caminho in caminhos]
+        tempo_referencia, referencia = _cronometrar(extrair_referencia, caminhos)
+        tempo_atual, atual = _cronometrar(PDFParserService.extrair_dados_pdf, caminhos)
+
+    return {
+        "arquivos": arquivos,
+        "titulos": sum(len(r.aceitos) + r.linhas_rejeitadas for r in atual),
+        "paginas": sum(total for total, _ in paginas),
+        "paginas_sem_titulos": sum(sem for _, sem in paginas),
+        "referencia_s": round(tempo_referencia, 2),
+        "atual_s": round(tempo_atual, 2),
+        "razao": round(tempo_atual / tempo_referencia, 3),
+        "resultados_iguais": all(_iguais(a, b) for a, b in zip(referencia, atual)),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--arquivos", type=int, default=3)
+    parser.add_argument("--titulos", type=int, default=4000)
+    parser.add_argument("--limite-razao", type=float, default=None)
+    args = parser.parse_args()
+
+    resultado = medir(args.arquivos, args.titulos)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+    falhas = []
+    if not resultado["resultados_iguais"]:
+        falhas.append("extração atual diverge da referência")
+    if args.limite_razao and resultado["razao"] > args.limite_razao:
+        falhas.append(f"razão de tempo acima de {args.limite_razao}")
+
+    for falha in falhas:
+        print(f"[REGRESSÃO] {falha}", file=sys.stderr)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
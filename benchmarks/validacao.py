@@ -0,0 +1,143 @@
+# benchmarks/validacao.py
+
+"""
+Mede o custo da validação pós-parsing em relação ao parsing.
+
+Gera N pares de linhas sintéticas no formato do relatório (com uma fração de
+erros: valores ilegíveis, datas inválidas, totais divergentes e títulos
+duplicados), recorta cada par com ``PDFParserService._recortar_linha`` em um
+``ColunasTitulos`` e valida o resultado com ``ValidacaoService.validar``.
+
+O tempo de recorte não inclui a extração de texto do pdfplumber, que domina o
+parsing real; a fração informada é, portanto, um limite superior.
+
+Uso:
+    python benchmarks/validacao.py [--linhas 1000000] [--taxa-erro 0.01]
+        [--limite-fracao 0.25]
+
+Sai com código 1 se a validação passar da fração informada do tempo de
+recorte ou se alguma rejeição esperada não for detectada.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.pdf_parser import ColunasTitulos, PDFParserService  # noqa: E402
+from src.services.validacao import ValidacaoService  # noqa: E402
+
+
+def _brl(valores: np.ndarray) -> list:
+    return [f"{v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for v in valores]
+
+
+def gerar_linhas(n: int, taxa_erro: float, semente: int = 0):
+    """
+    Gera pares (l1, l2) sintéticos e a quantidade de erros injetados.
+
+    Args:
+        n: Quantidade de títulos
+        taxa_erro: Fração de linhas com cada tipo de erro
+        semente: Semente do gerador aleatório
+
+    Returns:
+        Tupla (lista de pares de linhas, erros injetados por tipo)
+    """
+    rng = np.random.default_rng(semente)
+    original = rng.uniform(10, 5000, n).round(2)
+    acres = rng.uniform(0, 5, n).round(2)
+    juros = rng.uniform(0, 50, n).round(2)
+    total = (original + acres + juros).round(2)
+    dias = rng.integers(0, 1400, n)
+    vencimentos = (pd.Timestamp("2023-01-01") + pd.to_timedelta(dias, unit="D")).strftime("%d/%m/%Y").tolist()
+    titulos = np.arange(100000, 100000 + n)
+
+    por_tipo = max(int(n * taxa_erro), 1)
+    indices = rng.permutation(n)[:5 * por_tipo].reshape(5, por_tipo)
+    total[indices[0]] += 10
+    for i in indices[1]:
+        vencimentos[i] = "31/02/2024"
+    titulos[indices[2]] = titulos[indices[4]]
+
+    originais, acrescimos, juros_txt, totais = _brl(original), _brl(acres), _brl(juros), _brl(total)
+    for i in indices[3]:
+        totais[i] = "1.2x3,00"
+
+    linhas = [
+        (
+            f"{titulos[i]} CLIENTE {i % 5000} {titulos[i] % 97 + 1000} Loja CR {originais[i]}",
+            f"Aberto {vencimentos[i]} CAIXA GERAL {acrescimos[i]} {juros_txt[i]} {totais[i]}",
+        )
+        for i in range(n)
+    ]
+    return linhas, por_tipo
+
+
+def medir(n: int, taxa_erro: float) -> dict:
+    """
+    Executa o recorte e a validação sobre N títulos sintéticos.
+
+    Args:
+        n: Quantidade de títulos
+        taxa_erro: Fração de linhas com cada tipo de erro
+
+    Returns:
+        Dicionário com tempos, fração e rejeições por motivo
+    """
+    linhas, por_tipo = gerar_linhas(n, taxa_erro)
+
+    inicio = time.perf_counter()
+    titulos = ColunasTitulos()
+    for numero, (l1, l2) in enumerate(linhas):
+        titulos.acrescentar(
+            PDFParserService._recortar_linha(l1, l2, "CLIENTE"), numero // 40 + 1, numero % 40 + 1
+        )
+    df = titulos.para_dataframe()
+    recorte = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    relatorio = ValidacaoService.validar(df)
+    validacao = time.perf_counter() - inicio
+
+    return {
+        "linhas": n,
+        "recorte_s": round(recorte, 3),
+        "validacao_s": round(validacao, 3),
+        "fracao": round(validacao / recorte, 4),
+        "aceitos": len(relatorio.aceitos),
+        "rejeicoes": relatorio.resumo(),
+        "erros_injetados_por_tipo": por_tipo,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--taxa-erro", type=float, default=0.01)
+    parser.add_argument("--limite-fracao", type=float, default=None)
+    args = parser.parse_args()
+
+    resultado = medir(args.linhas, args.taxa_erro)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+    falhas = []
+    esperado = resultado["erros_injetados_por_tipo"]
+    if any(quantidade < esperado for quantidade in resultado["rejeicoes"].values()) or len(resultado["rejeicoes"]) < 4:
+        falhas.append("rejeições esperadas não detectadas")
+    if args.limite_fracao and resultado["fracao"] > args.limite_fracao:
+        falhas.append(f"validação acima de {args.limite_fracao:.0%} do tempo de recorte")
+
+    for falha in falhas:
+        print(f"[REGRESSÃO] {falha}", file=sys.stderr)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
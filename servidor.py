@@ -0,0 +1,38 @@
+# servidor.py
+
+"""
+Inicia o servidor Streamlit com o dataset padrão pré-aquecido.
+
+Uso:
+    python servidor.py [opções do streamlit run]
+
+O dataset padrão e as opções dos filtros são carregados em segundo plano,
+no mesmo processo do servidor, enquanto ele sobe; a primeira sessão encontra
+o cache já preenchido. ``streamlit run app.py`` continua funcionando, apenas
+sem o pré-aquecimento.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+from streamlit.web import cli as stcli
+
+from src.services.dataset_session import DatasetSessionService
+
+
+def main() -> None:
+    """Dispara o pré-aquecimento e entrega o controle ao ``streamlit run``."""
+    threading.Thread(
+        target=DatasetSessionService.pre_aquecer,
+        name="pre-aquecimento",
+        daemon=True,
+    ).start()
+
+    app = Path(__file__).resolve().parent / "app.py"
+    sys.argv = ["streamlit", "run", str(app), *sys.argv[1:]]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    main()
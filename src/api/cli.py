@@ -0,0 +1,182 @@
+"""
+Linha de comando para consultas sem o Streamlit.
+
+Exemplos:
+    python -m src.api.cli titulos --atrasados 3 --formato csv > atrasados.csv
+    python -m src.api.cli aging --funcionarios 1
+    python -m src.api.cli servir --porta 8765
+    python -m src.api.cli cobrar --url http://127.0.0.1:8080/cobrancas --por-segundo 5
+    python -m src.api.cli monitorar --pasta /mnt/erp/relatorios
+    python -m src.api.cli receber --porta 8766 --fila 4
+
+Os resultados são escritos em blocos na saída padrão.
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from ..services.cobranca import CobrancaService
+from ..services.anotacoes import AnotacaoService
+from ..services.consulta import ConsultaService, FORMATOS
+from ..services.data_filter import DataFilterService
+from ..services.dataset_session import DatasetSessionService
+
+
+def _adicionar_filtros(parser: argparse.ArgumentParser) -> None:
+    for nome, ajuda in ConsultaService.parametros_validos().items():
+        parser.add_argument(f"--{nome}", help=ajuda)
+    parser.add_argument("--formato", choices=FORMATOS, default="jsonl")
+
+
+def _filtrar(args: argparse.Namespace):
+    dataset = DatasetSessionService.dataset_padrao()
+    df = dataset.df
+    if df.empty:
+        print("Nenhum dataset carregado.", file=sys.stderr)
+        return None
+
+    parametros = {
+        nome: valor
+        for nome in ConsultaService.parametros_validos()
+        if (valor := getattr(args, nome)) is not None
+    }
+    try:
+        filtros = ConsultaService.filtros_de_parametros(dataset, parametros)
+    except ValueError as e:
+        print(f"Parâmetro inválido: {e}", file=sys.stderr)
+        return None
+
+    return DataFilterService.aplicar_filtros(df, filtros, anotacoes=AnotacaoService.carregar())
+
+
+def _consultar(args: argparse.Namespace, aging: bool) -> int:
+    df_filtrado = _filtrar(args)
+    if df_filtrado is None:
+        return 1
+
+    if aging:
+        df_filtrado = ConsultaService.resumo_aging(df_filtrado)
+
+    for bloco in ConsultaService.serializar(df_filtrado, args.formato):
+        sys.stdout.write(bloco)
+    sys.stdout.flush()
+    return 0
+
+
+def _cobrar(args: argparse.Namespace) -> int:
+    df_filtrado = _filtrar(args)
+    if df_filtrado is None:
+        return 1
+
+    resumos = CobrancaService.montar_resumos(df_filtrado, periodo=args.periodo)
+    mensagens = CobrancaService.para_mensagens(resumos)
+    print(f"{len(mensagens)} cliente(s) em atraso.", file=sys.stderr)
+
+    if args.simular or not args.url:
+        for mensagem in mensagens:
+            sys.stdout.write(json.dumps(mensagem, ensure_ascii=False) + "\n")
+        return 0
+
+    from ..services.despachante import ConfigDespacho, despachar_cobrancas
+
+    relatorio = despachar_cobrancas(mensagens, ConfigDespacho(
+        url=args.url,
+        concorrencia=args.concorrencia,
+        por_segundo=args.por_segundo,
+        tentativas=args.tentativas
+    ))
+    print(
+        f"Enviadas: {relatorio.enviados} | Falhas: {len(relatorio.falhas)} | "
+        f"Novas tentativas: {relatorio.tentativas_extras} | "
+        f"{relatorio.mensagens_por_segundo:.1f} msg/s",
+        file=sys.stderr
+    )
+    for chave, erro in relatorio.falhas:
+        print(f"[FALHA] {chave}: {erro}", file=sys.stderr)
+    return 0 if not relatorio.falhas else 3
+
+
+def _monitorar(args: argparse.Namespace) -> int:
+    import signal
+    from ..services.monitor_pasta import MonitorPasta
+
+    opcoes = {
+        nome: valor
+        for nome in ("pasta", "intervalo", "processos")
+        if (valor := getattr(args, nome)) is not None
+    }
+    monitor = MonitorPasta(**opcoes)
+    if not monitor.pasta.is_dir():
+        print(f"Pasta não encontrada: {monitor.pasta}", file=sys.stderr)
+        return 1
+
+    signal.signal(signal.SIGTERM, lambda *_: monitor.parar())
+    try:
+        publicadas = monitor.executar(uma_vez=args.uma_vez)
+    except KeyboardInterrupt:
+        return 0
+    print(f"{len(publicadas)} versão(ões) publicada(s).", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.api.cli",
+        description="Consultas headless ao relatório de títulos a receber."
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    _adicionar_filtros(subparsers.add_parser("titulos", help="Títulos filtrados"))
+    _adicionar_filtros(subparsers.add_parser("aging", help="Resumo por faixa de atraso"))
+
+    cobrar = subparsers.add_parser("cobrar", help="Envia um resumo de cobrança por cliente em atraso")
+    _adicionar_filtros(cobrar)
+    cobrar.add_argument("--url", help="Endpoint que recebe os resumos (POST JSON)")
+    cobrar.add_argument("--periodo", help="Período da cobrança, ex. 2025-06 (padrão: mês atual)")
+    cobrar.add_argument("--concorrencia", type=int, default=4)
+    cobrar.add_argument("--por-segundo", type=float, default=10.0)
+    cobrar.add_argument("--tentativas", type=int, default=3)
+    cobrar.add_argument("--simular", action="store_true", help="Apenas lista os resumos, sem enviar")
+
+    servir = subparsers.add_parser("servir", help="Inicia a API HTTP local")
+    servir.add_argument("--host", default="127.0.0.1")
+    servir.add_argument("--porta", type=int, default=8765)
+
+    monitorar = subparsers.add_parser("monitorar", help="Publica os PDFs deixados em uma pasta")
+    monitorar.add_argument("--pasta", help="Pasta monitorada (padrão: media/)")
+    monitorar.add_argument("--intervalo", type=float, help="Segundos entre varreduras (padrão: 30)")
+    monitorar.add_argument("--processos", type=int, help="Processos de parsing em paralelo")
+    monitorar.add_argument("--uma-vez", action="store_true", help="Faz uma varredura e termina")
+
+    receber = subparsers.add_parser("receber", help="Inicia a API HTTP local de ingestão de PDFs")
+    receber.add_argument("--host", default="127.0.0.1")
+    receber.add_argument("--porta", type=int, default=8766)
+    receber.add_argument("--processos", type=int, help="Processos de parsing em paralelo")
+    receber.add_argument("--fila", type=int, default=4, help="Uploads simultâneos antes de responder 429")
+
+    args = parser.parse_args(argv)
+
+    if args.comando == "monitorar":
+        return _monitorar(args)
+
+    if args.comando == "receber":
+        from .ingestao import servir_ingestao
+        opcoes = {"processos": args.processos} if args.processos is not None else {}
+        servir_ingestao(args.host, args.porta, fila_maxima=args.fila, **opcoes)
+        return 0
+
+    if args.comando == "servir":
+        from .servidor import servir as iniciar_servidor
+        iniciar_servidor(args.host, args.porta)
+        return 0
+
+    if args.comando == "cobrar":
+        return _cobrar(args)
+
+    return _consultar(args, aging=args.comando == "aging")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
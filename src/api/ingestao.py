@@ -0,0 +1,496 @@
+"""
+API HTTP local de ingestão: o ERP envia o relatório em PDF direto, sem o upload
+pela sidebar.
+
+Rotas:
+    POST /ingestao?nome=<arquivo.pdf>   corpo: o PDF (Content-Length ou chunked)
+    GET  /ingestao/<job>                progresso e versão publicada
+    GET  /ingestao                      jobs recentes e ocupação da fila
+    GET  /saude                         verificação simples
+
+O POST grava o corpo em media/ à medida que chega (``MediaStore``, com o hash
+na mesma passada) e responde 202 com o id do job assim que o PDF está em
+disco; o parsing roda depois, em um pool de processos, e o resultado é
+publicado como nova versão (``DatasetStore``). Enquanto isso, o laço
+``asyncio`` continua atendendo as consultas de status.
+
+A fila é limitada: com FILA_MAXIMA uploads ainda não concluídos (recebendo,
+aguardando o pool ou em processamento), um novo POST recebe 429 com
+``Retry-After``, antes de o corpo ser gravado. Clientes que enviam
+``Expect: 100-continue`` nem chegam a transmitir o PDF recusado.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import signal
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from ..services.cache_parse import CacheParseService
+from ..services.ingest_jobs import IngestJob, IngestJobService
+from ..services.media_store import TAMANHO_BLOCO, MediaStore
+from ..services.pdf_processor import MAX_PROCESSOS_PARSE, PDFProcessorService, _extrair_e_validar
+from ..services.validacao import RelatorioValidacao
+
+
+# Porta padrão (a API de consultas usa 8765)
+PORTA_INGESTAO = 8766
+
+# Uploads aceitos e ainda não concluídos; acima disso, 429
+FILA_MAXIMA = 4
+
+# Tamanho máximo de um PDF enviado
+TAMANHO_MAXIMO = 256 * 1024 * 1024
+
+# Segundos sugeridos no Retry-After das recusas por fila cheia
+ESPERA_RECUSA = 5
+
+# Tempo máximo de espera por cada leitura da conexão, em segundos
+TEMPO_LIMITE_LEITURA = 60.0
+
+# Linhas de cabeçalho aceitas por requisição
+MAX_CABECALHOS = 100
+
+# Fila de progresso do processo do pool (definida por ``_iniciar_processo``)
+_fila_progresso = None
+
+
+class _RequisicaoInvalida(Exception):
+    """Erro do cliente, respondido com o status informado."""
+
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+
+class JobRecebido(IngestJob):
+    """PDF recebido pela API, do corpo da requisição à versão publicada."""
+
+    RECEBENDO = "recebendo"
+    NA_FILA = "na_fila"
+    PROCESSANDO = "processando"
+    PUBLICANDO = "publicando"
+
+    def __init__(self, chave: str, nome_arquivo: str):
+        super().__init__(chave, nome_arquivo)
+        self.etapa = JobRecebido.RECEBENDO
+        self.bytes_recebidos = 0
+        self.hash_conteudo: Optional[str] = None
+        self.caminho: Optional[Path] = None
+        self.do_cache = False
+        self.inicio_processamento: Optional[float] = None
+
+    def segundos_restantes(self) -> Optional[float]:
+        """
+        Estima o tempo restante pela média de tempo por página.
+
+        Conta a partir do início do parsing, sem o envio e a espera na fila.
+
+        Returns:
+            Segundos restantes ou None enquanto nenhuma página foi concluída
+        """
+        if self.inicio_processamento is None or not self.paginas_processadas or not self.total_paginas:
+            return None
+        por_pagina = (time.monotonic() - self.inicio_processamento) / self.paginas_processadas
+        return por_pagina * (self.total_paginas - self.paginas_processadas)
+
+    def para_json(self) -> dict:
+        """Estado do job como resposta da rota de status."""
+        restantes = self.segundos_restantes() if self.em_andamento else None
+        return {
+            "job": self.chave,
+            "arquivo": self.nome_arquivo,
+            "status": self.status,
+            "etapa": self.etapa if self.em_andamento else self.status,
+            "bytes_recebidos": self.bytes_recebidos,
+            "hash": self.hash_conteudo,
+            "paginas_processadas": self.paginas_processadas,
+            "total_paginas": self.total_paginas,
+            "titulos_encontrados": self.titulos_encontrados,
+            "progresso": round(self.fracao, 3),
+            "segundos_restantes": round(restantes, 1) if restantes is not None else None,
+            "do_cache": self.do_cache,
+            "versao": self.versao,
+            "erro": self.erro,
+            "duracao_s": round((self.fim or time.monotonic()) - self.inicio, 2),
+        }
+
+
+class _CorpoRequisicao:
+    """
+    Corpo da requisição como arquivo de leitura síncrona.
+
+    O ``MediaStore.salvar`` roda em uma thread e lê os blocos que o laço
+    ``asyncio`` recebe da conexão; o primeiro bloco precisa ser de um PDF.
+    """
+
+    def __init__(self, blocos: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop, job: JobRecebido):
+        self._blocos = blocos
+        self._loop = loop
+        self._job = job
+
+    def read(self, _tamanho: int = -1) -> bytes:
+        futuro = asyncio.run_coroutine_threadsafe(self._blocos.__anext__(), self._loop)
+        try:
+            bloco = futuro.result(TEMPO_LIMITE_LEITURA)
+        except StopAsyncIteration:
+            return b""
+        except TimeoutError:
+            futuro.cancel()
+            raise _RequisicaoInvalida(408, "Tempo esgotado aguardando o corpo da requisição")
+
+        if not self._job.bytes_recebidos and not bloco.startswith(b"%PDF"):
+            raise _RequisicaoInvalida(415, "O corpo da requisição não é um PDF")
+        self._job.bytes_recebidos += len(bloco)
+        return bloco
+
+
+class ServidorIngestao:
+    """Servidor ``asyncio`` que recebe PDFs e os publica em segundo plano."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        porta: int = PORTA_INGESTAO,
+        processos: int = MAX_PROCESSOS_PARSE,
+        fila_maxima: int = FILA_MAXIMA
+    ):
+        self.host = host
+        self.porta = porta
+        self.processos = max(processos, 1)
+        self.fila_maxima = max(fila_maxima, 1)
+        self.jobs: Dict[str, JobRecebido] = {}
+        self._ocupados = 0
+        self._tarefas: Set[asyncio.Task] = set()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._vagas_pool: Optional[asyncio.Semaphore] = None
+        self._parar: Optional[asyncio.Event] = None
+
+    def servir(self) -> None:
+        """Atende até ser interrompido (Ctrl+C ou SIGTERM; com SIGTERM, os jobs aceitos terminam antes)."""
+        try:
+            asyncio.run(self.executar())
+        except KeyboardInterrupt:
+            pass
+
+    async def executar(self) -> None:
+        """Versão assíncrona de ``servir``."""
+        loop = asyncio.get_running_loop()
+        self._parar = asyncio.Event()
+        self._vagas_pool = asyncio.Semaphore(self.processos)
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self._parar.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+        # spawn: o mesmo contexto usado no app (fork com threads não é seguro)
+        contexto = multiprocessing.get_context("spawn")
+        fila_progresso = contexto.Queue()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processos,
+            mp_context=contexto,
+            initializer=_iniciar_processo,
+            initargs=(fila_progresso,)
+        )
+        acompanhamento = threading.Thread(
+            target=self._repassar_progresso, args=(loop, fila_progresso), name="ingestao-progresso", daemon=True
+        )
+        acompanhamento.start()
+        try:
+            servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+            async with servidor:
+                print(f"API de ingestão em http://{self.host}:{self.porta}/ingestao")
+                await self._parar.wait()
+            # Os jobs já aceitos (202) terminam antes de o pool fechar
+            if self._tarefas:
+                print(f"⏳ Aguardando {len(self._tarefas)} job(s) em andamento")
+                await asyncio.gather(*self._tarefas, return_exceptions=True)
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+            fila_progresso.put(None)
+            acompanhamento.join()
+
+    def _repassar_progresso(self, loop: asyncio.AbstractEventLoop, fila_progresso) -> None:
+        """Thread que repassa ao laço o progresso por página enviado pelo pool."""
+        while (mensagem := fila_progresso.get()) is not None:
+            try:
+                loop.call_soon_threadsafe(self._registrar_progresso, *mensagem)
+            except RuntimeError:
+                # Laço já encerrado
+                return
+
+    def _registrar_progresso(self, chave: str, paginas: int, total: int, titulos: int) -> None:
+        job = self.jobs.get(chave)
+        if job is not None and job.em_andamento:
+            job._registrar_progresso(paginas, total, titulos)
+
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """Atende uma requisição por conexão."""
+        try:
+            metodo, alvo, cabecalhos = await asyncio.wait_for(_ler_cabecalho(leitor), TEMPO_LIMITE_LEITURA)
+        except (ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            await _responder(escritor, 400, {"erro": "Requisição inválida"})
+            return
+
+        url = urlsplit(alvo)
+        try:
+            if url.path == "/saude" and metodo == "GET":
+                await _responder(escritor, 200, {"status": "ok"})
+            elif url.path == "/ingestao" and metodo == "POST":
+                await self._receber(leitor, escritor, dict(parse_qsl(url.query)), cabecalhos)
+            elif url.path == "/ingestao" and metodo == "GET":
+                await _responder(escritor, 200, {
+                    "fila": {"ocupados": self._ocupados, "maximo": self.fila_maxima},
+                    "jobs": [job.para_json() for job in self.jobs.values()],
+                })
+            elif url.path.startswith("/ingestao/") and metodo == "GET":
+                job = self.jobs.get(url.path.rsplit("/", 1)[1])
+                if job is None:
+                    await _responder(escritor, 404, {"erro": "Job não encontrado"})
+                else:
+                    await _responder(escritor, 200, job.para_json())
+            else:
+                await _responder(escritor, 404, {"erro": f"Rota não encontrada: {metodo} {url.path}"})
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except OSError:
+                pass
+
+    async def _receber(
+        self,
+        leitor: asyncio.StreamReader,
+        escritor: asyncio.StreamWriter,
+        parametros: Dict[str, str],
+        cabecalhos: Dict[str, str]
+    ) -> None:
+        """Grava o PDF do corpo e agenda o processamento."""
+        espera_continuar = cabecalhos.get("expect", "").lower() == "100-continue"
+        try:
+            blocos = _ler_corpo(leitor, cabecalhos)
+        except _RequisicaoInvalida as e:
+            await _responder(escritor, e.status, {"erro": str(e)})
+            return
+
+        if self._ocupados >= self.fila_maxima:
+            await _responder(
+                escritor, 429,
+                {"erro": "Fila de ingestão cheia", "fila": {"ocupados": self._ocupados, "maximo": self.fila_maxima}},
+                {"Retry-After": str(ESPERA_RECUSA)}
+            )
+            # Sem 100-continue o cliente já está enviando o corpo; lido e
+            # descartado, para que ele receba o 429 em vez de uma conexão resetada
+            if not espera_continuar:
+                await _descartar(blocos)
+            return
+
+        nome = Path(parametros.get("nome") or cabecalhos.get("x-nome-arquivo") or "relatorio.pdf").name
+        job = JobRecebido(uuid.uuid4().hex[:16], nome)
+        IngestJobService._descartar_antigos(self.jobs)
+        self.jobs[job.chave] = job
+        self._ocupados += 1
+
+        processando = False
+        try:
+            if espera_continuar:
+                escritor.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                await escritor.drain()
+            corpo = _CorpoRequisicao(blocos, asyncio.get_running_loop(), job)
+            job.caminho, job.hash_conteudo = await asyncio.to_thread(MediaStore.salvar, corpo)
+            print(f"📥 {nome}: {job.bytes_recebidos / 1024 / 1024:.1f} MB recebidos (job {job.chave})")
+
+            job.etapa = JobRecebido.NA_FILA
+            tarefa = asyncio.create_task(self._processar(job))
+            self._tarefas.add(tarefa)
+            tarefa.add_done_callback(self._tarefas.discard)
+            processando = True
+            await _responder(escritor, 202, {"job": job.chave, "status": f"/ingestao/{job.chave}"})
+        except _RequisicaoInvalida as e:
+            self._finalizar(job, erro=str(e))
+            await _responder(escritor, e.status, {"erro": str(e), "job": job.chave})
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+            self._finalizar(job, erro=f"Falha ao receber o PDF: {e}")
+            await _responder(escritor, 400, {"erro": job.erro, "job": job.chave})
+        finally:
+            if not processando and job.em_andamento:
+                self._finalizar(job, erro="Conexão encerrada durante o envio")
+
+    async def _processar(self, job: JobRecebido) -> None:
+        """Lê (ou busca no cache) e publica o PDF de um job."""
+        try:
+            # Preserva os PDFs de todos os jobs aceitos e ainda não concluídos
+            em_andamento = [j.caminho for j in self.jobs.values() if j.em_andamento and j.caminho]
+            await asyncio.to_thread(PDFProcessorService._aplicar_retencao, *em_andamento)
+            relatorio = await asyncio.to_thread(CacheParseService.obter, job.hash_conteudo)
+            if relatorio is not None:
+                job.do_cache = True
+                print(f"✅ {job.nome_arquivo}: resultado do parsing reaproveitado do cache")
+            else:
+                async with self._vagas_pool:
+                    job.etapa = JobRecebido.PROCESSANDO
+                    job.inicio_processamento = time.monotonic()
+                    relatorio = await asyncio.get_running_loop().run_in_executor(
+                        self._pool, _extrair_com_progresso, job.chave, job.caminho
+                    )
+                await asyncio.to_thread(CacheParseService.gravar, job.hash_conteudo, relatorio)
+
+            job.etapa = JobRecebido.PUBLICANDO
+            job.titulos_encontrados = len(relatorio.aceitos)
+            versao = await asyncio.to_thread(PDFProcessorService.publicar_arquivo, job.nome_arquivo, relatorio)
+            if versao is None:
+                self._finalizar(job, erro="Nenhum título foi extraído do PDF.")
+            else:
+                self._finalizar(job, versao=versao)
+        except Exception as e:
+            print(f"Erro ao processar {job.nome_arquivo}: {e}")
+            self._finalizar(job, erro=str(e))
+
+    def _finalizar(self, job: JobRecebido, versao: Optional[str] = None, erro: Optional[str] = None) -> None:
+        """Encerra o job e libera sua vaga na fila."""
+        if not job.em_andamento:
+            return
+        # A versão antes do status, como no IngestJob
+        job.versao = versao
+        job.erro = erro
+        job.fim = time.monotonic()
+        job.status = IngestJob.ERRO if erro else IngestJob.CONCLUIDO
+        self._ocupados -= 1
+
+
+def servir_ingestao(
+    host: str = "127.0.0.1",
+    porta: int = PORTA_INGESTAO,
+    processos: int = MAX_PROCESSOS_PARSE,
+    fila_maxima: int = FILA_MAXIMA
+) -> None:
+    """
+    Inicia a API de ingestão e atende até ser interrompida.
+
+    Args:
+        host: Endereço de escuta (padrão: apenas local)
+        porta: Porta TCP
+        processos: Processos do pool de parsing
+        fila_maxima: Uploads simultâneos antes de responder 429
+    """
+    ServidorIngestao(host, porta, processos, fila_maxima).servir()
+
+
+async def _ler_cabecalho(leitor: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str]]:
+    """Linha de requisição e cabeçalhos (nomes em minúsculas)."""
+    partes = (await leitor.readline()).decode("latin-1").split()
+    if len(partes) != 3 or not partes[2].startswith("HTTP/"):
+        raise ValueError("Linha de requisição inválida")
+
+    cabecalhos = {}
+    for _ in range(MAX_CABECALHOS):
+        linha = await leitor.readline()
+        if linha in (b"\r\n", b"\n", b""):
+            return partes[0].upper(), partes[1], cabecalhos
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        cabecalhos[nome.strip().lower()] = valor.strip()
+    raise ValueError("Cabeçalhos demais")
+
+
+def _ler_corpo(leitor: asyncio.StreamReader, cabecalhos: Dict[str, str]) -> AsyncIterator[bytes]:
+    """
+    Blocos do corpo, por Content-Length ou Transfer-Encoding chunked.
+
+    O tamanho declarado é verificado aqui; o de um corpo chunked, a cada
+    bloco recebido.
+    """
+    if "chunked" in cabecalhos.get("transfer-encoding", "").lower():
+        return _ler_chunked(leitor)
+
+    tamanho = cabecalhos.get("content-length")
+    if tamanho is None:
+        raise _RequisicaoInvalida(411, "Informe Content-Length ou use Transfer-Encoding: chunked")
+    if not tamanho.isdigit():
+        raise _RequisicaoInvalida(400, f"Content-Length inválido: {tamanho}")
+    if int(tamanho) > TAMANHO_MAXIMO:
+        raise _RequisicaoInvalida(413, f"PDF maior que {TAMANHO_MAXIMO // 1024 // 1024} MB")
+    return _ler_tamanho_fixo(leitor, int(tamanho))
+
+
+async def _ler_tamanho_fixo(leitor: asyncio.StreamReader, tamanho: int) -> AsyncIterator[bytes]:
+    restante = tamanho
+    while restante:
+        bloco = await leitor.read(min(restante, TAMANHO_BLOCO))
+        if not bloco:
+            raise asyncio.IncompleteReadError(b"", restante)
+        restante -= len(bloco)
+        yield bloco
+
+
+async def _ler_chunked(leitor: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    total = 0
+    while True:
+        linha = await leitor.readline()
+        tamanho = int(linha.split(b";")[0].strip() or b"?", 16)
+        if tamanho == 0:
+            # Trailers, se houver, até a linha vazia
+            while (await leitor.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return
+        total += tamanho
+        if total > TAMANHO_MAXIMO:
+            raise _RequisicaoInvalida(413, f"PDF maior que {TAMANHO_MAXIMO // 1024 // 1024} MB")
+        restante = tamanho
+        while restante:
+            bloco = await leitor.read(min(restante, TAMANHO_BLOCO))
+            if not bloco:
+                raise asyncio.IncompleteReadError(b"", restante)
+            restante -= len(bloco)
+            yield bloco
+        await leitor.readexactly(2)
+
+
+async def _descartar(blocos: AsyncIterator[bytes]) -> None:
+    """Consome o corpo sem gravar (até o tempo limite de leitura)."""
+    try:
+        async with asyncio.timeout(TEMPO_LIMITE_LEITURA):
+            async for _ in blocos:
+                pass
+    except (ValueError, TimeoutError, asyncio.IncompleteReadError, ConnectionError, _RequisicaoInvalida):
+        pass
+
+
+async def _responder(
+    escritor: asyncio.StreamWriter,
+    status: int,
+    corpo: dict,
+    cabecalhos: Optional[Dict[str, str]] = None
+) -> None:
+    dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+    linhas = [
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+        "Content-Type: application/json; charset=utf-8",
+        f"Content-Length: {len(dados)}",
+        "Connection: close",
+        *(f"{nome}: {valor}" for nome, valor in (cabecalhos or {}).items()),
+    ]
+    escritor.write(("\r\n".join(linhas) + "\r\n\r\n").encode("latin-1") + dados)
+    await escritor.drain()
+
+
+def _iniciar_processo(fila_progresso) -> None:
+    """Guarda, em cada processo do pool, a fila de progresso do servidor."""
+    global _fila_progresso
+    _fila_progresso = fila_progresso
+
+
+def _extrair_com_progresso(chave: str, caminho_pdf: Path) -> RelatorioValidacao:
+    """Lê e valida um PDF no pool, enviando o progresso por página ao servidor."""
+    def progresso(paginas: int, total: int, titulos: int) -> None:
+        _fila_progresso.put((chave, paginas, total, titulos))
+
+    return _extrair_e_validar(caminho_pdf, progresso)
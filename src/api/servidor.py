@@ -0,0 +1,108 @@
+"""
+API HTTP local, somente leitura, sobre os dados do relatório.
+
+Rotas:
+    GET /titulos?<filtros>&formato=jsonl|csv   títulos filtrados
+    GET /aging?<filtros>&formato=jsonl|csv     resumo por faixa de atraso
+    GET /parametros                            filtros aceitos
+    GET /saude                                 verificação simples
+
+As respostas usam ``Transfer-Encoding: chunked`` e são escritas bloco a bloco.
+"""
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable
+from urllib.parse import parse_qsl, urlsplit
+
+from ..services.anotacoes import AnotacaoService
+from ..services.consulta import ConsultaService, FORMATOS
+from ..services.data_filter import DataFilterService
+from ..services.dataset_session import DatasetSessionService
+
+
+TIPOS_CONTEUDO = {
+    "jsonl": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class ConsultaHandler(BaseHTTPRequestHandler):
+    """Handler das rotas de consulta."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        parametros = dict(parse_qsl(url.query))
+        formato = parametros.pop("formato", "jsonl")
+
+        if url.path == "/saude":
+            self._responder_json(200, {"status": "ok"})
+            return
+        if url.path == "/parametros":
+            self._responder_json(200, ConsultaService.parametros_validos())
+            return
+        if url.path not in ("/titulos", "/aging"):
+            self._responder_json(404, {"erro": f"Rota não encontrada: {url.path}"})
+            return
+        if formato not in FORMATOS:
+            self._responder_json(400, {"erro": f"Formato não suportado: {formato}"})
+            return
+
+        dataset = DatasetSessionService.dataset_padrao()
+        df = dataset.df
+        if df.empty:
+            self._responder_json(503, {"erro": "Nenhum dataset carregado"})
+            return
+
+        try:
+            filtros = ConsultaService.filtros_de_parametros(dataset, parametros)
+        except ValueError as e:
+            self._responder_json(400, {"erro": str(e)})
+            return
+
+        df_filtrado = DataFilterService.aplicar_filtros(df, filtros, anotacoes=AnotacaoService.carregar())
+        if url.path == "/aging":
+            df_filtrado = ConsultaService.resumo_aging(df_filtrado)
+
+        self._responder_blocos(TIPOS_CONTEUDO[formato], ConsultaService.serializar(df_filtrado, formato))
+
+    def _responder_blocos(self, tipo: str, blocos: Iterable[str]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for bloco in blocos:
+            dados = bloco.encode("utf-8")
+            if dados:
+                self.wfile.write(f"{len(dados):X}\r\n".encode("ascii") + dados + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _responder_json(self, status: int, corpo: dict) -> None:
+        dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, format: str, *args) -> None:
+        print(f"[API] {self.address_string()} {format % args}")
+
+
+def servir(host: str = "127.0.0.1", porta: int = 8765) -> None:
+    """
+    Inicia a API e atende até ser interrompida.
+
+    Args:
+        host: Endereço de escuta (padrão: apenas local)
+        porta: Porta TCP
+    """
+    DatasetSessionService.pre_aquecer()
+    with ThreadingHTTPServer((host, porta), ConsultaHandler) as servidor:
+        print(f"API de consultas em http://{host}:{porta}")
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
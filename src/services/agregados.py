@@ -0,0 +1,232 @@
+"""
+Agregados dos títulos para os gráficos.
+
+Cada versão do dataset é agregada uma única vez, em um só groupby por
+(mês de vencimento, cliente), guardado como arrays ordenados por mês
+(``AgregadosTitulos``). Os gráficos são fatiados desse agregado a cada mudança
+de filtro, sem voltar às linhas do dataset: o período vira um intervalo de
+meses (fatia contígua) e cliente e loja viram seleções sobre os códigos dos
+clientes.
+
+Os filtros que dependem de cada título (valor, atrasados, cobranças futuras,
+título e anotações) não se aplicam aos gráficos.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import FiltroRelatorio
+from ..utils.funcionarios import LOJA_TODAS
+
+
+# Clientes no gráfico de maiores devedores
+TOP_DEVEDORES = 10
+
+# Pontos máximos da série mensal enviada ao navegador; acima disso, os meses
+# são somados em trimestres, anos ou grupos de anos
+MAX_PONTOS_SERIE = 60
+
+
+@dataclass(frozen=True)
+class AgregadosTitulos:
+    """
+    Total e quantidade de títulos por (mês de vencimento, cliente).
+
+    As linhas estão ordenadas por mês: ``inicio_mes[k]:inicio_mes[k + 1]`` são
+    as do k-ésimo mês de ``meses``. Títulos sem vencimento ficam de fora.
+    """
+
+    clientes: np.ndarray    # Nomes dos clientes, em ordem (código = posição)
+    meses: np.ndarray       # Meses distintos (meses desde 1970), em ordem
+    inicio_mes: np.ndarray  # Primeira linha de cada mês (e o total ao final)
+    mes: np.ndarray         # Mês de cada linha (meses desde 1970)
+    cliente: np.ndarray     # Código do cliente de cada linha
+    total: np.ndarray       # Soma de R$ Total
+    titulos: np.ndarray     # Quantidade de títulos
+
+    def __len__(self) -> int:
+        return len(self.mes)
+
+
+@dataclass(frozen=True)
+class GraficosTitulos:
+    """Séries prontas para os gráficos (já pequenas)."""
+
+    por_periodo: pd.Series        # Total por mês, trimestre ou ano (rótulo → total)
+    granularidade: str            # "mês", "trimestre", "ano" ou "N anos"
+    maiores_devedores: pd.Series  # Cliente → total, do maior para o menor
+    por_loja: pd.Series           # Loja → total dos funcionários
+
+
+class AgregadosService:
+    """Serviço que agrega os títulos e fatia os agregados para os gráficos."""
+
+    @staticmethod
+    def calcular(df: pd.DataFrame) -> AgregadosTitulos:
+        """
+        Agrega o dataset por mês de vencimento e cliente.
+
+        Args:
+            df: DataFrame preparado (Vencimento em datetime)
+
+        Returns:
+            AgregadosTitulos ordenado por mês
+        """
+        meses = df["Vencimento"].to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+        validos = ~np.isnat(meses)
+
+        grupos = (
+            pd.DataFrame({
+                "Mês": meses[validos].astype(np.int64),
+                "Cliente": df["Cliente"].to_numpy()[validos],
+                "R$ Total": df["R$ Total"].to_numpy(dtype=np.float64)[validos],
+            })
+            .groupby(["Mês", "Cliente"], sort=True)["R$ Total"]
+            .agg(["sum", "size"])
+        )
+
+        mes = grupos.index.get_level_values("Mês").to_numpy(dtype=np.int32)
+        codigos, clientes = pd.factorize(grupos.index.get_level_values("Cliente"), sort=True)
+        distintos = np.unique(mes)
+        return AgregadosTitulos(
+            clientes=np.asarray(clientes, dtype=object),
+            meses=distintos,
+            inicio_mes=np.searchsorted(mes, np.append(distintos, np.iinfo(np.int32).max)),
+            mes=mes,
+            cliente=codigos.astype(np.int32),
+            total=grupos["sum"].to_numpy(dtype=np.float64),
+            titulos=grupos["size"].to_numpy(dtype=np.int32),
+        )
+
+    @staticmethod
+    def graficos(
+        agregados: AgregadosTitulos,
+        filtros: FiltroRelatorio,
+        lojas_clientes: Optional[np.ndarray] = None,
+        n_devedores: int = TOP_DEVEDORES
+    ) -> GraficosTitulos:
+        """
+        Fatia os agregados conforme os filtros de cliente, período e loja.
+
+        O período é aplicado por mês inteiro: os meses da data inicial e da
+        final entram completos.
+
+        Args:
+            agregados: Resultado de ``calcular`` para o dataset
+            filtros: Filtros da sidebar
+            lojas_clientes: Loja de cada cliente de ``agregados.clientes``
+                (None para quem não é funcionário)
+            n_devedores: Quantidade de maiores devedores
+
+        Returns:
+            GraficosTitulos com as séries dos gráficos
+        """
+        inicio, fim = 0, len(agregados.meses)
+        if filtros.tem_filtro_data():
+            inicio = np.searchsorted(agregados.meses, _mes(filtros.data_inicio))
+            fim = np.searchsorted(agregados.meses, _mes(filtros.data_fim), side="right")
+        linhas = slice(agregados.inicio_mes[inicio], agregados.inicio_mes[max(fim, inicio)])
+        mes, cliente, total = agregados.mes[linhas], agregados.cliente[linhas], agregados.total[linhas]
+
+        # Filtros de cliente e de funcionários, sobre os códigos dos clientes
+        selecao = None
+        if filtros.tem_filtro_cliente():
+            selecao = cliente == AgregadosService.codigo_cliente(agregados, filtros.cliente)
+        if filtros.somente_funcionarios and lojas_clientes is not None:
+            funcionarios = pd.notna(lojas_clientes)
+            if filtros.loja and filtros.loja != LOJA_TODAS:
+                funcionarios &= lojas_clientes == filtros.loja
+            selecao = funcionarios[cliente] if selecao is None else selecao & funcionarios[cliente]
+        if selecao is not None:
+            mes, cliente, total = mes[selecao], cliente[selecao], total[selecao]
+
+        por_periodo, granularidade = AgregadosService.reduzir_serie(mes, total)
+
+        por_cliente = np.bincount(cliente, weights=total, minlength=len(agregados.clientes))
+        n = min(n_devedores, int(np.count_nonzero(por_cliente)))
+        maiores = np.argpartition(-por_cliente, n - 1)[:n] if n else np.zeros(0, dtype=np.int64)
+        maiores = maiores[np.argsort(-por_cliente[maiores], kind="stable")]
+        maiores_devedores = pd.Series(por_cliente[maiores], index=agregados.clientes[maiores], name="R$ Total")
+
+        por_loja = pd.Series(dtype=np.float64, name="R$ Total")
+        if lojas_clientes is not None:
+            com_loja = pd.notna(lojas_clientes) & (por_cliente != 0)
+            por_loja = (
+                pd.Series(por_cliente[com_loja], index=lojas_clientes[com_loja], name="R$ Total")
+                .groupby(level=0).sum()
+            )
+
+        return GraficosTitulos(
+            por_periodo=por_periodo,
+            granularidade=granularidade,
+            maiores_devedores=maiores_devedores,
+            por_loja=por_loja,
+        )
+
+    @staticmethod
+    def codigo_cliente(agregados: AgregadosTitulos, nome: str) -> int:
+        """
+        Código de um cliente nos agregados (busca binária nos nomes ordenados).
+
+        Args:
+            agregados: Agregados do dataset
+            nome: Nome do cliente
+
+        Returns:
+            Código do cliente, ou -1 se ele não tiver títulos com vencimento
+        """
+        posicao = int(np.searchsorted(agregados.clientes, nome))
+        if posicao < len(agregados.clientes) and agregados.clientes[posicao] == nome:
+            return posicao
+        return -1
+
+    @staticmethod
+    def reduzir_serie(mes: np.ndarray, total: np.ndarray, max_pontos: int = MAX_PONTOS_SERIE):
+        """
+        Soma os totais por período, com no máximo ``max_pontos`` períodos.
+
+        Os meses sem títulos entre o primeiro e o último entram com zero. Se
+        houver mais meses que o limite, a série passa a trimestres, anos ou
+        grupos de anos (alinhados ao calendário).
+
+        Args:
+            mes: Mês de cada valor (meses desde 1970)
+            total: Valores a somar
+
+        Returns:
+            Tupla (Série rótulo → total, granularidade)
+        """
+        if len(mes) == 0:
+            return pd.Series(dtype=np.float64, name="R$ Total"), "mês"
+
+        primeiro, ultimo = int(mes.min()), int(mes.max())
+        anos = ultimo // 12 - primeiro // 12 + 1
+        for passo, granularidade in ((1, "mês"), (3, "trimestre"), (12, "ano")):
+            if (ultimo // passo - primeiro // passo + 1) <= max_pontos:
+                break
+        else:
+            fator = -(-anos // max_pontos)
+            passo, granularidade = 12 * fator, f"{fator} anos"
+
+        base = primeiro // passo
+        somas = np.bincount(mes // passo - base, weights=total)
+        inicios = (np.arange(len(somas)) + base) * passo
+        return pd.Series(somas, index=[_rotulo(m, passo) for m in inicios], name="R$ Total"), granularidade
+
+
+def _mes(data) -> int:
+    """Mês de uma data, em meses desde 1970."""
+    return int(np.datetime64(pd.Timestamp(data).date(), "M").astype(np.int64))
+
+
+def _rotulo(mes: int, passo: int) -> str:
+    """Rótulo de um período que começa em ``mes`` (ordenável como texto)."""
+    ano, indice = 1970 + mes // 12, mes % 12
+    if passo == 1:
+        return f"{ano}-{indice + 1:02d}"
+    if passo == 3:
+        return f"{ano}-T{indice // 3 + 1}"
+    return str(ano)
@@ -0,0 +1,166 @@
+"""
+Armazenamento persistente das anotações por título.
+
+As anotações ("já cobrado" com a contagem de cobranças, "ação judicial",
+acordo comercial e observação) ficam em um SQLite local em modo WAL, fora do
+CSV do relatório, e por isso sobrevivem à troca do PDF. A chave é
+(Título, Fatura, Cliente).
+"""
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from ..config import config
+
+
+# Caminho padrão do banco de anotações
+CAMINHO_BANCO = config.CAMINHO_CSV.parent / "anotacoes.sqlite3"
+
+COLUNAS_CHAVE = ["Título", "Fatura", "Cliente"]
+
+# Colunas adicionadas ao DataFrame pela mesclagem
+COLUNAS_ANOTACAO = ["Cobrado", "Cobranças", "Ação judicial", "Acordo", "Observação"]
+
+OPCOES_ACORDO = ["", "Semanal", "Quinzenal", "Mensal"]
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS anotacoes (
+    titulo TEXT NOT NULL,
+    fatura TEXT NOT NULL,
+    cliente TEXT NOT NULL,
+    cobrado INTEGER NOT NULL DEFAULT 0,
+    cobrancas INTEGER NOT NULL DEFAULT 0,
+    acao_judicial INTEGER NOT NULL DEFAULT 0,
+    acordo TEXT NOT NULL DEFAULT '',
+    observacao TEXT NOT NULL DEFAULT '',
+    atualizado_em TEXT NOT NULL DEFAULT (datetime('now', 'localtime')),
+    PRIMARY KEY (titulo, fatura, cliente)
+);
+CREATE INDEX IF NOT EXISTS idx_anotacoes_cobrado ON anotacoes (cobrado);
+CREATE INDEX IF NOT EXISTS idx_anotacoes_acao_judicial ON anotacoes (acao_judicial);
+CREATE INDEX IF NOT EXISTS idx_anotacoes_cliente ON anotacoes (cliente);
+"""
+
+
+class AnotacaoService:
+    """Serviço de leitura, gravação e mesclagem das anotações."""
+
+    @staticmethod
+    def conectar(caminho: Optional[Path] = None) -> sqlite3.Connection:
+        """
+        Abre uma conexão com o banco, criando o esquema se necessário.
+
+        Args:
+            caminho: Caminho do banco (padrão: CAMINHO_BANCO)
+
+        Returns:
+            Conexão SQLite em modo WAL
+        """
+        caminho = caminho or CAMINHO_BANCO
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        conexao = sqlite3.connect(caminho, timeout=10)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        conexao.executescript(_ESQUEMA)
+        return conexao
+
+    @staticmethod
+    def carregar(caminho: Optional[Path] = None) -> pd.DataFrame:
+        """
+        Carrega todas as anotações, já com os nomes de coluna do relatório.
+
+        Args:
+            caminho: Caminho do banco (padrão: CAMINHO_BANCO)
+
+        Returns:
+            DataFrame com as colunas-chave e COLUNAS_ANOTACAO
+        """
+        with closing(AnotacaoService.conectar(caminho)) as conexao:
+            df = pd.read_sql_query(
+                "SELECT titulo, fatura, cliente, cobrado, cobrancas, acao_judicial, "
+                "acordo, observacao FROM anotacoes",
+                conexao
+            )
+        df.columns = COLUNAS_CHAVE + COLUNAS_ANOTACAO
+        df["Cobrado"] = df["Cobrado"].astype(bool)
+        df["Ação judicial"] = df["Ação judicial"].astype(bool)
+        return df
+
+    @staticmethod
+    def salvar(
+        titulo: str,
+        fatura: str,
+        cliente: str,
+        cobrado: bool = False,
+        cobrancas: int = 0,
+        acao_judicial: bool = False,
+        acordo: str = "",
+        observacao: str = "",
+        caminho: Optional[Path] = None
+    ) -> None:
+        """
+        Grava (insere ou atualiza) a anotação de um título.
+
+        Args:
+            titulo: Número do título
+            fatura: Número da fatura
+            cliente: Nome do cliente
+            cobrado: Se o título já foi cobrado
+            cobrancas: Quantidade de cobranças realizadas
+            acao_judicial: Se o título está marcado para ação judicial
+            acordo: Acordo comercial vigente (ver OPCOES_ACORDO)
+            observacao: Texto livre
+            caminho: Caminho do banco (padrão: CAMINHO_BANCO)
+        """
+        with closing(AnotacaoService.conectar(caminho)) as conexao, conexao:
+            conexao.execute(
+                """
+                INSERT INTO anotacoes (
+                    titulo, fatura, cliente, cobrado, cobrancas, acao_judicial, acordo, observacao
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (titulo, fatura, cliente) DO UPDATE SET
+                    cobrado = excluded.cobrado,
+                    cobrancas = excluded.cobrancas,
+                    acao_judicial = excluded.acao_judicial,
+                    acordo = excluded.acordo,
+                    observacao = excluded.observacao,
+                    atualizado_em = datetime('now', 'localtime')
+                """,
+                (
+                    str(titulo), str(fatura), str(cliente),
+                    int(cobrado), int(cobrancas), int(acao_judicial), acordo, observacao
+                )
+            )
+
+    @staticmethod
+    def mesclar(df: pd.DataFrame, anotacoes: pd.DataFrame) -> pd.DataFrame:
+        """
+        Junta as anotações ao DataFrame com um único merge vetorizado.
+
+        Títulos sem anotação recebem Cobrado/Ação judicial falsos e zero
+        cobranças. O índice original é preservado.
+
+        Args:
+            df: DataFrame com as colunas-chave
+            anotacoes: DataFrame retornado por ``carregar``
+
+        Returns:
+            DataFrame com COLUNAS_ANOTACAO adicionadas
+        """
+        chaves = pd.DataFrame({
+            coluna: df[coluna].fillna("").astype(str) for coluna in COLUNAS_CHAVE
+        })
+        mesclado = chaves.merge(anotacoes, on=COLUNAS_CHAVE, how="left")
+
+        # Cópia rasa: só as colunas novas são alocadas
+        resultado = df.copy(deep=False)
+        resultado["Cobrado"] = mesclado["Cobrado"].eq(True).to_numpy()
+        resultado["Cobranças"] = mesclado["Cobranças"].astype(float).fillna(0).astype(int).to_numpy()
+        resultado["Ação judicial"] = mesclado["Ação judicial"].eq(True).to_numpy()
+        resultado["Acordo"] = mesclado["Acordo"].fillna("").to_numpy()
+        resultado["Observação"] = mesclado["Observação"].fillna("").to_numpy()
+        return resultado
@@ -0,0 +1,106 @@
+"""
+Cache do resultado do parsing de cada PDF.
+
+O resultado validado de um PDF (títulos aceitos e rejeições) é guardado ao
+lado dele em media/, com o mesmo hash do conteúdo e a política de duplicados
+no nome. Reenviar um PDF já
+processado, sozinho ou junto com outros, não passa pelo parser de novo. Os
+arquivos do cache saem junto com o PDF na retenção de media/
+(``MediaStore.coletar_lixo``).
+"""
+
+import io
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from ..config import config
+from .dataset_store import DatasetStore
+from .validacao import COLUNA_CONFLITO, COLUNAS_VALOR, POLITICA_DUPLICADOS, RelatorioValidacao
+
+
+# Muda quando o parser ou a validação passam a produzir um resultado
+# diferente, para que o cache antigo seja ignorado
+VERSAO_PARSER = 4
+
+
+class CacheParseService:
+    """Leitura e gravação do cache de parsing, indexado pelo hash do PDF."""
+
+    @staticmethod
+    def caminho_titulos(hash_conteudo: str) -> Path:
+        """
+        Caminho dos títulos aceitos de um PDF.
+
+        Args:
+            hash_conteudo: Hash SHA-256 do PDF
+
+        Returns:
+            Path do CSV em media/
+        """
+        return config.CAMINHO_MEDIA / f"{hash_conteudo}.p{VERSAO_PARSER}.{POLITICA_DUPLICADOS}.titulos.csv"
+
+    @staticmethod
+    def caminho_rejeicoes(hash_conteudo: str) -> Path:
+        """
+        Caminho das rejeições da validação de um PDF.
+
+        Args:
+            hash_conteudo: Hash SHA-256 do PDF
+
+        Returns:
+            Path do CSV em media/
+        """
+        return config.CAMINHO_MEDIA / f"{hash_conteudo}.p{VERSAO_PARSER}.{POLITICA_DUPLICADOS}.rejeicoes.csv"
+
+    @staticmethod
+    def obter(hash_conteudo: str) -> Optional[RelatorioValidacao]:
+        """
+        Lê o resultado em cache de um PDF.
+
+        Args:
+            hash_conteudo: Hash SHA-256 do PDF
+
+        Returns:
+            RelatorioValidacao, ou None se o PDF ainda não foi processado
+        """
+        try:
+            aceitos = pd.read_csv(CacheParseService.caminho_titulos(hash_conteudo), dtype=str)
+            rejeicoes = pd.read_csv(
+                CacheParseService.caminho_rejeicoes(hash_conteudo),
+                dtype={"Título": str, "Fatura": str}
+            )
+        except FileNotFoundError:
+            return None
+
+        for coluna in COLUNAS_VALOR:
+            if coluna in aceitos.columns:
+                aceitos[coluna] = aceitos[coluna].astype(float)
+        if COLUNA_CONFLITO in aceitos.columns:
+            aceitos[COLUNA_CONFLITO] = aceitos[COLUNA_CONFLITO] == "True"
+        return RelatorioValidacao(aceitos=aceitos, rejeicoes=rejeicoes)
+
+    @staticmethod
+    def gravar(hash_conteudo: str, relatorio: RelatorioValidacao) -> None:
+        """
+        Guarda o resultado validado de um PDF.
+
+        As rejeições são gravadas primeiro: o arquivo de títulos, lido por
+        ``obter``, só aparece com o par completo. Um resultado vazio não é
+        guardado, pois pode vir de uma falha de leitura do PDF.
+
+        Args:
+            hash_conteudo: Hash SHA-256 do PDF
+            relatorio: Resultado de ``ValidacaoService.validar``
+        """
+        if relatorio.aceitos.empty and relatorio.rejeicoes.empty:
+            return
+
+        for destino, df in (
+            (CacheParseService.caminho_rejeicoes(hash_conteudo), relatorio.rejeicoes),
+            (CacheParseService.caminho_titulos(hash_conteudo), relatorio.aceitos),
+        ):
+            buffer = io.StringIO()
+            df.to_csv(buffer, index=False)
+            DatasetStore.gravar_atomico(destino, buffer.getvalue().encode("utf-8"))
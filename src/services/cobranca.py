@@ -0,0 +1,112 @@
+"""
+Serviço de montagem dos resumos de cobrança.
+
+Gera um resumo por cliente em atraso (títulos vencidos, total devido e
+vencimento mais antigo) com um único groupby sobre o dataset preparado.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from ..utils.formatters import formatar_data_brasileira, formatar_valor_brasileiro
+
+
+class CobrancaService:
+    """Serviço para geração dos resumos de cobrança por cliente."""
+
+    @staticmethod
+    def montar_resumos(
+        df: pd.DataFrame,
+        hoje: Optional[pd.Timestamp] = None,
+        periodo: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Monta um resumo por cliente com os títulos vencidos.
+
+        Args:
+            df: DataFrame preparado (Vencimento em datetime)
+            hoje: Data de referência (padrão: hoje)
+            periodo: Período da cobrança, ex. "2025-06" (padrão: mês de ``hoje``)
+
+        Returns:
+            DataFrame com Cliente, Títulos, Quantidade, Total, Vencimento mais
+            antigo, Período e Chave, ordenado pelo total devido
+        """
+        hoje = (hoje or pd.Timestamp.today()).normalize()
+        periodo = periodo or hoje.strftime("%Y-%m")
+
+        vencidos = df.loc[df["Vencimento"] < hoje, ["Cliente", "Título", "Vencimento", "R$ Total"]]
+        if vencidos.empty:
+            return pd.DataFrame(columns=[
+                "Cliente", "Títulos", "Quantidade", "Total",
+                "Vencimento mais antigo", "Período", "Chave"
+            ])
+
+        resumos = (
+            vencidos
+            .assign(Título=vencidos["Título"].astype(str))
+            .groupby("Cliente", sort=False)
+            .agg(
+                Títulos=("Título", list),
+                Quantidade=("Título", "size"),
+                Total=("R$ Total", "sum"),
+                **{"Vencimento mais antigo": ("Vencimento", "min")}
+            )
+            .reset_index()
+            .sort_values("Total", ascending=False, ignore_index=True)
+        )
+        resumos["Total"] = resumos["Total"].round(2)
+        resumos["Período"] = periodo
+        resumos["Chave"] = [
+            CobrancaService.chave_idempotencia(cliente, periodo) for cliente in resumos["Cliente"]
+        ]
+        return resumos
+
+    @staticmethod
+    def chave_idempotencia(cliente: str, periodo: str) -> str:
+        """
+        Gera a chave de idempotência de uma cobrança.
+
+        A mesma combinação (cliente, período) gera sempre a mesma chave, para
+        que o destino descarte reenvios.
+
+        Args:
+            cliente: Nome do cliente
+            periodo: Período da cobrança
+
+        Returns:
+            Hash hexadecimal de 32 caracteres
+        """
+        return hashlib.sha256(f"{cliente}|{periodo}".encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def para_mensagens(resumos: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Converte os resumos em payloads JSON para envio.
+
+        Args:
+            resumos: DataFrame gerado por ``montar_resumos``
+
+        Returns:
+            Lista de dicionários serializáveis
+        """
+        mensagens = []
+        for linha in resumos.itertuples(index=False):
+            cliente, titulos, quantidade, total, mais_antigo, periodo, chave = linha
+            mensagens.append({
+                "chave": chave,
+                "cliente": cliente,
+                "periodo": periodo,
+                "quantidade": int(quantidade),
+                "total": float(total),
+                "vencimento_mais_antigo": mais_antigo.strftime("%Y-%m-%d"),
+                "titulos": titulos,
+                "mensagem": (
+                    f"Olá, {cliente}. Constam {quantidade} título(s) em aberto, "
+                    f"no total de R$ {formatar_valor_brasileiro(total)}, "
+                    f"com vencimento desde {formatar_data_brasileira(mais_antigo)}."
+                ),
+            })
+        return mensagens
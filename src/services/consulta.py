@@ -0,0 +1,186 @@
+"""
+Serviço de consultas headless sobre os dados do relatório.
+
+Traduz parâmetros textuais (linha de comando ou query string) em um
+``FiltroRelatorio``, calcula o resumo de aging e serializa os resultados em
+blocos de JSONL ou CSV, para que listas grandes nunca sejam montadas inteiras
+em memória como texto.
+"""
+
+from datetime import date
+from typing import Dict, Iterator, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import FiltroRelatorio
+from .data_filter import SEM_VENCIMENTO, DataFilterService
+from .dataset_session import DatasetAtivo, DatasetSessionService
+from ..utils.funcionarios import LOJA_TODAS
+
+
+# Faixas de aging: (rótulo, dias de atraso mínimo, dias de atraso máximo)
+FAIXAS_AGING = [
+    ("A vencer", None, 0),
+    ("1-30", 1, 30),
+    ("31-60", 31, 60),
+    ("61-90", 61, 90),
+    ("91-180", 91, 180),
+    ("181-365", 181, 365),
+    ("> 365", 366, None),
+]
+
+# Quantidade de linhas serializadas por bloco
+LINHAS_POR_BLOCO = 5000
+
+FORMATOS = ("jsonl", "csv")
+
+
+class ConsultaService:
+    """Serviço de consultas sem interface gráfica."""
+
+    @staticmethod
+    def filtros_de_parametros(dataset: DatasetAtivo, parametros: Mapping[str, str]) -> FiltroRelatorio:
+        """
+        Monta um FiltroRelatorio a partir de parâmetros textuais.
+
+        Parâmetros aceitos: cliente, titulo, data_inicio, data_fim (dd/mm/aaaa
+        ou aaaa-mm-dd), valor_min, valor_max, atrasados (meses de atraso),
+        atrasados_semanas, futuros (dias), funcionarios, loja e cobrado (1 para
+        já cobrados, 0 para a cobrar). Os ausentes
+        equivalem às opções padrão da sidebar.
+
+        Args:
+            dataset: Dataset ativo; suas opções em cache dão os limites padrão
+                de valor
+            parametros: Dicionário com os parâmetros informados
+
+        Returns:
+            Filtros configurados
+
+        Raises:
+            ValueError: Se algum parâmetro tiver formato inválido
+        """
+        opcoes = DatasetSessionService.opcoes_filtros(dataset)
+
+        data_inicio = ConsultaService._data(parametros.get("data_inicio"))
+        data_fim = ConsultaService._data(parametros.get("data_fim"))
+        if not DataFilterService.validar_intervalo_data(data_inicio, data_fim):
+            data_inicio = data_fim = None
+
+        semanas = parametros.get("atrasados_semanas")
+        meses = parametros.get("atrasados")
+        futuros = parametros.get("futuros")
+        loja = parametros.get("loja")
+        cobrado = parametros.get("cobrado")
+
+        return FiltroRelatorio(
+            cliente=parametros.get("cliente") or "Todos",
+            titulo=parametros.get("titulo") or "Todos",
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            valor_min=float(parametros.get("valor_min") or opcoes["valor_min"]),
+            valor_max=float(parametros.get("valor_max") or opcoes["valor_max"]),
+            atrasados=bool(semanas or meses),
+            tempo_atraso=int(semanas or meses) if (semanas or meses) else None,
+            mes_corrente=bool(semanas),
+            ja_cobrados=cobrado is not None and ConsultaService._booleano(cobrado),
+            a_cobrar=cobrado is not None and not ConsultaService._booleano(cobrado),
+            cobrancas_futuras=bool(futuros),
+            dias_futuros=int(futuros) if futuros else None,
+            somente_funcionarios=ConsultaService._booleano(parametros.get("funcionarios")) or bool(loja),
+            loja=loja or LOJA_TODAS
+        )
+
+    @staticmethod
+    def resumo_aging(df: pd.DataFrame, hoje: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Agrupa os títulos por faixa de atraso.
+
+        Args:
+            df: DataFrame preparado (Vencimento em datetime)
+            hoje: Data de referência (padrão: hoje)
+
+        Returns:
+            DataFrame com Faixa, Títulos e R$ Total por faixa
+        """
+        dias = DataFilterService.calcular_dias_atraso(df["Vencimento"], hoje)
+        totais = df["R$ Total"].to_numpy()
+
+        linhas = []
+        for rotulo, minimo, maximo in FAIXAS_AGING:
+            mascara = dias != SEM_VENCIMENTO
+            if minimo is not None:
+                mascara &= dias >= minimo
+            if maximo is not None:
+                mascara &= dias <= maximo
+            linhas.append({
+                "Faixa": rotulo,
+                "Títulos": int(mascara.sum()),
+                "R$ Total": round(float(np.nansum(totais[mascara])), 2),
+            })
+        return pd.DataFrame(linhas)
+
+    @staticmethod
+    def serializar(df: pd.DataFrame, formato: str) -> Iterator[str]:
+        """
+        Serializa o DataFrame em blocos de texto.
+
+        Args:
+            df: DataFrame a serializar
+            formato: "jsonl" ou "csv"
+
+        Returns:
+            Iterador de blocos de texto
+
+        Raises:
+            ValueError: Se o formato não for suportado
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato não suportado: {formato}")
+
+        for inicio in range(0, len(df), LINHAS_POR_BLOCO):
+            bloco = df.iloc[inicio:inicio + LINHAS_POR_BLOCO]
+            if formato == "csv":
+                yield bloco.to_csv(index=False, header=inicio == 0, date_format="%Y-%m-%d")
+            else:
+                texto = bloco.to_json(
+                    orient="records", lines=True, date_format="iso",
+                    force_ascii=False, double_precision=2
+                )
+                yield texto if texto.endswith("\n") else texto + "\n"
+
+        if formato == "csv" and df.empty:
+            yield df.to_csv(index=False)
+
+    @staticmethod
+    def _data(valor: Optional[str]) -> Optional[date]:
+        if not valor:
+            return None
+        dayfirst = "/" in valor
+        data = pd.to_datetime(valor, dayfirst=dayfirst, errors="coerce")
+        if pd.isna(data):
+            raise ValueError(f"Data inválida: {valor}")
+        return data.date()
+
+    @staticmethod
+    def _booleano(valor: Optional[str]) -> bool:
+        return str(valor).lower() in {"1", "true", "sim", "s", "yes"}
+
+    @staticmethod
+    def parametros_validos() -> Dict[str, str]:
+        """Descrição dos parâmetros aceitos, para ajuda da CLI e da API."""
+        return {
+            "cliente": "Nome exato do cliente",
+            "titulo": "Número do título",
+            "data_inicio": "Vencimento inicial (dd/mm/aaaa ou aaaa-mm-dd)",
+            "data_fim": "Vencimento final (dd/mm/aaaa ou aaaa-mm-dd)",
+            "valor_min": "R$ Total mínimo",
+            "valor_max": "R$ Total máximo",
+            "atrasados": "Somente atrasados até N meses",
+            "atrasados_semanas": "Somente atrasados até N semanas",
+            "futuros": "Somente vencendo nos próximos N dias",
+            "funcionarios": "Somente funcionários (1/0)",
+            "loja": "Loja do funcionário (implica funcionarios=1)",
+            "cobrado": "Somente já cobrados (1) ou a cobrar (0)",
+        }
@@ -1,126 +1,187 @@
 """
 Serviço responsável por aplicar filtros aos dados do relatório.
+
+Os filtros relativos à data de hoje (atrasados, cobranças futuras) comparam
+inteiros: os dias de atraso de cada título em relação a uma data de
+referência, calculados uma vez por dataset e por dia
+(``calcular_dias_atraso``).
+
+Com uma permutação de ordenação (``OrdenacaoService``), a seleção das linhas
+já sai na ordem pedida.
 """
 
+import numpy as np
 import pandas as pd
-import re
 from typing import Tuple, Optional
 from ..config import FiltroRelatorio
-from ..utils.funcionarios import FUNCIONARIO_PARA_LOJA
+from .anotacoes import AnotacaoService
+from .ordenacao import OrdenacaoService
+from ..utils.funcionarios import LOJA_TODAS, lojas_dos_clientes
+
+
+# Unidade do slider de atraso: semanas no "mês corrente", meses fora dele
+DIAS_POR_SEMANA = 7
+DIAS_POR_MES = 30
+
+# Dias de atraso dos títulos sem vencimento (ficam fora de qualquer faixa)
+SEM_VENCIMENTO = np.iinfo(np.int32).min
 
 
 class DataFilterService:
     """Serviço para aplicação de filtros nos dados."""
     
     @staticmethod
-    def aplicar_filtros(df: pd.DataFrame, filtros: FiltroRelatorio) -> pd.DataFrame:
+    def aplicar_filtros(
+        df: pd.DataFrame,
+        filtros: FiltroRelatorio,
+        anotacoes: Optional[pd.DataFrame] = None,
+        hoje: Optional[pd.Timestamp] = None,
+        dias_atraso: Optional[np.ndarray] = None,
+        permutacao: Optional[np.ndarray] = None
+    ) -> pd.DataFrame:
         """
         Aplica todos os filtros configurados ao DataFrame.
         
         Args:
             df: DataFrame original
             filtros: Configuração de filtros
+            anotacoes: Anotações persistentes; quando informadas, são mescladas
+                ao resultado e habilitam os filtros "Já cobrados"/"A cobrar"
+            hoje: Data de referência dos filtros de atraso (padrão: hoje)
+            dias_atraso: Dias de atraso já calculados para ``df`` (ver
+                ``calcular_dias_atraso``); quando informado, ``hoje`` é ignorado
+            permutacao: Ordem do dataset inteiro (``OrdenacaoService.permutacao``);
+                quando informada, o resultado sai nessa ordem
             
         Returns:
             DataFrame filtrado
         """
-        df_filtrado = df.copy()
+        # As condições são acumuladas em uma única máscara e aplicadas de uma
+        # vez: o DataFrame base (compartilhado e mapeado em memória) nunca é
+        # copiado nem alterado
+        mascara = np.ones(len(df), dtype=bool)
         
         # Filtro por cliente
         if filtros.tem_filtro_cliente():
-            df_filtrado = DataFilterService._filtrar_por_cliente(df_filtrado, filtros.cliente)
+            mascara &= DataFilterService._mascara_cliente(df, filtros.cliente)
         
         # Filtro por título
         if filtros.tem_filtro_titulo():
-            df_filtrado = DataFilterService._filtrar_por_titulo(df_filtrado, filtros.titulo)
+            mascara &= DataFilterService._mascara_titulo(df, filtros.titulo)
         
         # Filtro por data
         if filtros.tem_filtro_data():
-            df_filtrado = DataFilterService._filtrar_por_data(
-                df_filtrado, filtros.data_inicio, filtros.data_fim
+            mascara &= DataFilterService._mascara_data(
+                df, filtros.data_inicio, filtros.data_fim
             )
         
         # Filtro por valor
         if filtros.tem_filtro_valor():
-            df_filtrado = DataFilterService._filtrar_por_valor(
-                df_filtrado, filtros.valor_min, filtros.valor_max
+            mascara &= DataFilterService._mascara_valor(
+                df, filtros.valor_min, filtros.valor_max
             )
         
-        # Filtro: títulos atrasados
-        if filtros.atrasados and filtros.tempo_atraso:
-            hoje = pd.Timestamp.today()
-            dias_limite = filtros.tempo_atraso * (7 if filtros.mes_corrente else 30)
-
-            df_filtrado = df_filtrado[df_filtrado["Vencimento"] < hoje]
-            df_filtrado = df_filtrado[(hoje - df_filtrado["Vencimento"]).dt.days <= dias_limite]
+        # Filtros relativos à data: faixas inteiras de dias de atraso
+        atrasados = filtros.atrasados and filtros.tempo_atraso
+        futuras = filtros.cobrancas_futuras and filtros.dias_futuros
+        if (atrasados or futuras) and dias_atraso is None:
+            dias_atraso = DataFilterService.calcular_dias_atraso(df["Vencimento"], hoje)
 
-        # Filtro: cobranças futuras
-        if filtros.cobrancas_futuras and filtros.dias_futuros:
-            hoje = pd.Timestamp.today()
-            limite = hoje + pd.Timedelta(days=filtros.dias_futuros)
+        # Filtro: títulos atrasados (vencidos há até N semanas ou meses)
+        if atrasados:
+            unidade = DIAS_POR_SEMANA if filtros.mes_corrente else DIAS_POR_MES
+            mascara &= (dias_atraso >= 1) & (dias_atraso <= filtros.tempo_atraso * unidade)
 
-            df_filtrado = df_filtrado[
-                (df_filtrado["Vencimento"] > hoje) &
-                (df_filtrado["Vencimento"] <= limite)
-            ]
+        # Filtro: cobranças futuras (vencem de hoje até N dias)
+        if futuras:
+            mascara &= (dias_atraso <= 0) & (dias_atraso >= -filtros.dias_futuros)
 
         # Filtro: Somente Funcionários
+        lojas = None
         if filtros.somente_funcionarios:
-            # Normalizar nomes para comparação
-            nomes_funcionarios = {nome.lower(): loja for nome, loja in FUNCIONARIO_PARA_LOJA.items()}
-
-            # Filtrar apenas clientes que são funcionários
-            df_filtrado["Cliente_normalizado"] = (
-                df_filtrado["Cliente"]
-                .str.replace(r"\s*\(FUNCION[AÁ]RIO\)", "", flags=re.IGNORECASE, regex=True)
-                .str.lower()
-                .str.normalize("NFKD")
-                .str.encode("ascii", errors="ignore")
-                .str.decode("utf-8")
-            )
-            df_filtrado = df_filtrado[df_filtrado["Cliente_normalizado"].isin(nomes_funcionarios.keys())]
-
-            # Adicionar coluna Loja
-            df_filtrado["Funcionário"] = df_filtrado["Cliente_normalizado"].map(nomes_funcionarios)
+            lojas = lojas_dos_clientes(df["Cliente"])
+            mascara &= lojas.notna().to_numpy()
 
             # Aplicar filtro de loja, se necessário
-            if filtros.loja != "Todas" and "Funcionário" in df_filtrado.columns:
-                df_filtrado = df_filtrado[df_filtrado["Funcionário"] == filtros.loja]
-            
-            if "Cliente_normalizado" in df_filtrado.columns:
-                df_filtrado.drop(columns=["Cliente_normalizado"], inplace=True)
+            if filtros.loja != LOJA_TODAS:
+                mascara &= _como_mascara(lojas == filtros.loja)
+
+        # Seleção única; sem filtro, apenas uma cópia rasa (mesmas colunas).
+        # Com permutação, as posições selecionadas já vêm ordenadas
+        if permutacao is not None:
+            selecao = OrdenacaoService.selecionar(mascara, permutacao)
+            df_filtrado = df.take(selecao)
+        else:
+            selecao = mascara
+            df_filtrado = df.copy(deep=False) if mascara.all() else df[mascara]
+
+        # Adicionar coluna Loja
+        if lojas is not None:
+            df_filtrado = df_filtrado.assign(**{"Funcionário": lojas.to_numpy()[selecao]})
 
+        # Anotações: uma única junção sobre o resultado já filtrado
+        if anotacoes is not None:
+            df_filtrado = AnotacaoService.mesclar(df_filtrado, anotacoes)
+
+            # Filtro: já cobrados / a cobrar (marcar os dois equivale a não filtrar)
+            if filtros.ja_cobrados != filtros.a_cobrar:
+                df_filtrado = df_filtrado[df_filtrado["Cobrado"] == filtros.ja_cobrados]
         
         return df_filtrado
     
     @staticmethod
-    def _filtrar_por_cliente(df: pd.DataFrame, cliente: str) -> pd.DataFrame:
-        """Filtra o DataFrame por cliente específico."""
-        return df[df["Cliente"] == cliente]
+    def _mascara_cliente(df: pd.DataFrame, cliente: str) -> np.ndarray:
+        """Máscara dos títulos de um cliente específico."""
+        return _como_mascara(df["Cliente"] == cliente)
     
     @staticmethod
-    def _filtrar_por_titulo(df: pd.DataFrame, titulo: str) -> pd.DataFrame:
-        """Filtra o DataFrame por título específico."""
-        return df[df["Título"] == titulo]
+    def _mascara_titulo(df: pd.DataFrame, titulo: str) -> np.ndarray:
+        """Máscara de um título específico."""
+        return _como_mascara(df["Título"] == titulo)
     
     @staticmethod
-    def _filtrar_por_data(df: pd.DataFrame, data_inicio: str, data_fim: str) -> pd.DataFrame:
-        """Filtra o DataFrame por intervalo de datas."""
+    def _mascara_data(df: pd.DataFrame, data_inicio: str, data_fim: str) -> np.ndarray:
+        """Máscara do intervalo de datas."""
         data_inicio_pd = pd.to_datetime(data_inicio)
         data_fim_pd = pd.to_datetime(data_fim)
         
-        return df[
+        return _como_mascara(
             (df["Vencimento"] >= data_inicio_pd) & 
             (df["Vencimento"] <= data_fim_pd)
-        ]
+        )
     
     @staticmethod
-    def _filtrar_por_valor(df: pd.DataFrame, valor_min: float, valor_max: float) -> pd.DataFrame:
-        """Filtra o DataFrame por faixa de valores."""
-        return df[
+    def _mascara_valor(df: pd.DataFrame, valor_min: float, valor_max: float) -> np.ndarray:
+        """Máscara da faixa de valores."""
+        return _como_mascara(
             (df["R$ Total"] >= valor_min) & 
             (df["R$ Total"] <= valor_max)
-        ]
+        )
+    
+    @staticmethod
+    def calcular_dias_atraso(vencimentos: pd.Series, hoje: Optional[pd.Timestamp] = None) -> np.ndarray:
+        """
+        Calcula os dias de atraso de cada título em uma data de referência.
+        
+        Positivo para os vencidos, zero para os que vencem na data e negativo
+        para os a vencer; os sem vencimento recebem ``SEM_VENCIMENTO``.
+        
+        Args:
+            vencimentos: Coluna Vencimento (datetime)
+            hoje: Data de referência (padrão: hoje)
+            
+        Returns:
+            Array int32 alinhado a ``vencimentos``
+        """
+        referencia = np.datetime64((hoje or pd.Timestamp.today()).date(), "D")
+        datas = vencimentos.to_numpy(dtype="datetime64[ns]")
+        sem_data = np.isnat(datas)
+        
+        dias = (referencia - datas.astype("datetime64[D]")).astype(np.int64)
+        limite = np.iinfo(np.int32)
+        dias = np.clip(dias, limite.min + 1, limite.max).astype(np.int32)
+        dias[sem_data] = SEM_VENCIMENTO
+        return dias
     
     @staticmethod
     def preparar_dados_para_filtros(df: pd.DataFrame) -> pd.DataFrame:
@@ -185,4 +246,9 @@ class DataFilterService:
             data_inicio is not None and 
             data_fim is not None and 
             data_inicio <= data_fim
-        )
\ No newline at end of file
+        )
+
+
+def _como_mascara(condicao: pd.Series) -> np.ndarray:
+    """Converte uma condição em máscara numpy; valores ausentes contam como falso."""
+    return condicao.to_numpy(dtype=bool, na_value=False)
@@ -0,0 +1,345 @@
+"""
+Camada de sessão de datasets.
+
+Identifica cada conjunto de dados pela sua versão publicada (DatasetStore) e
+mantém em cache (via ``st.cache_resource``) o DataFrame já preparado para os
+filtros, mapeado em memória a partir da cópia colunar da versão: todas as
+sessões compartilham as mesmas páginas e cada rerun carrega exatamente um
+dataset. Uploads são processados em segundo plano;
+enquanto isso a sessão continua no dataset anterior.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .agregados import AgregadosService, AgregadosTitulos
+from .data_filter import DataFilterService
+from .dataset_store import DatasetStore
+from .ingest_jobs import IngestJob, IngestJobService
+from .ordenacao import Chave, OrdenacaoService
+from .resumo_clientes import ResumoClientesService
+from ..utils.funcionarios import lojas_dos_clientes, obter_diretorio
+
+
+# Chave do dataset ativo em st.session_state
+CHAVE_SESSAO = "dataset_ativo"
+
+
+@dataclass(frozen=True)
+class DatasetAtivo:
+    """Dataset selecionado para o rerun atual."""
+
+    chave: str
+    df: pd.DataFrame
+    nome_arquivo: Optional[str] = None
+    job: Optional[IngestJob] = None
+
+
+class DatasetSessionService:
+    """Serviço que resolve, carrega e prepara o dataset de cada rerun."""
+
+    @staticmethod
+    def hash_conteudo(conteudo: bytes) -> str:
+        """
+        Calcula o hash do conteúdo de um arquivo.
+
+        Args:
+            conteudo: Bytes do arquivo
+
+        Returns:
+            Hash SHA-256 em hexadecimal
+        """
+        return hashlib.sha256(conteudo).hexdigest()
+
+    @staticmethod
+    def chave_dataset_padrao() -> str:
+        """
+        Retorna a chave do dataset vigente.
+
+        A chave é a versão publicada (já derivada do hash do conteúdo); sem
+        dados, recebe uma chave fixa para que o cache ainda funcione.
+
+        Returns:
+            Versão vigente ou "vazio"
+        """
+        return DatasetStore.versao_atual() or "vazio"
+
+    @staticmethod
+    def chave_upload(arquivos_upload: List) -> str:
+        """
+        Identifica um upload pelo conteúdo e pela ordem dos seus PDFs.
+
+        A ordem conta porque, na mesclagem, vale o primeiro arquivo em que
+        cada título aparece.
+
+        Args:
+            arquivos_upload: Arquivos enviados via upload
+
+        Returns:
+            Hash do PDF, se for um só, ou hash dos hashes na ordem do upload
+        """
+        hashes = [DatasetSessionService.hash_conteudo(a.getvalue()) for a in arquivos_upload]
+        if len(hashes) == 1:
+            return hashes[0]
+        return DatasetSessionService.hash_conteudo(" ".join(hashes).encode("ascii"))
+
+    @staticmethod
+    def resolver(arquivos_upload: List) -> DatasetAtivo:
+        """
+        Resolve o dataset do rerun: o upload, se houver, senão o CSV padrão.
+
+        Um upload ainda em processamento não bloqueia o rerun: a sessão segue
+        com o dataset anterior e recebe o job para exibir o progresso. Quando o
+        job termina, o dataset ativo da sessão é trocado de uma só vez.
+
+        Args:
+            arquivos_upload: Arquivos enviados via upload (lista vazia se nenhum)
+
+        Returns:
+            DatasetAtivo com o DataFrame preparado
+        """
+        if not arquivos_upload:
+            st.session_state.pop(CHAVE_SESSAO, None)
+            return DatasetSessionService.dataset_padrao()
+
+        chave = DatasetSessionService.chave_upload(arquivos_upload)
+        job = IngestJobService.obter_ou_iniciar(_registro_jobs(), chave, arquivos_upload)
+
+        if job.status == IngestJob.CONCLUIDO:
+            ativo = st.session_state.get(CHAVE_SESSAO)
+            if ativo is None or ativo.chave != job.versao:
+                ativo = DatasetAtivo(
+                    chave=job.versao,
+                    df=_carregar_versao_preparada(job.versao),
+                    nome_arquivo=job.nome_arquivo
+                )
+                st.session_state[CHAVE_SESSAO] = ativo
+            return ativo
+
+        anterior = st.session_state.get(CHAVE_SESSAO) or DatasetSessionService.dataset_padrao()
+        return DatasetAtivo(
+            chave=anterior.chave,
+            df=anterior.df,
+            nome_arquivo=anterior.nome_arquivo,
+            job=job
+        )
+
+    @staticmethod
+    def opcoes_filtros(dataset: DatasetAtivo, cliente: Optional[str] = None) -> dict:
+        """
+        Retorna as opções dos filtros do dataset, em cache por chave e cliente.
+
+        Args:
+            dataset: Dataset ativo
+            cliente: Cliente selecionado (se houver)
+
+        Returns:
+            Dicionário com as opções de filtro
+        """
+        return _opcoes_filtros(dataset.chave, cliente, dataset.df)
+
+    @staticmethod
+    def dias_atraso(dataset: DatasetAtivo, hoje: Optional[pd.Timestamp] = None) -> np.ndarray:
+        """
+        Retorna os dias de atraso dos títulos, em cache por dataset e por dia.
+
+        O cache é indexado pela data de referência: na virada do dia a
+        coluna é recalculada uma vez e reaproveitada pelas sessões.
+
+        Args:
+            dataset: Dataset ativo
+            hoje: Data de referência (padrão: hoje)
+
+        Returns:
+            Array int32 somente leitura, alinhado a ``dataset.df``
+        """
+        if dataset.df.empty:
+            return np.zeros(0, dtype=np.int32)
+        referencia = (hoje or pd.Timestamp.today()).date()
+        return _dias_atraso(dataset.chave, referencia, dataset.df)
+
+    @staticmethod
+    def agregados(dataset: DatasetAtivo) -> AgregadosTitulos:
+        """
+        Retorna os agregados dos gráficos, em cache por dataset.
+
+        Args:
+            dataset: Dataset ativo
+
+        Returns:
+            AgregadosTitulos do dataset (um único groupby por versão)
+        """
+        return _agregados(dataset.chave, dataset.df)
+
+    @staticmethod
+    def lojas_agregados(dataset: DatasetAtivo) -> np.ndarray:
+        """
+        Retorna a loja de cada cliente dos agregados, em cache por dataset.
+
+        O cache também é indexado pela data de modificação do diretório de
+        funcionários: editar o arquivo refaz só esta busca.
+
+        Args:
+            dataset: Dataset ativo
+
+        Returns:
+            Array alinhado a ``agregados(dataset).clientes`` (None para quem
+            não é funcionário)
+        """
+        agregados = DatasetSessionService.agregados(dataset)
+        return _lojas_agregados(dataset.chave, obter_diretorio().modificado_em, agregados)
+
+    @staticmethod
+    def permutacao(dataset: DatasetAtivo, chaves: Tuple[Chave, ...]) -> np.ndarray:
+        """
+        Retorna a ordem do dataset pelas chaves, em cache por dataset e chaves.
+
+        Args:
+            dataset: Dataset ativo
+            chaves: Pares (coluna, crescente), em ordem de prioridade
+
+        Returns:
+            Array de posições somente leitura (``OrdenacaoService.permutacao``)
+        """
+        return _permutacao(dataset.chave, chaves, dataset.df)
+
+    @staticmethod
+    def resumo_clientes(dataset: DatasetAtivo) -> pd.DataFrame:
+        """
+        Retorna o resumo por cliente gravado na publicação da versão.
+
+        Args:
+            dataset: Dataset ativo
+
+        Returns:
+            Resumo por cliente (``ResumoClientesService``), mapeado em memória
+        """
+        return _resumo_clientes(dataset.chave)
+
+    @staticmethod
+    def lojas_resumo(dataset: DatasetAtivo) -> np.ndarray:
+        """
+        Retorna a loja de cada cliente do resumo, em cache por dataset e pela
+        data de modificação do diretório de funcionários.
+
+        Args:
+            dataset: Dataset ativo
+
+        Returns:
+            Array alinhado a ``resumo_clientes(dataset)`` (None para quem não
+            é funcionário)
+        """
+        resumo = DatasetSessionService.resumo_clientes(dataset)
+        return _lojas_resumo(dataset.chave, obter_diretorio().modificado_em, resumo)
+
+    @staticmethod
+    def rejeicoes(dataset: DatasetAtivo) -> Optional[pd.DataFrame]:
+        """
+        Retorna o relatório de validação do upload que gerou o dataset.
+
+        Args:
+            dataset: Dataset ativo
+
+        Returns:
+            DataFrame de rejeições, ou None se o dataset não veio de um upload
+        """
+        if not dataset.nome_arquivo:
+            return None
+        return _rejeicoes(dataset.chave)
+
+    @staticmethod
+    def pre_aquecer() -> None:
+        """
+        Carrega o dataset padrão e suas opções de filtro para o cache.
+
+        Pensado para rodar em segundo plano na partida do servidor, de modo que
+        a primeira sessão já encontre o dataset preparado.
+        """
+        dataset = DatasetSessionService.dataset_padrao()
+        if not dataset.df.empty:
+            DatasetSessionService.opcoes_filtros(dataset)
+
+    @staticmethod
+    def dataset_padrao() -> DatasetAtivo:
+        """
+        Retorna a versão vigente já preparada, a partir do cache.
+
+        Returns:
+            DatasetAtivo da versão vigente
+        """
+        chave = DatasetSessionService.chave_dataset_padrao()
+        return DatasetAtivo(chave=chave, df=_carregar_versao_preparada(chave))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _carregar_versao_preparada(versao: str) -> pd.DataFrame:
+    """Abre uma versão publicada já preparada; mapeada em memória, sem cópia."""
+    if versao == "vazio":
+        return pd.DataFrame()
+    return DatasetStore.carregar_mapeado(versao)
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _opcoes_filtros(chave: str, cliente: Optional[str], _df: pd.DataFrame) -> dict:
+    """Opções de filtro do dataset ``chave``; o DataFrame não entra no hash."""
+    return DataFilterService.obter_opcoes_filtros(_df, cliente=cliente)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _dias_atraso(chave: str, referencia: date, _df: pd.DataFrame) -> np.ndarray:
+    """Dias de atraso do dataset ``chave`` na data de referência."""
+    dias = DataFilterService.calcular_dias_atraso(_df["Vencimento"], pd.Timestamp(referencia))
+    dias.setflags(write=False)
+    return dias
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _agregados(chave: str, _df: pd.DataFrame) -> AgregadosTitulos:
+    """Agregados dos gráficos do dataset ``chave``."""
+    return AgregadosService.calcular(_df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _lojas_agregados(chave: str, modificado_em: int, _agregados_titulos: AgregadosTitulos) -> np.ndarray:
+    """Loja de cada cliente dos agregados com o diretório de ``modificado_em``."""
+    return lojas_dos_clientes(pd.Series(_agregados_titulos.clientes, dtype=object)).to_numpy()
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _permutacao(chave: str, chaves: Tuple[Chave, ...], _df: pd.DataFrame) -> np.ndarray:
+    """Ordem do dataset ``chave`` pelas chaves de ordenação."""
+    permutacao = OrdenacaoService.permutacao(_df, chaves)
+    permutacao.setflags(write=False)
+    return permutacao
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _resumo_clientes(versao: str) -> pd.DataFrame:
+    """Resumo por cliente da versão; mapeado em memória, sem cópia."""
+    if versao == "vazio":
+        return ResumoClientesService.calcular(pd.DataFrame())
+    return DatasetStore.carregar_resumo_clientes(versao)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _lojas_resumo(chave: str, modificado_em: int, _resumo: pd.DataFrame) -> np.ndarray:
+    """Loja de cada cliente do resumo com o diretório de ``modificado_em``."""
+    return lojas_dos_clientes(_resumo["Cliente"].astype(object)).to_numpy()
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _rejeicoes(versao: str) -> pd.DataFrame:
+    """Relatório de rejeições da versão, lido uma vez por processo."""
+    return DatasetStore.carregar_rejeicoes(versao)
+
+
+@st.cache_resource(show_spinner=False)
+def _registro_jobs() -> Dict[str, IngestJob]:
+    """Registro de jobs de upload compartilhado entre as sessões."""
+    return {}
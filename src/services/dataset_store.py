@@ -0,0 +1,411 @@
+"""
+Publicação versionada dos datasets.
+
+Cada ingestão grava uma nova versão imutável em ``versoes/<versao>.csv``
+(arquivo temporário + ``os.replace``), sob uma trava de arquivo, e um pequeno
+arquivo ``ATUAL`` aponta a versão vigente. Leitores nunca veem arquivos pela
+metade e dois uploads simultâneos não se sobrescrevem.
+
+Ao lado do CSV, cada versão tem uma cópia colunar já preparada em
+``versoes/<versao>.arrow`` (Arrow IPC sem compressão). Ela é aberta com
+``mmap``: as colunas do DataFrame apontam direto para o arquivo, sem cópia, e
+as páginas ficam no cache do sistema, compartilhadas entre todas as sessões e
+processos que leem a mesma versão. Junto dela é gravado o resumo por cliente
+(``versoes/<versao>.clientes.arrow``, ver ``ResumoClientesService``).
+
+A cada publicação, ainda sob a trava, as versões mais antigas saem com todos
+os seus arquivos (``coletar_versoes``): ficam a vigente e as
+``VERSOES_MANTIDAS`` publicadas por último.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from ..config import config
+from .data_filter import DataFilterService
+from .resumo_clientes import ResumoClientesService
+
+
+# Diretório das versões publicadas
+DIRETORIO_VERSOES = config.CAMINHO_CSV.parent / "versoes"
+
+# Arquivo que aponta a versão vigente
+ARQUIVO_ATUAL = DIRETORIO_VERSOES / "ATUAL"
+
+# Retenção: versões mantidas além da vigente, das publicadas por último
+VERSOES_MANTIDAS = 10
+
+_ARQUIVO_TRAVA = DIRETORIO_VERSOES / ".trava"
+
+
+class DatasetStore:
+    """Serviço de publicação e leitura das versões de dataset."""
+
+    @staticmethod
+    def publicar(df: pd.DataFrame, rejeicoes: Optional[pd.DataFrame] = None) -> str:
+        """
+        Publica um DataFrame como nova versão vigente.
+
+        A versão é identificada pelo hash do conteúdo; publicar o mesmo
+        conteúdo de novo apenas reaponta ``ATUAL``. As versões antigas além
+        de ``VERSOES_MANTIDAS`` são removidas.
+
+        Args:
+            df: DataFrame extraído do relatório
+            rejeicoes: Relatório de linhas rejeitadas na validação (opcional),
+                gravado ao lado da versão
+
+        Returns:
+            Identificador da versão publicada
+        """
+        versao = DatasetStore.publicar_bytes(df.to_csv(index=False).encode("utf-8"))
+        if rejeicoes is not None:
+            DatasetStore.gravar_atomico(
+                DatasetStore.caminho_rejeicoes(versao),
+                rejeicoes.to_csv(index=False).encode("utf-8")
+            )
+        return versao
+
+    @staticmethod
+    def publicar_bytes(conteudo: bytes) -> str:
+        """
+        Publica o conteúdo de um CSV como nova versão vigente.
+
+        Args:
+            conteudo: Bytes do CSV
+
+        Returns:
+            Identificador da versão publicada
+        """
+        versao = "v-" + hashlib.sha256(conteudo).hexdigest()[:16]
+        with DatasetStore.trava():
+            destino = DatasetStore.caminho_versao(versao)
+            if not destino.exists():
+                DatasetStore.gravar_atomico(destino, conteudo)
+            else:
+                # Republicada: passa a contar como a mais recente na retenção
+                os.utime(destino)
+            if not DatasetStore.caminho_colunar(versao).exists():
+                DatasetStore._gravar_colunar(versao, conteudo)
+            DatasetStore.gravar_atomico(ARQUIVO_ATUAL, versao.encode("ascii"))
+
+            # Espelho no caminho antigo, para ferramentas que ainda leem o CSV
+            DatasetStore.gravar_atomico(config.CAMINHO_CSV, conteudo)
+
+            resultado = DatasetStore.coletar_versoes(preservar=versao)
+            if resultado["removidas"]:
+                print(
+                    f"🧹 {resultado['removidas']} versão(ões) antiga(s) removida(s) "
+                    f"({resultado['bytes_liberados'] / 1024 / 1024:.1f} MB)"
+                )
+        return versao
+
+    @staticmethod
+    def coletar_versoes(manter: int = VERSOES_MANTIDAS, preservar: Optional[str] = None) -> Dict[str, int]:
+        """
+        Aplica a política de retenção ao diretório de versões.
+
+        Mantém a versão vigente (ou ``preservar``) e as ``manter`` mais
+        recentes, pela data de modificação do CSV; das demais remove todos os
+        arquivos (``<versao>.*``: CSV, cópia colunar, resumo por cliente e
+        rejeições). Deve ser chamada sob ``trava``. Um arquivo que não pode
+        ser removido (ainda aberto, no Windows) fica para a próxima coleta.
+
+        Args:
+            manter: Quantidade de versões mantidas além da vigente
+            preservar: Versão que nunca é removida (padrão: a de ``ATUAL``)
+
+        Returns:
+            Dicionário com "removidas" e "bytes_liberados"
+        """
+        if preservar is None:
+            try:
+                preservar = ARQUIVO_ATUAL.read_text(encoding="ascii").strip()
+            except FileNotFoundError:
+                pass
+
+        versoes = []
+        for caminho in DIRETORIO_VERSOES.glob("v-*.csv"):
+            if caminho.stem == preservar or "." in caminho.stem:
+                continue
+            try:
+                versoes.append((caminho.stat().st_mtime, caminho.stem))
+            except FileNotFoundError:
+                continue
+        versoes.sort(reverse=True)
+
+        removidas = bytes_liberados = 0
+        for _, versao in versoes[manter:]:
+            # O CSV sai por último: enquanto ele existir, a versão volta à coleta
+            arquivos = sorted(DIRETORIO_VERSOES.glob(f"{versao}.*"), key=lambda a: a.suffix == ".csv" and a.stem == versao)
+            for arquivo in arquivos:
+                try:
+                    tamanho = arquivo.stat().st_size
+                    arquivo.unlink()
+                except OSError:
+                    break
+                bytes_liberados += tamanho
+            else:
+                removidas += 1
+
+        return {"removidas": removidas, "bytes_liberados": bytes_liberados}
+
+    @staticmethod
+    def versao_atual() -> Optional[str]:
+        """
+        Retorna a versão vigente.
+
+        Na primeira execução, sem ``ATUAL``, o CSV existente em
+        ``config.CAMINHO_CSV`` é publicado como versão inicial.
+
+        Returns:
+            Identificador da versão ou None se não houver dados
+        """
+        try:
+            return ARQUIVO_ATUAL.read_text(encoding="ascii").strip() or None
+        except FileNotFoundError:
+            pass
+
+        try:
+            conteudo = config.CAMINHO_CSV.read_bytes()
+        except FileNotFoundError:
+            return None
+        return DatasetStore.publicar_bytes(conteudo)
+
+    @staticmethod
+    def caminho_versao(versao: str) -> Path:
+        """
+        Caminho do arquivo de uma versão.
+
+        Args:
+            versao: Identificador da versão
+
+        Returns:
+            Path do CSV da versão
+        """
+        return DIRETORIO_VERSOES / f"{versao}.csv"
+
+    @staticmethod
+    def caminho_colunar(versao: str) -> Path:
+        """
+        Caminho da cópia colunar (Arrow IPC) de uma versão.
+
+        Args:
+            versao: Identificador da versão
+
+        Returns:
+            Path do arquivo ``.arrow`` da versão
+        """
+        return DIRETORIO_VERSOES / f"{versao}.arrow"
+
+    @staticmethod
+    def caminho_resumo_clientes(versao: str) -> Path:
+        """
+        Caminho do resumo por cliente (Arrow IPC) de uma versão.
+
+        Args:
+            versao: Identificador da versão
+
+        Returns:
+            Path do arquivo ``.clientes.arrow`` da versão
+        """
+        return DIRETORIO_VERSOES / f"{versao}.clientes.arrow"
+
+    @staticmethod
+    def caminho_rejeicoes(versao: str) -> Path:
+        """
+        Caminho do relatório de rejeições da ingestão de uma versão.
+
+        Args:
+            versao: Identificador da versão
+
+        Returns:
+            Path do CSV de rejeições
+        """
+        return DIRETORIO_VERSOES / f"{versao}.rejeicoes.csv"
+
+    @staticmethod
+    def carregar_rejeicoes(versao: str) -> pd.DataFrame:
+        """
+        Lê o relatório de rejeições de uma versão.
+
+        Args:
+            versao: Identificador da versão
+
+        Returns:
+            DataFrame com Página, Linha, Título, Fatura e Motivo (vazio se a
+            versão não tiver relatório)
+        """
+        try:
+            return pd.read_csv(
+                DatasetStore.caminho_rejeicoes(versao),
+                dtype={"Título": str, "Fatura": str}
+            )
+        except FileNotFoundError:
+            return pd.DataFrame()
+
+    @staticmethod
+    def carregar(versao: str) -> pd.DataFrame:
+        """
+        Lê uma versão publicada.
+
+        Args:
+            versao: Identificador da versão
+
+        Returns:
+            DataFrame da versão, com Título e Fatura como texto
+        """
+        return pd.read_csv(
+            DatasetStore.caminho_versao(versao),
+            dtype={"Título": str, "Fatura": str}
+        )
+
+    @staticmethod
+    def carregar_mapeado(versao: str) -> pd.DataFrame:
+        """
+        Abre uma versão já preparada para os filtros, mapeada em memória.
+
+        As colunas numéricas e de data são views somente leitura sobre o
+        arquivo e as de texto usam ``string[pyarrow]`` sobre os mesmos
+        buffers; nada é copiado na abertura. Versões publicadas antes da cópia
+        colunar existir ganham o arquivo ``.arrow`` na primeira leitura.
+
+        Args:
+            versao: Identificador da versão
+
+        Returns:
+            DataFrame preparado (Vencimento em datetime), somente leitura
+        """
+        caminho = DatasetStore.caminho_colunar(versao)
+        if not caminho.exists():
+            with DatasetStore.trava():
+                if not caminho.exists():
+                    DatasetStore._gravar_colunar(
+                        versao, DatasetStore.caminho_versao(versao).read_bytes()
+                    )
+        return _abrir_arrow(caminho)
+
+    @staticmethod
+    def carregar_resumo_clientes(versao: str) -> pd.DataFrame:
+        """
+        Abre o resumo por cliente de uma versão, mapeado em memória.
+
+        Versões publicadas antes do resumo existir o ganham na primeira
+        leitura, a partir da cópia colunar.
+
+        Args:
+            versao: Identificador da versão
+
+        Returns:
+            Resumo por cliente, do maior para o menor devedor, somente leitura
+        """
+        caminho = DatasetStore.caminho_resumo_clientes(versao)
+        if not caminho.exists():
+            df = DatasetStore.carregar_mapeado(versao)
+            with DatasetStore.trava():
+                if not caminho.exists():
+                    _gravar_arrow(caminho, ResumoClientesService.calcular(df))
+        return _abrir_arrow(caminho)
+
+    @staticmethod
+    def _gravar_colunar(versao: str, conteudo: bytes) -> None:
+        """Grava a cópia colunar preparada e o resumo por cliente da versão."""
+        df = DataFilterService.preparar_dados_para_filtros(
+            pd.read_csv(io.BytesIO(conteudo), dtype={"Título": str, "Fatura": str})
+        )
+        _gravar_arrow(DatasetStore.caminho_resumo_clientes(versao), ResumoClientesService.calcular(df))
+        _gravar_arrow(DatasetStore.caminho_colunar(versao), df)
+
+    @staticmethod
+    @contextmanager
+    def trava() -> Iterator[None]:
+        """Trava exclusiva entre processos para as escritas no diretório de versões."""
+        DIRETORIO_VERSOES.mkdir(parents=True, exist_ok=True)
+        with open(_ARQUIVO_TRAVA, "a+b") as arquivo:
+            _travar(arquivo)
+            try:
+                yield
+            finally:
+                _destravar(arquivo)
+
+    @staticmethod
+    def gravar_atomico(destino: Path, conteudo: bytes) -> None:
+        """
+        Grava um arquivo por inteiro ou não grava: temporário + ``os.replace``.
+
+        Args:
+            destino: Caminho final
+            conteudo: Bytes a gravar
+        """
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(dir=destino.parent, prefix=f".{destino.name}.")
+        try:
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(conteudo)
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+            os.replace(temporario, destino)
+        except BaseException:
+            Path(temporario).unlink(missing_ok=True)
+            raise
+
+
+def _gravar_arrow(caminho: Path, df: pd.DataFrame) -> None:
+    """Grava um DataFrame em Arrow IPC, em formato que abre sem cópia."""
+    colunas = {}
+    for nome, serie in df.items():
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            # NaT gravado como o próprio sentinela do numpy (sem bitmap de
+            # nulos), para que a leitura continue sem cópia
+            valores = serie.to_numpy(dtype="datetime64[ns]").view(np.int64)
+            colunas[nome] = pa.array(valores).cast(pa.timestamp("ns"))
+        elif pd.api.types.is_numeric_dtype(serie):
+            colunas[nome] = pa.array(serie.to_numpy())
+        else:
+            texto = serie.astype(object).where(serie.notna(), None)
+            colunas[nome] = pa.array(texto, type=pa.large_string(), from_pandas=True)
+
+    tabela = pa.table(colunas)
+    buffer = io.BytesIO()
+    with ipc.new_file(buffer, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    DatasetStore.gravar_atomico(caminho, buffer.getvalue())
+
+
+def _abrir_arrow(caminho: Path) -> pd.DataFrame:
+    """Abre um arquivo Arrow IPC com mmap; as colunas apontam para o arquivo."""
+    tabela = ipc.open_file(pa.memory_map(str(caminho), "r")).read_all()
+    return tabela.to_pandas(
+        split_blocks=True,
+        types_mapper={pa.large_string(): pd.StringDtype("pyarrow")}.get
+    )
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _travar(arquivo) -> None:
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _destravar(arquivo) -> None:
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _travar(arquivo) -> None:
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)
+
+    def _destravar(arquivo) -> None:
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,184 @@
+"""
+Despachante assíncrono das mensagens de cobrança.
+
+Envia cada resumo como JSON via HTTP POST para um endpoint configurável, com
+concorrência limitada, limite de envios por segundo, novas tentativas com
+espera exponencial e o cabeçalho ``Idempotency-Key`` por (cliente, período).
+Usa apenas ``asyncio`` da biblioteca padrão.
+"""
+
+import asyncio
+import json
+import ssl
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+
+# Status HTTP que justificam nova tentativa
+STATUS_TEMPORARIOS = {408, 425, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class ConfigDespacho:
+    """Configuração do envio das cobranças."""
+
+    url: str
+    concorrencia: int = 4
+    por_segundo: float = 10.0
+    tentativas: int = 3
+    espera_inicial: float = 0.5
+    timeout: float = 10.0
+    cabecalhos: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class RelatorioDespacho:
+    """Resultado de um lote de envios."""
+
+    enviados: int = 0
+    falhas: List[Tuple[str, str]] = field(default_factory=list)
+    tentativas_extras: int = 0
+    duracao: float = 0.0
+
+    @property
+    def mensagens_por_segundo(self) -> float:
+        """Vazão de mensagens enviadas com sucesso."""
+        return self.enviados / self.duracao if self.duracao else 0.0
+
+
+class _LimitadorTaxa:
+    """Espaça as requisições para no máximo ``por_segundo`` envios por segundo."""
+
+    def __init__(self, por_segundo: float):
+        self._intervalo = 1.0 / por_segundo if por_segundo > 0 else 0.0
+        self._proximo = 0.0
+        self._lock = asyncio.Lock()
+
+    async def aguardar(self) -> None:
+        async with self._lock:
+            agora = time.monotonic()
+            espera = self._proximo - agora
+            self._proximo = max(agora, self._proximo) + self._intervalo
+        if espera > 0:
+            await asyncio.sleep(espera)
+
+
+class _ErroTemporario(Exception):
+    """Falha que pode ser resolvida com nova tentativa."""
+
+
+class DespachanteCobranca:
+    """Envia os resumos de cobrança para o endpoint configurado."""
+
+    def __init__(self, config: ConfigDespacho):
+        self.config = config
+        partes = urlsplit(config.url)
+        if partes.scheme not in ("http", "https"):
+            raise ValueError(f"URL não suportada: {config.url}")
+        self._https = partes.scheme == "https"
+        self._host = partes.hostname
+        porta_padrao = 443 if self._https else 80
+        self._porta = partes.port or porta_padrao
+        # Cabeçalho Host: com a porta quando ela não é a padrão do esquema
+        host = f"[{self._host}]" if ":" in self._host else self._host
+        self._cabecalho_host = host if self._porta == porta_padrao else f"{host}:{self._porta}"
+        self._caminho = (partes.path or "/") + (f"?{partes.query}" if partes.query else "")
+
+    def despachar(self, mensagens: List[Dict[str, Any]]) -> RelatorioDespacho:
+        """
+        Envia as mensagens e bloqueia até o fim do lote.
+
+        Args:
+            mensagens: Payloads gerados por ``CobrancaService.para_mensagens``
+
+        Returns:
+            Relatório com enviados, falhas e vazão
+        """
+        return asyncio.run(self.despachar_async(mensagens))
+
+    async def despachar_async(self, mensagens: List[Dict[str, Any]]) -> RelatorioDespacho:
+        """Versão assíncrona de ``despachar``."""
+        relatorio = RelatorioDespacho()
+        limitador = _LimitadorTaxa(self.config.por_segundo)
+        semaforo = asyncio.Semaphore(self.config.concorrencia)
+
+        async def enviar(mensagem: Dict[str, Any]) -> None:
+            async with semaforo:
+                try:
+                    extras = await self._enviar_com_tentativas(mensagem, limitador)
+                    relatorio.enviados += 1
+                    relatorio.tentativas_extras += extras
+                except Exception as e:
+                    relatorio.falhas.append((mensagem["chave"], str(e)))
+
+        inicio = time.monotonic()
+        await asyncio.gather(*(enviar(m) for m in mensagens))
+        relatorio.duracao = time.monotonic() - inicio
+        return relatorio
+
+    async def _enviar_com_tentativas(self, mensagem: Dict[str, Any], limitador: _LimitadorTaxa) -> int:
+        corpo = json.dumps(mensagem, ensure_ascii=False).encode("utf-8")
+        for tentativa in range(self.config.tentativas):
+            await limitador.aguardar()
+            try:
+                await asyncio.wait_for(
+                    self._post(corpo, mensagem["chave"]), timeout=self.config.timeout
+                )
+                return tentativa
+            except (_ErroTemporario, OSError, asyncio.TimeoutError):
+                if tentativa == self.config.tentativas - 1:
+                    raise
+                await asyncio.sleep(self.config.espera_inicial * 2 ** tentativa)
+        return self.config.tentativas
+
+    async def _post(self, corpo: bytes, chave: str) -> None:
+        contexto = ssl.create_default_context() if self._https else None
+        leitor, escritor = await asyncio.open_connection(self._host, self._porta, ssl=contexto)
+        try:
+            cabecalhos = {
+                "Host": self._cabecalho_host,
+                "Content-Type": "application/json; charset=utf-8",
+                "Content-Length": str(len(corpo)),
+                "Idempotency-Key": chave,
+                "Connection": "close",
+                **self.config.cabecalhos,
+            }
+            requisicao = f"POST {self._caminho} HTTP/1.1\r\n" + "".join(
+                f"{nome}: {valor}\r\n" for nome, valor in cabecalhos.items()
+            ) + "\r\n"
+            escritor.write(requisicao.encode("latin-1") + corpo)
+            await escritor.drain()
+
+            linha_status = await leitor.readline()
+            partes = linha_status.decode("latin-1").split(" ", 2)
+            if len(partes) < 2 or not partes[1].isdigit():
+                raise _ErroTemporario(f"Resposta inválida: {linha_status!r}")
+            status = int(partes[1])
+            await leitor.read()
+
+            if status in STATUS_TEMPORARIOS:
+                raise _ErroTemporario(f"HTTP {status}")
+            if status >= 400:
+                raise RuntimeError(f"HTTP {status}")
+        finally:
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except OSError:
+                pass
+
+
+def despachar_cobrancas(mensagens: List[Dict[str, Any]], config: ConfigDespacho) -> RelatorioDespacho:
+    """
+    Atalho para enviar um lote de mensagens.
+
+    Args:
+        mensagens: Payloads de cobrança
+        config: Configuração do envio
+
+    Returns:
+        Relatório do lote
+    """
+    return DespachanteCobranca(config).despachar(mensagens)
@@ -0,0 +1,142 @@
+"""
+Processamento de PDFs em segundo plano.
+
+Cada upload (um ou mais PDFs) é processado por uma thread própria; o
+``IngestJob`` expõe o progresso (páginas, títulos encontrados e tempo
+estimado) para a interface acompanhar sem bloquear o script do Streamlit.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .pdf_processor import PDFProcessorService
+
+
+class IngestJob:
+    """Handle de um processamento de PDF em andamento ou concluído."""
+
+    EXECUTANDO = "executando"
+    CONCLUIDO = "concluido"
+    ERRO = "erro"
+
+    def __init__(self, chave: str, nome_arquivo: str, envio: Tuple = ()):
+        self.chave = chave
+        self.nome_arquivo = nome_arquivo
+        self.envio = envio
+        self.status = IngestJob.EXECUTANDO
+        self.paginas_processadas = 0
+        self.total_paginas = 0
+        self.titulos_encontrados = 0
+        self.inicio = time.monotonic()
+        self.fim: Optional[float] = None
+        self.versao: Optional[str] = None
+        self.erro: Optional[str] = None
+
+    @property
+    def em_andamento(self) -> bool:
+        """Indica se o processamento ainda não terminou."""
+        return self.status == IngestJob.EXECUTANDO
+
+    @property
+    def fracao(self) -> float:
+        """Fração das páginas já processadas (0 a 1)."""
+        if not self.total_paginas:
+            return 0.0
+        return min(self.paginas_processadas / self.total_paginas, 1.0)
+
+    def segundos_restantes(self) -> Optional[float]:
+        """
+        Estima o tempo restante pela média de tempo por página.
+
+        Returns:
+            Segundos restantes ou None enquanto nenhuma página foi concluída
+        """
+        if not self.paginas_processadas or not self.total_paginas:
+            return None
+        decorrido = time.monotonic() - self.inicio
+        por_pagina = decorrido / self.paginas_processadas
+        return por_pagina * (self.total_paginas - self.paginas_processadas)
+
+    def _registrar_progresso(self, paginas: int, total: int, titulos: int) -> None:
+        self.paginas_processadas = paginas
+        self.total_paginas = total
+        self.titulos_encontrados = titulos
+
+    def _executar(self, arquivos_upload: List) -> None:
+        try:
+            versao = PDFProcessorService.processar_arquivos_upload(
+                arquivos_upload, progresso=self._registrar_progresso
+            )
+            if versao is None:
+                self.erro = "Nenhum título foi extraído do PDF."
+                self.status = IngestJob.ERRO
+            else:
+                # Publica o resultado antes do status para a troca ser atômica
+                self.versao = versao
+                self.status = IngestJob.CONCLUIDO
+        except Exception as e:
+            self.erro = str(e)
+            self.status = IngestJob.ERRO
+        finally:
+            self.fim = time.monotonic()
+
+
+class IngestJobService:
+    """Registro dos processamentos em segundo plano, indexado pelo hash do upload."""
+
+    # Quantidade de jobs finalizados mantidos em memória
+    MAX_JOBS_FINALIZADOS = 8
+
+    @staticmethod
+    def obter_ou_iniciar(registro: Dict[str, IngestJob], chave: str, arquivos_upload: List) -> IngestJob:
+        """
+        Retorna o job do upload ou inicia um novo processamento.
+
+        Um job com erro é devolvido enquanto o mesmo upload continua na
+        sidebar (os reruns não reprocessam o arquivo); enviar o mesmo
+        conteúdo de novo inicia uma nova tentativa.
+
+        Args:
+            registro: Dicionário compartilhado de jobs (hash → job)
+            chave: Hash do conteúdo dos PDFs do upload
+            arquivos_upload: Arquivos enviados via Streamlit file_uploader
+
+        Returns:
+            Job correspondente ao upload
+        """
+        envio = _identificar_envio(arquivos_upload)
+        with _lock:
+            job = registro.get(chave)
+            if job is not None and not (job.status == IngestJob.ERRO and job.envio != envio):
+                return job
+
+            registro.pop(chave, None)
+            IngestJobService._descartar_antigos(registro)
+            job = IngestJob(chave, ", ".join(arquivo.name for arquivo in arquivos_upload), envio)
+            registro[chave] = job
+
+        thread = threading.Thread(
+            target=job._executar,
+            args=(arquivos_upload,),
+            name=f"ingest-{chave[:8]}",
+            daemon=True,
+        )
+        thread.start()
+        return job
+
+    @staticmethod
+    def _descartar_antigos(registro: Dict[str, IngestJob]) -> None:
+        finalizados = [j for j in registro.values() if not j.em_andamento]
+        finalizados.sort(key=lambda j: j.fim or 0)
+        excedentes = len(finalizados) - IngestJobService.MAX_JOBS_FINALIZADOS + 1
+        for job in finalizados[:max(excedentes, 0)]:
+            registro.pop(job.chave, None)
+
+
+def _identificar_envio(arquivos_upload: List) -> Tuple:
+    """Identificador de cada envio (``file_id`` do Streamlit, novo a cada upload)."""
+    return tuple(getattr(arquivo, "file_id", None) for arquivo in arquivos_upload)
+
+
+_lock = threading.Lock()
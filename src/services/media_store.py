@@ -0,0 +1,143 @@
+"""
+Armazenamento dos PDFs enviados, endereçado pelo conteúdo.
+
+Cada upload é gravado em blocos de tamanho fixo, com o hash SHA-256 calculado
+na mesma passada, e fica em ``media/<hash>.pdf``: o mesmo PDF enviado com
+nomes diferentes é guardado uma única vez e nomes iguais não se sobrescrevem.
+Uma política de retenção (idade máxima e total de bytes) remove os PDFs
+mais antigos, junto com os arquivos derivados de cada um (``<hash>.*``, como
+o cache de parsing).
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from ..config import config
+
+
+# Tamanho de cada bloco lido do upload e gravado em disco
+TAMANHO_BLOCO = 1024 * 1024
+
+# Retenção: PDFs mais antigos que isso são removidos
+RETENCAO_DIAS = 90
+
+# Retenção: total máximo ocupado pelos PDFs em media/
+RETENCAO_BYTES = 512 * 1024 * 1024
+
+
+class MediaStore:
+    """Serviço de gravação e retenção dos PDFs enviados."""
+
+    @staticmethod
+    def salvar(arquivo_upload) -> Tuple[Path, str]:
+        """
+        Grava o upload em blocos, calculando o hash na mesma passada.
+
+        O arquivo é escrito em um temporário e renomeado para
+        ``<hash>.pdf``; se esse conteúdo já existir, o temporário é descartado
+        e o arquivo existente só tem a data de modificação renovada.
+
+        Args:
+            arquivo_upload: Arquivo do Streamlit (ou qualquer objeto com read)
+
+        Returns:
+            Tupla (caminho do PDF, hash SHA-256 em hexadecimal)
+        """
+        diretorio = config.CAMINHO_MEDIA
+        diretorio.mkdir(parents=True, exist_ok=True)
+
+        if hasattr(arquivo_upload, "seek"):
+            arquivo_upload.seek(0)
+
+        resumo = hashlib.sha256()
+        descritor, temporario = tempfile.mkstemp(dir=diretorio, prefix=".upload.")
+        try:
+            with os.fdopen(descritor, "wb") as destino:
+                while bloco := arquivo_upload.read(TAMANHO_BLOCO):
+                    resumo.update(bloco)
+                    destino.write(bloco)
+                destino.flush()
+                os.fsync(destino.fileno())
+
+            hash_conteudo = resumo.hexdigest()
+            caminho = MediaStore.caminho(hash_conteudo)
+            if caminho.exists():
+                Path(temporario).unlink()
+                os.utime(caminho)
+            else:
+                os.replace(temporario, caminho)
+        except BaseException:
+            Path(temporario).unlink(missing_ok=True)
+            raise
+
+        return caminho, hash_conteudo
+
+    @staticmethod
+    def caminho(hash_conteudo: str) -> Path:
+        """
+        Caminho do PDF com um dado conteúdo.
+
+        Args:
+            hash_conteudo: Hash SHA-256 do PDF
+
+        Returns:
+            Path do PDF em media/
+        """
+        return config.CAMINHO_MEDIA / f"{hash_conteudo}.pdf"
+
+    @staticmethod
+    def coletar_lixo(
+        max_idade_dias: float = RETENCAO_DIAS,
+        max_bytes: int = RETENCAO_BYTES,
+        preservar: Iterable[Path] = (),
+        agora: Optional[float] = None
+    ) -> Dict[str, int]:
+        """
+        Aplica a política de retenção aos PDFs de media/.
+
+        Remove primeiro os PDFs mais antigos que ``max_idade_dias``; se o
+        total ainda passar de ``max_bytes``, remove os menos recentes até
+        caber. Arquivos em ``preservar`` nunca são removidos. Os derivados
+        de um PDF removido (``<hash>.*``) saem junto.
+
+        Args:
+            max_idade_dias: Idade máxima, pela data de modificação
+            max_bytes: Total máximo de bytes
+            preservar: Caminhos que não podem ser removidos
+            agora: Instante de referência (padrão: agora)
+
+        Returns:
+            Dicionário com "removidos" e "bytes_liberados"
+        """
+        agora = agora or time.time()
+        limite_idade = agora - max_idade_dias * 86400
+        preservados = {Path(p).resolve() for p in preservar}
+
+        arquivos = []
+        for caminho in config.CAMINHO_MEDIA.glob("*.pdf"):
+            try:
+                info = caminho.stat()
+            except FileNotFoundError:
+                continue
+            arquivos.append((info.st_mtime, info.st_size, caminho))
+        arquivos.sort()
+
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        removidos = bytes_liberados = 0
+        for modificado, tamanho, caminho in arquivos:
+            if modificado >= limite_idade and total <= max_bytes:
+                break
+            if caminho.resolve() in preservados:
+                continue
+            caminho.unlink(missing_ok=True)
+            for derivado in config.CAMINHO_MEDIA.glob(f"{caminho.stem}.*"):
+                derivado.unlink(missing_ok=True)
+            total -= tamanho
+            removidos += 1
+            bytes_liberados += tamanho
+
+        return {"removidos": removidos, "bytes_liberados": bytes_liberados}
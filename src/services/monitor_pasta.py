@@ -0,0 +1,248 @@
+"""
+Ingestão automática dos PDFs deixados em uma pasta.
+
+O ERP grava o relatório (CREDIARIO) toda noite em uma pasta compartilhada; o
+monitor substitui o upload manual pela sidebar. A cada varredura:
+    - PDFs com tamanho e data de modificação iguais aos da última leitura são
+      ignorados sem abrir o arquivo;
+    - os demais, parados há pelo menos ESPERA_ESTAVEL segundos (o ERP pode
+      ainda estar gravando), são copiados para media/ pelo ``MediaStore``, que
+      calcula o hash do conteúdo na mesma passada;
+    - conteúdo já conhecido (o mesmo PDF tocado, renomeado ou copiado) não é
+      processado de novo; o novo vem do cache de parsing ou é lido em um pool
+      de processos, sem travar as varreduras seguintes;
+    - cada resultado é publicado como nova versão (``DatasetStore``). Os
+      dashboards abertos passam a usá-la no rerun seguinte, a partir da cópia
+      já preparada, sem processar o PDF.
+
+Os PDFs que o próprio app guarda em media/ (``<hash>.pdf``) são ignorados,
+então a pasta monitorada pode ser a própria media/. O que já foi lido fica em
+ARQUIVO_ESTADO, para que reiniciar o monitor não reprocesse a pasta inteira;
+um PDF só entra nele depois de publicado, então uma falha no parsing (ou um
+PDF ainda na fila quando o monitor para) é tentada de novo na varredura
+seguinte.
+"""
+
+import json
+import multiprocessing
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..config import config
+from .cache_parse import CacheParseService
+from .dataset_store import DatasetStore
+from .media_store import MediaStore
+from .pdf_processor import MAX_PROCESSOS_PARSE, PDFProcessorService, _extrair_e_validar
+from .validacao import RelatorioValidacao
+
+
+# Intervalo entre varreduras da pasta, em segundos
+INTERVALO_PADRAO = 30.0
+
+# Tempo sem modificação para considerar um PDF completo, em segundos
+ESPERA_ESTAVEL = 5.0
+
+# Arquivos já lidos por pasta monitorada (tamanho, modificação e hash)
+ARQUIVO_ESTADO = config.CAMINHO_CSV.parent / "ingestao_pasta.json"
+
+# Nome dos PDFs guardados pelo MediaStore (hash SHA-256 do conteúdo)
+_NOME_MEDIA = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass
+class ArquivoVisto:
+    """Última leitura de um PDF da pasta."""
+
+    tamanho: int
+    modificado_em: int
+    hash_conteudo: str
+
+
+class MonitorPasta:
+    """Varre uma pasta e publica uma versão do dataset para cada PDF novo."""
+
+    def __init__(
+        self,
+        pasta: Optional[Path] = None,
+        intervalo: float = INTERVALO_PADRAO,
+        processos: int = MAX_PROCESSOS_PARSE,
+        arquivo_estado: Path = ARQUIVO_ESTADO
+    ):
+        self.pasta = Path(pasta or config.CAMINHO_MEDIA).resolve()
+        self.intervalo = intervalo
+        self.processos = max(processos, 1)
+        self.arquivo_estado = arquivo_estado
+        self._vistos: Dict[str, ArquivoVisto] = self._carregar_estado()
+        self._em_andamento: Dict[str, ArquivoVisto] = {}
+        self._pendentes: Dict[Future, Tuple[str, Path, ArquivoVisto]] = {}
+        self._parar = threading.Event()
+
+    def parar(self) -> None:
+        """Pede o fim do monitor; a varredura em curso termina antes."""
+        self._parar.set()
+
+    def executar(self, uma_vez: bool = False) -> List[str]:
+        """
+        Monitora a pasta até ``parar`` (ou uma única varredura).
+
+        Args:
+            uma_vez: Faz uma varredura, espera os PDFs dela e termina
+
+        Returns:
+            Versões publicadas
+        """
+        publicadas: List[str] = []
+        print(f"👀 Monitorando {self.pasta} a cada {self.intervalo:.0f}s")
+        # spawn: o mesmo contexto usado no app (fork com threads não é seguro)
+        with ProcessPoolExecutor(
+            max_workers=self.processos,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            try:
+                while not self._parar.is_set():
+                    for nome, copia, hash_conteudo in self.varrer():
+                        lido = self._em_andamento[nome]
+                        em_cache = CacheParseService.obter(hash_conteudo)
+                        if em_cache is not None:
+                            print(f"✅ {nome}: resultado do parsing reaproveitado do cache")
+                            publicadas += self._publicar(nome, hash_conteudo, em_cache)
+                            self._registrar(nome, lido)
+                        else:
+                            print(f"⏳ {nome}: processando")
+                            futuro = pool.submit(_extrair_e_validar, copia)
+                            self._pendentes[futuro] = (nome, copia, lido)
+
+                    if uma_vez and not self._pendentes:
+                        break
+                    if self._pendentes:
+                        prontos, _ = wait(
+                            list(self._pendentes),
+                            timeout=None if uma_vez else self.intervalo,
+                            return_when=FIRST_COMPLETED
+                        )
+                        for futuro in prontos:
+                            publicadas += self._concluir(futuro)
+                    else:
+                        self._parar.wait(self.intervalo)
+            finally:
+                pool.shutdown(cancel_futures=True)
+        return publicadas
+
+    def varrer(self) -> List[Tuple[str, Path, str]]:
+        """
+        Procura PDFs novos ou alterados na pasta.
+
+        Os PDFs devolvidos ficam em andamento até ``_registrar`` (publicados)
+        ou ``_descartar`` (falha); só então entram no estado gravado.
+
+        Returns:
+            Trios (nome do arquivo, cópia em media/, hash do conteúdo) dos PDFs
+            com conteúdo ainda não visto
+        """
+        novos = []
+        agora = time.time()
+        conhecidos = {visto.hash_conteudo for visto in self._vistos.values()}
+        em_andamento = {lido.hash_conteudo for lido in self._em_andamento.values()}
+        for caminho in sorted(self.pasta.glob("*.pdf")):
+            if _NOME_MEDIA.match(caminho.stem):
+                continue
+            try:
+                info = caminho.stat()
+            except FileNotFoundError:
+                continue
+
+            assinatura = (info.st_size, info.st_mtime_ns)
+            visto = self._em_andamento.get(caminho.name) or self._vistos.get(caminho.name)
+            if visto is not None and (visto.tamanho, visto.modificado_em) == assinatura:
+                continue
+            if agora - info.st_mtime < ESPERA_ESTAVEL:
+                continue
+
+            try:
+                with open(caminho, "rb") as arquivo:
+                    copia, hash_conteudo = MediaStore.salvar(arquivo)
+            except OSError as e:
+                print(f"Erro ao ler {caminho.name}: {e}")
+                continue
+
+            lido = ArquivoVisto(info.st_size, info.st_mtime_ns, hash_conteudo)
+            if hash_conteudo in conhecidos:
+                self._vistos[caminho.name] = lido
+                continue
+            if hash_conteudo in em_andamento:
+                # O mesmo conteúdo já está sendo lido; decide na próxima varredura
+                continue
+            em_andamento.add(hash_conteudo)
+            self._em_andamento[caminho.name] = lido
+            novos.append((caminho.name, copia, hash_conteudo))
+
+        if novos:
+            # Preserva também as cópias ainda na fila do pool
+            PDFProcessorService._aplicar_retencao(
+                *(copia for _, copia, _ in novos),
+                *(copia for _, copia, _ in self._pendentes.values())
+            )
+        self._gravar_estado()
+        return novos
+
+    def _concluir(self, futuro: Future) -> List[str]:
+        """Publica o resultado de um PDF lido no pool."""
+        nome, _, lido = self._pendentes.pop(futuro)
+        try:
+            relatorio = futuro.result()
+        except Exception as e:
+            print(f"Erro ao processar {nome}: {e} (nova tentativa na próxima varredura)")
+            self._descartar(nome, lido)
+            return []
+        CacheParseService.gravar(lido.hash_conteudo, relatorio)
+        publicadas = self._publicar(nome, lido.hash_conteudo, relatorio)
+        self._registrar(nome, lido)
+        return publicadas
+
+    def _registrar(self, nome: str, lido: ArquivoVisto) -> None:
+        """Marca um PDF como lido, depois de publicado, e grava o estado."""
+        self._vistos[nome] = lido
+        if self._em_andamento.get(nome) is lido:
+            del self._em_andamento[nome]
+        self._gravar_estado()
+
+    def _descartar(self, nome: str, lido: ArquivoVisto) -> None:
+        """Tira um PDF do andamento sem marcá-lo como lido, para ser tentado de novo."""
+        if self._em_andamento.get(nome) is lido:
+            del self._em_andamento[nome]
+
+    def _publicar(self, nome: str, hash_conteudo: str, relatorio: RelatorioValidacao) -> List[str]:
+        """Publica o resultado de um PDF como nova versão vigente."""
+        versao = PDFProcessorService.publicar_arquivo(nome, relatorio)
+        return [versao] if versao else []
+
+    def _carregar_estado(self) -> Dict[str, ArquivoVisto]:
+        """Arquivos já lidos desta pasta em execuções anteriores."""
+        try:
+            estado = json.loads(self.arquivo_estado.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return {
+            nome: ArquivoVisto(**visto)
+            for nome, visto in estado.get(str(self.pasta), {}).items()
+        }
+
+    def _gravar_estado(self) -> None:
+        """Grava os arquivos lidos, preservando o estado das outras pastas."""
+        try:
+            estado = json.loads(self.arquivo_estado.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            estado = {}
+        atual = {nome: asdict(visto) for nome, visto in self._vistos.items()}
+        if estado.get(str(self.pasta)) == atual:
+            return
+        estado[str(self.pasta)] = atual
+        DatasetStore.gravar_atomico(
+            self.arquivo_estado,
+            json.dumps(estado, ensure_ascii=False, indent=2).encode("utf-8")
+        )
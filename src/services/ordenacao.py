@@ -0,0 +1,69 @@
+"""
+Ordenação da tabela no servidor.
+
+A ordem do dataset inteiro por uma combinação de colunas é calculada uma única
+vez por versão (``permutacao``, guardada em cache pela camada de sessão). Os
+filtros produzem uma máscara sobre as linhas do dataset; a tabela ordenada é
+só a permutação restrita às linhas da máscara (``selecionar``), em
+O(linhas do dataset), sem comparar valores de novo, e sai da mesma seleção
+que monta a tabela. O resultado ordenado é o mesmo exibido e exportado em CSV.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Colunas oferecidas para ordenação
+COLUNAS_ORDENACAO = ("Vencimento", "R$ Total", "Cliente")
+
+# Chave de ordenação: (coluna, crescente)
+Chave = Tuple[str, bool]
+
+
+class OrdenacaoService:
+    """Serviço de ordenação por permutações pré-calculadas."""
+
+    @staticmethod
+    def permutacao(df: pd.DataFrame, chaves: Tuple[Chave, ...]) -> np.ndarray:
+        """
+        Ordem estável das linhas do dataset pelas chaves, da primeira à última.
+
+        Cada coluna vira o código do valor na ordem dos valores distintos
+        (``pd.factorize(sort=True)``); valores ausentes ficam sempre por
+        último, em qualquer direção.
+
+        Args:
+            df: Dataset preparado
+            chaves: Pares (coluna, crescente), em ordem de prioridade
+
+        Returns:
+            Array de posições (int64) que ordena ``df``
+        """
+        codigos_por_chave = []
+        for coluna, crescente in chaves:
+            codigos, _ = pd.factorize(df[coluna], sort=True)
+            codigos = codigos.astype(np.int64)
+            ausentes = codigos < 0
+            if not crescente:
+                codigos = -codigos
+            codigos[ausentes] = np.iinfo(np.int64).max
+            codigos_por_chave.append(codigos)
+
+        # lexsort usa a última chave como primária
+        return np.lexsort(codigos_por_chave[::-1])
+
+    @staticmethod
+    def selecionar(mascara: np.ndarray, permutacao: np.ndarray) -> np.ndarray:
+        """
+        Posições das linhas selecionadas, na ordem da permutação.
+
+        Args:
+            mascara: Linhas do dataset selecionadas pelos filtros
+            permutacao: Resultado de ``permutacao`` para o mesmo dataset
+
+        Returns:
+            Posições (int64) das linhas com ``mascara`` verdadeira, ordenadas
+        """
+        return permutacao[mascara[permutacao]]
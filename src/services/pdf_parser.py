@@ -1,12 +1,135 @@
 """
 Serviço de parsing de arquivos PDF.
 Extrai dados de relatórios financeiros em formato PDF.
+
+O ``pdfplumber`` (e com ele o ``pdfminer``) é importado apenas quando um PDF
+é de fato processado, para não pesar na partida do app.
+
+Cada página é triada pelos caracteres que o pdfminer leu, antes de qualquer
+montagem de texto: páginas sem o marcador dos títulos (cabeçalhos, resumos)
+são puladas. Nas demais, o texto é montado só com os caracteres da faixa da
+tabela (``RegiaoTabela``), aprendida na primeira página com títulos.
+
+O parser só recorta os campos, com a página e a linha de origem, e os
+acumula por coluna (``ColunasTitulos``), sem um dicionário por título. Os
+valores monetários são convertidos em lote ao montar o DataFrame e as datas
+seguem em texto; a conferência fica com a validação (``ValidacaoService``).
 """
 
-import pdfplumber
+import statistics
+import sys
+from array import array
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .validacao import COLUNA_ILEGIVEL, COLUNAS_VALOR, ValidacaoService, converter_valores
+
+
+# Callback de progresso: (páginas processadas, total de páginas, títulos encontrados)
+CallbackProgresso = Callable[[int, int, int], None]
+
+# Texto presente em todo título (a segunda linha começa pelo status)
+MARCADOR_TITULO = "Aberto"
+
+# Folga, em pontos, em volta da faixa da tabela
+FOLGA_REGIAO = 2.0
+
+# Colunas de cada título, na ordem do DataFrame extraído
+COLUNAS_TITULO = [
+    "Cliente", "Status", "Título", "Fatura", "Local", "Espécie", "Vencimento",
+    "Conta Corrente", "Acres/Desc", "Juros/Multa", "R$ Original", "R$ Total",
+]
+
+
+class ColunasTitulos:
+    """
+    Títulos extraídos, acumulados coluna a coluna.
+
+    Os campos de texto ficam em listas (os repetitivos, como status, local e
+    vencimento, internados: valores iguais são um único objeto), a página e a
+    linha em arrays de inteiros e os valores monetários em texto até
+    ``para_dataframe``, que os converte para float em lote.
+    """
+
+    def __init__(self):
+        self._colunas: List[list] = [[] for _ in COLUNAS_TITULO]
+        self._paginas = array("i")
+        self._linhas = array("i")
+        self._ilegiveis = array("i")
+
+    def __len__(self) -> int:
+        return len(self._paginas)
+
+    def acrescentar(self, campos: Tuple[str, ...], pagina: int, linha: int) -> None:
+        """
+        Acrescenta um título.
+
+        Args:
+            campos: Campos na ordem de COLUNAS_TITULO
+            pagina: Página do PDF (a partir de 1)
+            linha: Linha na página (a partir de 1)
+        """
+        for coluna, valor in zip(self._colunas, campos):
+            coluna.append(valor)
+        self._paginas.append(pagina)
+        self._linhas.append(linha)
+
+    def acrescentar_ilegivel(self, pagina: int, linha: int) -> None:
+        """
+        Acrescenta uma linha de título que não pôde ser recortada.
+
+        Os campos ficam vazios e a linha é marcada em COLUNA_ILEGIVEL, para
+        ir às rejeições da validação com a página e a linha.
+
+        Args:
+            pagina: Página do PDF (a partir de 1)
+            linha: Linha na página (a partir de 1)
+        """
+        self._ilegiveis.append(len(self))
+        self.acrescentar((None,) * len(self._colunas), pagina, linha)
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Monta o DataFrame de uma só vez.
+
+        Returns:
+            DataFrame com COLUNAS_TITULO (valores em float, NaN quando
+            ilegíveis), Página e Linha; com COLUNA_ILEGIVEL quando alguma
+            linha não pôde ser recortada
+        """
+        dados = {
+            nome: PDFParserService.converter_valores(coluna) if nome in COLUNAS_VALOR else coluna
+            for nome, coluna in zip(COLUNAS_TITULO, self._colunas)
+        }
+        dados["Página"] = np.array(self._paginas, dtype=np.int32)
+        dados["Linha"] = np.array(self._linhas, dtype=np.int32)
+        if self._ilegiveis:
+            ilegivel = np.zeros(len(self), dtype=bool)
+            ilegivel[np.array(self._ilegiveis, dtype=np.int64)] = True
+            dados[COLUNA_ILEGIVEL] = ilegivel
+        return pd.DataFrame(dados)
+
+
+@dataclass
+class RegiaoTabela:
+    """
+    Faixa da página ocupada pela tabela de títulos, em pontos (topo = 0).
+
+    Aprendida na primeira página com títulos: das linhas de cliente e de
+    títulos, com uma folga. Uma página com títulos fora dela é lida inteira e
+    alarga a faixa para as páginas seguintes. O recorte é só vertical: na
+    horizontal, cortar poderia truncar nomes de cliente mais longos que os
+    da primeira página.
+    """
+    top: float
+    bottom: float
+    passo: float  # Distância entre as duas linhas de um título
 
 
 class PDFParserService:
@@ -26,27 +149,54 @@ class PDFParserService:
         return valor.replace('.', '').replace(',', '.')
     
     @staticmethod
-    def extrair_dados_pdf(caminho_pdf: Path) -> pd.DataFrame:
+    def converter_valores(textos: List[str]) -> np.ndarray:
+        """
+        Converte valores no formato brasileiro (1.234,56) para float, em lote.
+        
+        Equivale a ``limpar_valor`` seguido da conversão de cada valor;
+        textos fora do formato viram NaN e são rejeitados na validação.
+        
+        Args:
+            textos: Valores como aparecem no PDF
+            
+        Returns:
+            Array float64
+        """
+        texto = pa.array(textos, type=pa.string())
+        texto = pc.replace_substring(pc.replace_substring(texto, ".", ""), ",", ".")
+        return converter_valores(texto)
+    
+    @staticmethod
+    def extrair_dados_pdf(caminho_pdf: Path, progresso: Optional[CallbackProgresso] = None) -> pd.DataFrame:
         """
         Extrai dados estruturados de um arquivo PDF.
         
         Args:
             caminho_pdf: Caminho para o arquivo PDF
+            progresso: Callback chamado ao fim de cada página (opcional)
             
         Returns:
-            DataFrame com os dados extraídos
+            DataFrame bruto (com Página e Linha), a ser validado por
+            ``ValidacaoService.validar``
         """
-        dados = []
+        import pdfplumber
+
+        titulos = ColunasTitulos()
         cliente_atual = None
+        regiao = None
 
         try:
             with pdfplumber.open(caminho_pdf) as pdf:
+                total_paginas = len(pdf.pages)
                 for page_num, page in enumerate(pdf.pages):
-                    lines = page.extract_text().split('\n')
+                    lines, linhas_acima, regiao = PDFParserService._ler_pagina(page, regiao)
+                    page.close()
 
-                    for i in range(len(lines) - 1):
+                    # A última linha também é vista: sem o rodapé (fora da
+                    # faixa), pode ser o cliente dos títulos da página seguinte
+                    for i in range(len(lines)):
                         l1 = lines[i].strip()
-                        l2 = lines[i + 1].strip()
+                        l2 = lines[i + 1].strip() if i + 1 < len(lines) else ""
 
                         # Identificar cliente
                         if PDFParserService._e_linha_cliente(l1):
@@ -56,17 +206,179 @@ class PDFParserService:
                         # Processar linha de dados
                         if PDFParserService._e_linha_dados(l1, l2, cliente_atual):
                             try:
-                                dados_extraidos = PDFParserService._extrair_dados_linha(l1, l2, cliente_atual)
-                                if dados_extraidos:
-                                    dados.append(dados_extraidos)
-                            except Exception as e:
-                                print(f"[ERRO] Falha ao parsear linha {i} da página {page_num + 1}: {e}")
+                                titulos.acrescentar(
+                                    PDFParserService._recortar_linha(l1, l2, cliente_atual),
+                                    page_num + 1, linhas_acima + i + 1
+                                )
+                            except Exception:
+                                # Vai para as rejeições (MOTIVO_ILEGIVEL), com a página e a linha
+                                titulos.acrescentar_ilegivel(page_num + 1, linhas_acima + i + 1)
+
+                    if progresso is not None:
+                        progresso(page_num + 1, total_paginas, len(titulos))
 
         except Exception as e:
             print(f"[ERRO] Falha ao processar PDF {caminho_pdf}: {e}")
             
-        return pd.DataFrame(dados)
+        return titulos.para_dataframe()
     
+    @staticmethod
+    def _ler_pagina(page, regiao: Optional[RegiaoTabela]) -> Tuple[List[str], int, Optional[RegiaoTabela]]:
+        """
+        Lê as linhas de texto de uma página, triada e recortada.
+
+        A triagem usa o texto dos caracteres do pdfminer, sem montar linhas:
+        sem MARCADOR_TITULO, a página não tem títulos e não é lida. O texto é
+        montado pelo pdfplumber a partir de dicionários só com os campos que
+        ele usa para isso (``page.chars`` resolve cores e fontes de cada
+        caractere e custa mais que a própria leitura da página).
+
+        Fora da faixa da tabela, só as linhas acima dela são contadas, para que
+        a numeração das linhas seja a da página inteira. Títulos fora da faixa
+        ou uma linha de cliente abaixo dela fazem a página ser lida inteira.
+
+        Args:
+            page: Página do pdfplumber
+            regiao: Faixa da tabela aprendida até aqui (None antes da primeira
+                página com títulos)
+
+        Returns:
+            Tupla (linhas de texto, linhas acima das lidas, faixa da tabela)
+        """
+        caracteres = list(PDFParserService._caracteres(page.layout))
+        texto = "".join(caractere.get_text() for caractere in caracteres)
+        if MARCADOR_TITULO not in texto:
+            return [], 0, regiao
+
+        objetos = PDFParserService._objetos_texto(page, caracteres)
+        if regiao is None:
+            linhas = PDFParserService._montar_texto(objetos)
+            return linhas, 0, PDFParserService._aprender_regiao(objetos, linhas)
+
+        if len(texto) != len(objetos):  # Caracteres com mais de uma letra (ligaduras)
+            return PDFParserService._montar_texto(objetos), 0, regiao
+
+        # Títulos fora da faixa (com espaço para a linha de cima e a do
+        # cliente): lê a página inteira e alarga a faixa
+        marcadores = [objetos[inicio] for inicio in PDFParserService._ocorrencias(texto, MARCADOR_TITULO)]
+        topo = min(o["top"] for o in marcadores) - 2 * regiao.passo
+        base = max(o["bottom"] for o in marcadores)
+        if topo < regiao.top or base > regiao.bottom:
+            regiao.top = min(regiao.top, topo - FOLGA_REGIAO)
+            regiao.bottom = max(regiao.bottom, base + regiao.passo)
+            return PDFParserService._montar_texto(objetos), 0, regiao
+
+        acima, dentro, abaixo = [], [], []
+        for objeto in objetos:
+            meio = (objeto["top"] + objeto["bottom"]) / 2
+            if meio < regiao.top:
+                acima.append(objeto)
+            elif meio <= regiao.bottom:
+                dentro.append(objeto)
+            else:
+                abaixo.append(objeto)
+
+        # Cliente abaixo da faixa (títulos dele na página seguinte): lê a
+        # página inteira e alarga a faixa
+        if any(PDFParserService._e_linha_cliente(linha.strip()) for linha in PDFParserService._montar_texto(abaixo)):
+            regiao.bottom = max(o["bottom"] for o in abaixo) + FOLGA_REGIAO
+            return PDFParserService._montar_texto(objetos), 0, regiao
+
+        return PDFParserService._montar_texto(dentro), len(PDFParserService._montar_texto(acima)), regiao
+
+    @staticmethod
+    def _caracteres(objetos) -> Iterable:
+        """LTChar do pdfminer, na ordem em que aparecem no conteúdo da página."""
+        from pdfminer.layout import LTChar, LTContainer
+
+        for objeto in objetos:
+            if isinstance(objeto, LTChar):
+                yield objeto
+            elif isinstance(objeto, LTContainer):
+                yield from PDFParserService._caracteres(objeto)
+
+    @staticmethod
+    def _objetos_texto(page, caracteres: list) -> List[dict]:
+        """
+        Converte LTChar nos dicionários de caractere do pdfplumber.
+
+        Só com os campos usados na montagem do texto, nas coordenadas que o
+        pdfplumber usa (topo da página = 0, ajustadas à MediaBox).
+        """
+        mb_x0, mb_top = page.mediabox[:2]
+        altura, doctop = page.height, page.initial_doctop
+        objetos = []
+        for caractere in caracteres:
+            top = altura - caractere.y1 + mb_top
+            objetos.append({
+                "text": caractere.get_text(),
+                "x0": caractere.x0 + mb_x0,
+                "x1": caractere.x1 + mb_x0,
+                "top": top,
+                "bottom": altura - caractere.y0 + mb_top,
+                "doctop": doctop + top,
+                "upright": caractere.upright,
+            })
+        return objetos
+
+    @staticmethod
+    def _montar_texto(objetos: List[dict]) -> List[str]:
+        """Linhas de texto dos caracteres, como em ``page.extract_text()``."""
+        from pdfplumber.utils import chars_to_textmap
+
+        if not objetos:
+            return []
+        return chars_to_textmap(objetos).as_string.split('\n')
+
+    @staticmethod
+    def _ocorrencias(texto: str, trecho: str) -> List[int]:
+        """Posições de cada ocorrência do trecho no texto."""
+        posicoes = []
+        inicio = texto.find(trecho)
+        while inicio != -1:
+            posicoes.append(inicio)
+            inicio = texto.find(trecho, inicio + len(trecho))
+        return posicoes
+
+    @staticmethod
+    def _aprender_regiao(objetos: List[dict], linhas: List[str]) -> Optional[RegiaoTabela]:
+        """
+        Aprende a faixa da tabela na primeira página com títulos.
+
+        Args:
+            objetos: Caracteres da página (``_objetos_texto``)
+            linhas: Linhas de texto da página (``_montar_texto``)
+
+        Returns:
+            Faixa das linhas de cliente e de títulos com folga, ou None se a
+            página não tiver títulos reconhecíveis
+        """
+        from pdfplumber.utils import chars_to_textmap
+
+        # Posição de cada linha de texto (como em page.extract_text_lines)
+        posicoes = chars_to_textmap(objetos).search(
+            r" *([^\n]+?) *(\n|$)", main_group=1, return_chars=False, return_groups=False
+        )
+        if len(posicoes) != len(linhas):
+            return None
+
+        usadas, passos = set(), []
+        for i in range(len(linhas) - 1):
+            if PDFParserService._e_linha_dados(linhas[i].strip(), linhas[i + 1].strip(), ""):
+                usadas.update((i, i + 1))
+                passos.append(posicoes[i + 1]["top"] - posicoes[i]["top"])
+                if i > 0 and PDFParserService._e_linha_cliente(linhas[i - 1].strip()):
+                    usadas.add(i - 1)
+        if not usadas:
+            return None
+
+        passo = statistics.median(passos)
+        return RegiaoTabela(
+            top=min(posicoes[i]["top"] for i in usadas) - FOLGA_REGIAO,
+            bottom=max(posicoes[i]["bottom"] for i in usadas) + passo,
+            passo=passo,
+        )
+
     @staticmethod
     def _e_linha_cliente(linha: str) -> bool:
         """Verifica se a linha contém informações de cliente."""
@@ -81,15 +393,15 @@ class PDFParserService:
     def _e_linha_dados(l1: str, l2: str, cliente_atual: str) -> bool:
         """Verifica se as linhas contêm dados de títulos."""
         return (
-            any(palavra in l1 for palavra in ["Loja", "Crediario"]) and
-            l2.startswith("Aberto") and
-            cliente_atual is not None
+            l2.startswith(MARCADOR_TITULO) and
+            cliente_atual is not None and
+            any(palavra in l1 for palavra in ["Loja", "Crediario"])
         )
     
     @staticmethod
-    def _extrair_dados_linha(l1: str, l2: str, cliente_atual: str) -> Dict[str, Any]:
+    def _recortar_linha(l1: str, l2: str, cliente_atual: str) -> Tuple[str, ...]:
         """
-        Extrai dados estruturados de uma linha do PDF.
+        Recorta os campos de um título do PDF.
         
         Args:
             l1: Primeira linha com dados do título
@@ -97,21 +409,17 @@ class PDFParserService:
             cliente_atual: Nome do cliente atual
             
         Returns:
-            Dicionário com os dados extraídos
+            Campos na ordem de COLUNAS_TITULO, em texto (valores no formato
+            brasileiro, convertidos depois em lote)
         """
         partes1 = l1.split()
         partes2 = l2.split()
 
-        # Validar se os últimos 3 valores da segunda linha são numéricos
-        if not PDFParserService._validar_valores_numericos(partes2[-3:]):
-            print(f"[SKIP] Linha ignorada por dados inválidos: {l2}")
-            return None
-
         # Extrair dados da primeira linha
         titulo = partes1[0]
-        valor_original = PDFParserService.limpar_valor(partes1[-1])
-        especie = partes1[-2]
-        local = partes1[-3]
+        valor_original = partes1[-1]
+        especie = sys.intern(partes1[-2])
+        local = sys.intern(partes1[-3])
 
         # Encontrar a fatura (último número antes do nome)
         idx_fatura = -4
@@ -121,47 +429,16 @@ class PDFParserService:
             idx_fatura -= 1
         fatura = partes1[idx_fatura] if abs(idx_fatura) <= len(partes1) else ""
 
-        # Nome é tudo entre título e fatura
-        nome = " ".join(partes1[1:idx_fatura]) if abs(idx_fatura) <= len(partes1) else ""
-
         # Extrair dados da segunda linha
-        status = partes2[0]
-        vencimento = partes2[1]
-        conta_corrente = " ".join(partes2[2:-3])
-        acres = PDFParserService.limpar_valor(partes2[-3])
-        juros = PDFParserService.limpar_valor(partes2[-2])
-        valor_total = PDFParserService.limpar_valor(partes2[-1])
-
-        return {
-            "Cliente": cliente_atual,
-            "Status": status,
-            "Título": titulo,
-            "Fatura": fatura,
-            "Local": local,
-            "Espécie": especie,
-            "Vencimento": vencimento,
-            "Conta Corrente": conta_corrente,
-            "Acres/Desc": float(acres),
-            "Juros/Multa": float(juros),
-            "R$ Original": float(valor_original),
-            "R$ Total": float(valor_total),
-        }
-    
-    @staticmethod
-    def _validar_valores_numericos(valores: List[str]) -> bool:
-        """
-        Valida se os valores podem ser convertidos para numérico.
-        
-        Args:
-            valores: Lista de strings a serem validadas
-            
-        Returns:
-            True se todos os valores são válidos
-        """
-        for valor in valores:
-            if not valor.replace(',', '.').replace('.', '').isdigit():
-                return False
-        return True
+        status = sys.intern(partes2[0])
+        vencimento = sys.intern(partes2[1])
+        conta_corrente = sys.intern(" ".join(partes2[2:-3]))
+        acres, juros, valor_total = partes2[-3], partes2[-2], partes2[-1]
+
+        return (
+            cliente_atual, status, titulo, fatura, local, especie, vencimento,
+            conta_corrente, acres, juros, valor_original, valor_total,
+        )
     
     @staticmethod
     def salvar_csv(df: pd.DataFrame, destino: Path) -> None:
@@ -184,21 +461,29 @@ class PDFParserService:
             print(f"[ERRO] Falha ao salvar CSV {destino}: {e}")
     
     @staticmethod
-    def processar_pdf(caminho_pdf: Path, destino_csv: Path) -> pd.DataFrame:
+    def processar_pdf(
+        caminho_pdf: Path,
+        destino_csv: Path,
+        progresso: Optional[CallbackProgresso] = None
+    ) -> pd.DataFrame:
         """
         Processa um arquivo PDF completo e salva os dados em CSV.
         
         Args:
             caminho_pdf: Caminho do arquivo PDF a ser processado
             destino_csv: Caminho onde salvar o CSV resultante
+            progresso: Callback de progresso por página (opcional)
             
         Returns:
             DataFrame com os dados extraídos
         """
         print(f"Processando PDF: {caminho_pdf}")
         
-        # Extrair dados
-        df = PDFParserService.extrair_dados_pdf(caminho_pdf)
+        # Extrair e validar dados
+        validacao = ValidacaoService.validar(PDFParserService.extrair_dados_pdf(caminho_pdf, progresso))
+        if validacao.linhas_rejeitadas:
+            print(f"⚠️ {validacao.linhas_rejeitadas} linha(s) rejeitada(s): {validacao.resumo()}")
+        df = validacao.aceitos
         
         if df.empty:
             print("⚠️ Nenhum dado foi extraído do PDF")
@@ -212,15 +497,20 @@ class PDFParserService:
 
 
 # Função de compatibilidade com o código antigo
-def processar_pdf(caminho_pdf: Path, destino_csv: Path) -> pd.DataFrame:
+def processar_pdf(
+    caminho_pdf: Path,
+    destino_csv: Path,
+    progresso: Optional[CallbackProgresso] = None
+) -> pd.DataFrame:
     """
     Função de compatibilidade com a versão anterior.
     
     Args:
         caminho_pdf: Caminho do arquivo PDF
         destino_csv: Caminho do arquivo CSV de destino
+        progresso: Callback de progresso por página (opcional)
         
     Returns:
         DataFrame com os dados processados
     """
-    return PDFParserService.processar_pdf(caminho_pdf, destino_csv)
\ No newline at end of file
+    return PDFParserService.processar_pdf(caminho_pdf, destino_csv, progresso)
\ No newline at end of file
@@ -1,55 +1,290 @@
 """
 Serviço responsável pelo processamento de arquivos PDF.
+
+Um upload pode ter vários PDFs (um por loja). Cada PDF passa pelo cache de
+parsing (``CacheParseService``); os que ainda não foram processados são
+lidos em paralelo, em um pool de processos, e os resultados são mesclados em
+um único dataset, com a coluna ``Origem`` (arquivo de cada título) e sem
+repetir o par (Título, Fatura) entre arquivos (``POLITICA_DUPLICADOS``).
 """
 
+import multiprocessing
+import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from ..config import config
-from .pdf_parser import processar_pdf
+from .cache_parse import CacheParseService
+from .dataset_store import DatasetStore
+from .media_store import MediaStore
+from .pdf_parser import PDFParserService, CallbackProgresso
+from .validacao import (
+    COLUNA_CONFLITO, COLUNAS_RELATORIO, MOTIVO_ARQUIVO, MOTIVO_CONFLITO, MOTIVO_DUPLICADO,
+    POLITICA_DUPLICADOS, POLITICA_MARCAR, RelatorioValidacao, ValidacaoService, indexar_duplicados
+)
+
+
+# Processos usados para ler vários PDFs ao mesmo tempo
+MAX_PROCESSOS_PARSE = min(os.cpu_count() or 1, 4)
+
+# Coluna com o nome do arquivo de origem de cada título
+COLUNA_ORIGEM = "Origem"
 
 
 class PDFProcessorService:
     """Serviço para processamento de arquivos PDF."""
     
     @staticmethod
-    def processar_arquivo_upload(arquivo_upload) -> Optional[pd.DataFrame]:
+    def processar_arquivo_upload(
+        arquivo_upload,
+        progresso: Optional[CallbackProgresso] = None
+    ) -> Optional[str]:
         """
-        Processa um arquivo PDF enviado via upload.
+        Processa um arquivo PDF enviado via upload e publica o resultado.
         
         Args:
             arquivo_upload: Arquivo enviado via Streamlit file_uploader
+            progresso: Callback de progresso por página (opcional)
             
         Returns:
-            DataFrame com os dados extraídos ou None se houver erro
+            Versão publicada ou None se nenhum dado foi extraído
         """
         if arquivo_upload is None:
             return None
+        return PDFProcessorService.processar_arquivos_upload([arquivo_upload], progresso)
+    
+    @staticmethod
+    def processar_arquivos_upload(
+        arquivos_upload: List,
+        progresso: Optional[CallbackProgresso] = None
+    ) -> Optional[str]:
+        """
+        Processa os PDFs de um upload e publica o resultado mesclado.
+        
+        Os dados extraídos são validados e os aceitos viram uma nova versão
+        do dataset (DatasetStore), que passa a ser a vigente para todas as
+        sessões. PDFs já processados antes vêm do cache de parsing. Um PDF
+        ilegível vai para as rejeições e os demais são publicados.
+        
+        Args:
+            arquivos_upload: Arquivos enviados via Streamlit file_uploader
+            progresso: Callback de progresso por página (opcional)
+            
+        Returns:
+            Versão publicada ou None se nenhum dado foi extraído
+            
+        Raises:
+            Exception: Falha ao gravar ou publicar os PDFs, ou nenhum PDF
+                legível (a mensagem chega ao ``IngestJob``)
+        """
+        if not arquivos_upload:
+            return None
         
         try:
-            # Gerar caminho do arquivo
-            caminho_arquivo = PDFProcessorService._gerar_caminho_arquivo(arquivo_upload.name)
+            # Salvar arquivos (em blocos, endereçados pelo conteúdo)
+            salvos = [
+                (arquivo.name, *MediaStore.salvar(arquivo)) for arquivo in arquivos_upload
+            ]
+            
+            # Retenção dos PDFs antigos
+            PDFProcessorService._aplicar_retencao(*[caminho for _, caminho, _ in salvos])
             
-            # Salvar arquivo
-            PDFProcessorService._salvar_arquivo(arquivo_upload, caminho_arquivo)
+            # Extrair e validar dados (cache por PDF; os novos em paralelo)
+            resultados = PDFProcessorService._extrair_com_cache(salvos, progresso)
+            validacao = PDFProcessorService.mesclar_arquivos([
+                (nome, resultados[hash_conteudo]) for nome, _, hash_conteudo in salvos
+            ])
+            if validacao.linhas_rejeitadas:
+                print(f"⚠️ {validacao.linhas_rejeitadas} linha(s) rejeitada(s): {validacao.resumo()}")
+            if validacao.titulos_em_conflito:
+                print(f"⚠️ {validacao.titulos_em_conflito} título(s) com versões divergentes marcados em {COLUNA_CONFLITO}")
             
-            # Processar e retornar dados
-            return processar_pdf(caminho_arquivo, config.CAMINHO_CSV)
+            df = validacao.aceitos
+            if df.empty:
+                falhas = _falhas_de_arquivo(validacao.rejeicoes)
+                if falhas:
+                    # Nenhum PDF aproveitável: o erro de cada arquivo chega ao job
+                    raise ValueError("; ".join(falhas))
+                print("⚠️ Nenhum dado foi extraído do PDF")
+                return None
+            
+            # Publicar como nova versão, com o relatório de rejeições
+            versao = DatasetStore.publicar(df, rejeicoes=validacao.rejeicoes)
+            print(f"✅ {len(df)} registros publicados na versão {versao}")
+            return versao
             
         except Exception as e:
             print(f"Erro ao processar arquivo PDF: {e}")
+            raise
+    
+    @staticmethod
+    def mesclar_arquivos(
+        partes: List[Tuple[str, RelatorioValidacao]],
+        politica: str = POLITICA_DUPLICADOS
+    ) -> RelatorioValidacao:
+        """
+        Junta os resultados de vários PDFs em um único dataset.
+        
+        Cada título recebe a coluna ``Origem`` com o nome do arquivo. Um par
+        (Título, Fatura) presente em mais de um arquivo fica uma só vez,
+        conforme a política (na ordem do upload); as outras ocorrências vão
+        para as rejeições, como cópia idêntica ou como versão divergente.
+        
+        Args:
+            partes: Pares (nome do arquivo, resultado validado do arquivo)
+            politica: Política para o par repetido (ver ``indexar_duplicados``)
+            
+        Returns:
+            RelatorioValidacao com os títulos mesclados e todas as rejeições
+        """
+        rejeicoes = [relatorio.rejeicoes.assign(**{COLUNA_ORIGEM: nome}) for nome, relatorio in partes]
+        aceitos = [
+            relatorio.aceitos.assign(**{COLUNA_ORIGEM: nome})
+            for nome, relatorio in partes if not relatorio.aceitos.empty
+        ]
+        
+        # Cada arquivo já saiu da validação sem pares repetidos; entre
+        # arquivos, um único índice sobre todos os títulos
+        if len(aceitos) > 1:
+            df = pd.concat(aceitos, ignore_index=True)
+            comparadas = [c for c in df.columns if c not in ("Título", "Fatura", COLUNA_ORIGEM, COLUNA_CONFLITO)]
+            duplicado, conflito, marcado = indexar_duplicados(
+                df["Título"], df["Fatura"], [df[c].to_numpy() for c in comparadas],
+                np.ones(len(df), dtype=bool), politica
+            )
+            for mascara, motivo in ((duplicado, MOTIVO_DUPLICADO), (conflito, MOTIVO_CONFLITO)):
+                if mascara.any():
+                    rejeicoes.append(df.loc[mascara, ["Título", "Fatura", COLUNA_ORIGEM]].assign(Motivo=motivo))
+            if politica == POLITICA_MARCAR:
+                df[COLUNA_CONFLITO] = df.get(COLUNA_CONFLITO, False) | marcado
+            aceitos = [df[~(duplicado | conflito)].reset_index(drop=True)]
+        
+        return RelatorioValidacao(
+            aceitos=aceitos[0] if aceitos else pd.DataFrame(),
+            rejeicoes=pd.concat(
+                [r for r in rejeicoes if not r.empty], ignore_index=True
+            ) if any(not r.empty for r in rejeicoes) else pd.DataFrame()
+        )
+    
+    @staticmethod
+    def publicar_arquivo(nome: str, relatorio: RelatorioValidacao) -> Optional[str]:
+        """
+        Publica o resultado de um único PDF como nova versão vigente.
+        
+        Usado pelas ingestões fora do Streamlit (pasta monitorada e API),
+        que recebem um PDF por vez.
+        
+        Args:
+            nome: Nome do arquivo, gravado na coluna ``Origem``
+            relatorio: Resultado validado do PDF
+            
+        Returns:
+            Versão publicada ou None se nenhum dado foi extraído
+        """
+        validacao = PDFProcessorService.mesclar_arquivos([(nome, relatorio)])
+        if validacao.linhas_rejeitadas:
+            print(f"⚠️ {nome}: {validacao.linhas_rejeitadas} linha(s) rejeitada(s): {validacao.resumo()}")
+        if validacao.titulos_em_conflito:
+            print(f"⚠️ {nome}: {validacao.titulos_em_conflito} título(s) com versões divergentes marcados em {COLUNA_CONFLITO}")
+        if validacao.aceitos.empty:
+            print(f"⚠️ {nome}: nenhum dado foi extraído do PDF")
             return None
+        
+        versao = DatasetStore.publicar(validacao.aceitos, rejeicoes=validacao.rejeicoes)
+        print(f"✅ {nome}: {len(validacao.aceitos)} registros publicados na versão {versao}")
+        return versao
+    
+    @staticmethod
+    def _extrair_com_cache(
+        arquivos: List[Tuple[str, Path, str]],
+        progresso: Optional[CallbackProgresso] = None
+    ) -> Dict[str, RelatorioValidacao]:
+        """
+        Resultado validado de cada PDF, do cache ou do parser.
+        
+        Um único PDF novo é lido na própria thread, com progresso por
+        página; vários são lidos em paralelo, um por processo, e o progresso
+        avança com as páginas de cada arquivo concluído (o total é estimado
+        pela média de páginas dos já lidos). Um PDF que não pode ser lido não
+        interrompe os demais: vira uma rejeição ``MOTIVO_ARQUIVO`` com o erro,
+        sob o nome do arquivo, e não entra no cache.
+        
+        Args:
+            arquivos: Trios (nome do arquivo, caminho do PDF, hash do conteúdo)
+            progresso: Callback de progresso por página (opcional)
+            
+        Returns:
+            Dicionário hash → resultado validado
+        """
+        resultados: Dict[str, RelatorioValidacao] = {}
+        pendentes: Dict[str, Path] = {}
+        for nome, caminho, hash_conteudo in arquivos:
+            if hash_conteudo in resultados or hash_conteudo in pendentes:
+                continue
+            em_cache = CacheParseService.obter(hash_conteudo)
+            if em_cache is not None:
+                print(f"✅ {nome}: resultado do parsing reaproveitado do cache")
+                resultados[hash_conteudo] = em_cache
+            else:
+                pendentes[hash_conteudo] = caminho
+        
+        nomes = {hash_conteudo: nome for nome, _, hash_conteudo in reversed(arquivos)}
+        if len(pendentes) == 1:
+            hash_conteudo, caminho = next(iter(pendentes.items()))
+            try:
+                resultados[hash_conteudo] = _extrair_e_validar(caminho, progresso)
+            except Exception as e:
+                print(f"⚠️ {nomes[hash_conteudo]}: erro ao processar o PDF: {e}")
+                resultados[hash_conteudo] = _relatorio_de_falha(e)
+            else:
+                CacheParseService.gravar(hash_conteudo, resultados[hash_conteudo])
+        elif pendentes:
+            concluidos, lidos, paginas, titulos = 0, 0, 0, 0
+            # spawn: o processo do Streamlit tem threads, e fork com threads não é seguro
+            with ProcessPoolExecutor(
+                max_workers=min(len(pendentes), MAX_PROCESSOS_PARSE),
+                mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                futuros = {
+                    pool.submit(_extrair_e_contar_paginas, caminho): hash_conteudo
+                    for hash_conteudo, caminho in pendentes.items()
+                }
+                for futuro in as_completed(futuros):
+                    hash_conteudo = futuros[futuro]
+                    concluidos += 1
+                    try:
+                        resultados[hash_conteudo], paginas_arquivo = futuro.result()
+                    except Exception as e:
+                        print(f"⚠️ {nomes[hash_conteudo]}: erro ao processar o PDF: {e}")
+                        resultados[hash_conteudo] = _relatorio_de_falha(e)
+                        continue
+                    CacheParseService.gravar(hash_conteudo, resultados[hash_conteudo])
+                    lidos += 1
+                    paginas += paginas_arquivo
+                    titulos += len(resultados[hash_conteudo].aceitos)
+                    if progresso is not None:
+                        # Os que faltam contam com a média de páginas dos já lidos
+                        restantes = round(paginas / lidos * (len(pendentes) - concluidos))
+                        progresso(paginas, paginas + restantes, titulos)
+        
+        return resultados
     
     @staticmethod
     def carregar_dados_padrao() -> pd.DataFrame:
         """
-        Carrega os dados do CSV padrão quando nenhum arquivo é enviado.
+        Carrega a versão vigente do dataset quando nenhum arquivo é enviado.
         
         Returns:
             DataFrame com os dados padrão
         """
         try:
-            return pd.read_csv(config.CAMINHO_CSV)
+            versao = DatasetStore.versao_atual()
+            if versao is None:
+                print(f"Arquivo CSV não encontrado: {config.CAMINHO_CSV}")
+                return pd.DataFrame()
+            return DatasetStore.carregar(versao)
         except FileNotFoundError:
             print(f"Arquivo CSV não encontrado: {config.CAMINHO_CSV}")
             return pd.DataFrame()
@@ -58,30 +293,22 @@ class PDFProcessorService:
             return pd.DataFrame()
     
     @staticmethod
-    def _gerar_caminho_arquivo(nome_arquivo: str) -> Path:
-        """
-        Gera o caminho completo para salvar o arquivo PDF.
-        
-        Args:
-            nome_arquivo: Nome original do arquivo
-            
-        Returns:
-            Path completo para o arquivo
-        """
-        nome_limpo = Path(nome_arquivo).stem.replace(" ", "_")
-        return config.CAMINHO_MEDIA / f"{nome_limpo}.pdf"
-    
-    @staticmethod
-    def _salvar_arquivo(arquivo_upload, caminho_destino: Path) -> None:
+    def _aplicar_retencao(*caminhos_atuais: Path) -> None:
         """
-        Salva o arquivo enviado no caminho especificado.
+        Remove PDFs antigos de media/, preservando os que serão processados.
         
         Args:
-            arquivo_upload: Arquivo do Streamlit
-            caminho_destino: Caminho onde salvar o arquivo
+            caminhos_atuais: PDFs do upload em andamento
         """
-        with open(caminho_destino, "wb") as f:
-            f.write(arquivo_upload.read())
+        try:
+            resultado = MediaStore.coletar_lixo(preservar=caminhos_atuais)
+            if resultado["removidos"]:
+                print(
+                    f"🧹 {resultado['removidos']} PDF(s) antigos removidos "
+                    f"({resultado['bytes_liberados'] / 1024 / 1024:.1f} MB)"
+                )
+        except OSError as e:
+            print(f"Erro ao aplicar retenção de mídia: {e}")
     
     @staticmethod
     def obter_nome_arquivo_processado(arquivo_upload) -> str:
@@ -94,4 +321,37 @@ class PDFProcessorService:
         Returns:
             Nome do arquivo processado
         """
-        return arquivo_upload.name if arquivo_upload else "relatorio_padrao.csv"
\ No newline at end of file
+        return arquivo_upload.name if arquivo_upload else "relatorio_padrao.csv"
+
+
+def _extrair_e_validar(
+    caminho_pdf: Path,
+    progresso: Optional[CallbackProgresso] = None
+) -> RelatorioValidacao:
+    """Lê e valida um PDF; função de módulo para rodar no pool de processos."""
+    return ValidacaoService.validar(PDFParserService.extrair_dados_pdf(caminho_pdf, progresso))
+
+
+def _extrair_e_contar_paginas(caminho_pdf: Path) -> Tuple[RelatorioValidacao, int]:
+    """Lê e valida um PDF no pool; devolve também suas páginas, para o progresso."""
+    paginas = [0]
+
+    def progresso(processadas: int, total: int, titulos: int) -> None:
+        paginas[0] = total
+
+    return _extrair_e_validar(caminho_pdf, progresso), paginas[0]
+
+
+def _relatorio_de_falha(erro: Exception) -> RelatorioValidacao:
+    """Resultado de um PDF que não pôde ser lido: só a rejeição com o erro."""
+    rejeicao = dict.fromkeys(COLUNAS_RELATORIO, None)
+    rejeicao["Motivo"] = f"{MOTIVO_ARQUIVO}: {erro}"
+    return RelatorioValidacao(aceitos=pd.DataFrame(), rejeicoes=pd.DataFrame([rejeicao]))
+
+
+def _falhas_de_arquivo(rejeicoes: pd.DataFrame) -> List[str]:
+    """Erros dos PDFs que não puderam ser lidos, prefixados pelo nome do arquivo."""
+    if rejeicoes.empty:
+        return []
+    falhas = rejeicoes[rejeicoes["Motivo"].str.startswith(MOTIVO_ARQUIVO)]
+    return [f"{origem}: {motivo}" for origem, motivo in zip(falhas[COLUNA_ORIGEM], falhas["Motivo"])]
@@ -0,0 +1,130 @@
+"""
+Resumo materializado por cliente.
+
+Na publicação de cada versão, os títulos são resumidos em uma linha por
+cliente (quantidade de títulos em aberto, R$ Total, Juros/Multa e vencimento
+mais antigo), ordenada do maior para o menor devedor e gravada ao lado da
+cópia colunar (``DatasetStore.caminho_resumo_clientes``). A visão de maiores
+devedores e os filtros que só dependem do cliente (cliente, funcionários e
+loja) são respondidos sobre esse resumo, em O(clientes), sem voltar aos
+títulos.
+
+A loja de cada funcionário não é gravada no resumo: o diretório de
+funcionários pode mudar sem nova ingestão, então ela é buscada na leitura,
+também por cliente.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import FiltroRelatorio
+from ..utils.funcionarios import LOJA_TODAS
+
+
+# Clientes na visão de maiores devedores
+TOP_DEVEDORES_RESUMO = 50
+
+# Colunas do resumo, na ordem gravada
+COLUNAS_RESUMO = ["Cliente", "Títulos", "R$ Total", "Juros/Multa", "Vencimento mais antigo"]
+
+
+class ResumoClientesService:
+    """Serviço que monta e consulta o resumo por cliente."""
+
+    @staticmethod
+    def calcular(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Resume os títulos por cliente.
+
+        Args:
+            df: DataFrame preparado (Vencimento em datetime)
+
+        Returns:
+            DataFrame com COLUNAS_RESUMO, uma linha por cliente, do maior para
+            o menor R$ Total (empates pelo nome)
+        """
+        if df.empty:
+            return pd.DataFrame({
+                "Cliente": pd.Series(dtype=object),
+                "Títulos": pd.Series(dtype=np.int64),
+                "R$ Total": pd.Series(dtype=np.float64),
+                "Juros/Multa": pd.Series(dtype=np.float64),
+                "Vencimento mais antigo": pd.Series(dtype="datetime64[ns]"),
+            })
+
+        resumo = (
+            pd.DataFrame({
+                "Cliente": df["Cliente"].to_numpy(dtype=object),
+                "R$ Total": df["R$ Total"].to_numpy(dtype=np.float64),
+                "Juros/Multa": df["Juros/Multa"].to_numpy(dtype=np.float64),
+                "Vencimento": df["Vencimento"].to_numpy(dtype="datetime64[ns]"),
+            })
+            .groupby("Cliente", sort=True)
+            .agg(**{
+                "Títulos": ("R$ Total", "size"),
+                "R$ Total": ("R$ Total", "sum"),
+                "Juros/Multa": ("Juros/Multa", "sum"),
+                "Vencimento mais antigo": ("Vencimento", "min"),
+            })
+            .reset_index()
+        )
+        # Ordem estável sobre os nomes já ordenados: empates ficam em ordem alfabética
+        ordem = np.argsort(-resumo["R$ Total"].to_numpy(), kind="stable")
+        return resumo.iloc[ordem].reset_index(drop=True)[COLUNAS_RESUMO]
+
+    @staticmethod
+    def filtrar(
+        resumo: pd.DataFrame,
+        filtros: FiltroRelatorio,
+        lojas: Optional[np.ndarray] = None
+    ) -> pd.DataFrame:
+        """
+        Aplica os filtros de cliente, funcionários e loja ao resumo.
+
+        A ordem do resumo (maiores devedores primeiro) é mantida. Com
+        ``lojas``, o resultado ganha a coluna Funcionário (loja ou None).
+
+        Args:
+            resumo: Resumo por cliente (``calcular``)
+            filtros: Filtros da sidebar
+            lojas: Loja de cada cliente do resumo (None para quem não é
+                funcionário)
+
+        Returns:
+            Linhas do resumo selecionadas
+        """
+        mascara = np.ones(len(resumo), dtype=bool)
+        if filtros.tem_filtro_cliente():
+            mascara &= (resumo["Cliente"] == filtros.cliente).to_numpy(dtype=bool, na_value=False)
+        if filtros.somente_funcionarios and lojas is not None:
+            mascara &= pd.notna(lojas)
+            if filtros.loja and filtros.loja != LOJA_TODAS:
+                mascara &= lojas == filtros.loja
+
+        selecionado = resumo if mascara.all() else resumo[mascara]
+        if lojas is not None:
+            selecionado = selecionado.assign(**{"Funcionário": lojas[mascara]})
+        return selecionado
+
+    @staticmethod
+    def maiores_devedores(
+        resumo: pd.DataFrame,
+        filtros: FiltroRelatorio,
+        lojas: Optional[np.ndarray] = None,
+        n: int = TOP_DEVEDORES_RESUMO
+    ) -> pd.DataFrame:
+        """
+        Maiores devedores conforme os filtros de cliente.
+
+        Args:
+            resumo: Resumo por cliente (já ordenado pelo R$ Total)
+            filtros: Filtros da sidebar
+            lojas: Loja de cada cliente do resumo
+            n: Quantidade de clientes
+
+        Returns:
+            Até ``n`` linhas do resumo, do maior para o menor devedor
+        """
+        return ResumoClientesService.filtrar(resumo, filtros, lojas).head(n)
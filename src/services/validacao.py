@@ -0,0 +1,306 @@
+"""
+Validação e conciliação dos títulos extraídos do PDF.
+
+Roda depois do parsing, com verificações vetorizadas por coluna:
+    - valores numéricos válidos (Acres/Desc, Juros/Multa, R$ Original, R$ Total);
+    - vencimento em data válida (dd/mm/aaaa);
+    - R$ Total = R$ Original + Acres/Desc + Juros/Multa, dentro da tolerância;
+    - par (Título, Fatura) sem repetição;
+    - linhas que o parser não conseguiu recortar (COLUNA_ILEGIVEL).
+
+As linhas reprovadas saem do dataset e vão para um relatório compacto com a
+página e a linha do PDF de onde vieram.
+
+Pares (Título, Fatura) repetidos são separados, em uma única passada por um
+índice de hash das chaves e dos valores, em cópias idênticas (página repetida)
+e versões divergentes (título reemitido). Só uma ocorrência de cada par fica
+no dataset, escolhida pela política POLITICA_DUPLICADOS: a primeira, a última
+ou a primeira com a coluna Conflito marcada quando houver versões divergentes.
+As demais vão para as rejeições, com o motivo de cada uma.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# Diferença máxima aceita entre o total impresso e a soma das parcelas
+TOLERANCIA_TOTAL = 0.011
+
+COLUNAS_VALOR = ["Acres/Desc", "Juros/Multa", "R$ Original", "R$ Total"]
+
+# Formato dos valores após ``PDFParserService.limpar_valor`` (ex.: -1234.56)
+PADRAO_VALOR = r"^-?\d+(\.\d+)?$"
+
+# Origem de cada linha no PDF (preenchidas pelo parser, removidas na validação)
+COLUNAS_ORIGEM = ["Página", "Linha"]
+
+COLUNAS_RELATORIO = COLUNAS_ORIGEM + ["Título", "Fatura", "Motivo"]
+
+# Linhas de título que o parser não conseguiu recortar (removida na validação)
+COLUNA_ILEGIVEL = "Ilegível"
+
+MOTIVO_VALOR = "valor inválido"
+MOTIVO_DATA = "vencimento inválido"
+MOTIVO_TOTAL = "total divergente"
+MOTIVO_DUPLICADO = "título/fatura duplicado"
+MOTIVO_CONFLITO = "título/fatura com valores divergentes"
+MOTIVO_ILEGIVEL = "linha ilegível"
+MOTIVO_ARQUIVO = "arquivo ilegível"
+
+# Políticas para o par (Título, Fatura) repetido
+POLITICA_PRIMEIRO = "primeiro"  # mantém a primeira ocorrência
+POLITICA_ULTIMO = "ultimo"      # mantém a última (ex.: título reemitido)
+POLITICA_MARCAR = "marcar"      # mantém a primeira e marca os pares divergentes
+POLITICAS_DUPLICADOS = (POLITICA_PRIMEIRO, POLITICA_ULTIMO, POLITICA_MARCAR)
+
+# Variável de ambiente que escolhe a política (padrão: primeira ocorrência)
+VARIAVEL_POLITICA = "RELATORIO_DUPLICADOS"
+
+
+def _politica_do_ambiente() -> str:
+    """Política de VARIAVEL_POLITICA, conferida na importação (app, CLI e monitor)."""
+    politica = os.environ.get(VARIAVEL_POLITICA, POLITICA_PRIMEIRO).strip().lower()
+    if politica not in POLITICAS_DUPLICADOS:
+        raise ValueError(
+            f"{VARIAVEL_POLITICA}={politica!r} inválida; use uma de: {', '.join(POLITICAS_DUPLICADOS)}"
+        )
+    return politica
+
+
+POLITICA_DUPLICADOS = _politica_do_ambiente()
+
+# Coluna do dataset com os pares que tinham versões divergentes (política "marcar")
+COLUNA_CONFLITO = "Conflito"
+
+
+@dataclass
+class RelatorioValidacao:
+    """Resultado da validação: linhas aceitas e rejeições."""
+
+    aceitos: pd.DataFrame
+    rejeicoes: pd.DataFrame
+
+    @property
+    def linhas_rejeitadas(self) -> int:
+        """Quantidade de linhas rejeitadas (uma linha pode ter vários motivos)."""
+        return RelatorioValidacao.contar_linhas(self.rejeicoes)
+
+    @staticmethod
+    def contar_linhas(rejeicoes: pd.DataFrame) -> int:
+        """
+        Quantidade de linhas distintas em um relatório de rejeições.
+
+        Uma linha com vários motivos conta uma vez; linhas de arquivos
+        diferentes (coluna Origem) ou sem página/linha (pares repetidos entre
+        arquivos) contam separadamente.
+
+        Args:
+            rejeicoes: Relatório de rejeições (com a coluna Motivo)
+
+        Returns:
+            Quantidade de linhas rejeitadas
+        """
+        if rejeicoes.empty:
+            return 0
+        return len(rejeicoes.drop(columns="Motivo").drop_duplicates())
+
+    @property
+    def titulos_em_conflito(self) -> int:
+        """Títulos mantidos com a coluna Conflito marcada (política "marcar")."""
+        if COLUNA_CONFLITO not in self.aceitos.columns:
+            return 0
+        return int(self.aceitos[COLUNA_CONFLITO].astype(bool).sum())
+
+    def resumo(self) -> Dict[str, int]:
+        """Quantidade de rejeições por motivo."""
+        return self.rejeicoes["Motivo"].value_counts().to_dict()
+
+
+class ValidacaoService:
+    """Serviço de validação dos dados extraídos."""
+
+    @staticmethod
+    def validar(df: pd.DataFrame, politica: str = POLITICA_DUPLICADOS) -> RelatorioValidacao:
+        """
+        Valida o DataFrame bruto do parser.
+
+        Args:
+            df: DataFrame de ``PDFParserService.extrair_dados_pdf``, com as
+                colunas de origem; valores em float (NaN quando ilegíveis) ou
+                ainda em texto e vencimentos em texto
+            politica: Política para o par (Título, Fatura) repetido
+
+        Returns:
+            RelatorioValidacao com as linhas aceitas (valores em float, sem
+            as colunas de origem) e as rejeições por motivo
+        """
+        if df.empty:
+            return RelatorioValidacao(
+                aceitos=df.drop(columns=COLUNAS_ORIGEM, errors="ignore"),
+                rejeicoes=pd.DataFrame(columns=COLUNAS_RELATORIO)
+            )
+
+        # Linhas ilegíveis só têm esse motivo (os campos estão vazios)
+        ilegivel = (
+            df[COLUNA_ILEGIVEL].to_numpy(dtype=bool) if COLUNA_ILEGIVEL in df.columns
+            else np.zeros(len(df), dtype=bool)
+        )
+
+        valores = {coluna: _converter_valores(df[coluna]) for coluna in COLUNAS_VALOR}
+        valor_invalido = np.logical_or.reduce([np.isnan(valores[coluna]) for coluna in COLUNAS_VALOR]) & ~ilegivel
+
+        datas = _converter_datas(df["Vencimento"])
+        data_invalida = np.isnat(datas) & ~ilegivel
+
+        soma = valores["R$ Original"] + valores["Acres/Desc"] + valores["Juros/Multa"]
+        with np.errstate(invalid="ignore"):
+            total_divergente = np.abs(soma - valores["R$ Total"]) > TOLERANCIA_TOTAL
+
+        # Duplicidade só entre as linhas que passaram nas demais verificações
+        validos = ~(ilegivel | valor_invalido | data_invalida | total_divergente)
+        duplicado, conflito, marcado = indexar_duplicados(
+            df["Título"], df["Fatura"],
+            [df["Cliente"].to_numpy(), datas] + [valores[coluna] for coluna in COLUNAS_VALOR],
+            validos, politica
+        )
+
+        verificacoes = [
+            (ilegivel, MOTIVO_ILEGIVEL),
+            (valor_invalido, MOTIVO_VALOR),
+            (data_invalida, MOTIVO_DATA),
+            (total_divergente, MOTIVO_TOTAL),
+            (duplicado, MOTIVO_DUPLICADO),
+            (conflito, MOTIVO_CONFLITO),
+        ]
+        colunas = [c for c in COLUNAS_RELATORIO if c in df.columns]
+        partes = [
+            pd.DataFrame({
+                coluna: df[coluna].to_numpy()[indices] for coluna in colunas
+            }).assign(Motivo=motivo)
+            for mascara, motivo in verificacoes
+            if len(indices := np.flatnonzero(mascara))
+        ]
+        if partes:
+            rejeicoes = pd.concat(partes).sort_values(
+                [c for c in COLUNAS_ORIGEM if c in df.columns] or ["Motivo"], kind="stable"
+            ).reset_index(drop=True)
+        else:
+            rejeicoes = pd.DataFrame(columns=COLUNAS_RELATORIO)
+
+        # Uma única seleção por coluna, já com os valores convertidos
+        aceito = np.flatnonzero(validos & ~duplicado & ~conflito)
+        aceitos = pd.DataFrame({
+            coluna: valores[coluna][aceito] if coluna in valores else df[coluna].to_numpy()[aceito]
+            for coluna in df.columns if coluna not in COLUNAS_ORIGEM and coluna != COLUNA_ILEGIVEL
+        })
+        if politica == POLITICA_MARCAR:
+            aceitos[COLUNA_CONFLITO] = marcado[aceito]
+        return RelatorioValidacao(aceitos=aceitos, rejeicoes=rejeicoes)
+
+
+def converter_valores(texto: pa.Array) -> np.ndarray:
+    """
+    Converte valores em texto (ex.: -1234.56) para float, em lote.
+
+    Args:
+        texto: Array Arrow de strings no formato de ``PADRAO_VALOR``
+
+    Returns:
+        Array float64; textos fora do formato viram NaN
+    """
+    valido = pc.match_substring_regex(texto, PADRAO_VALOR)
+    convertido = pc.cast(pc.if_else(valido, texto, None), pa.float64())
+    return convertido.to_numpy(zero_copy_only=False)
+
+
+def _converter_valores(serie: pd.Series) -> np.ndarray:
+    """Valores da coluna em float; os já numéricos passam direto."""
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.to_numpy(dtype=np.float64)
+    return converter_valores(pa.array(serie.to_numpy(dtype=object), type=pa.string(), from_pandas=True))
+
+
+def _converter_datas(serie: pd.Series) -> np.ndarray:
+    """Converte datas dd/mm/aaaa; cada data distinta é interpretada uma só vez."""
+    codigos, distintas = pd.factorize(serie)
+    datas = pd.to_datetime(distintas, format="%d/%m/%Y", errors="coerce").to_numpy()
+    resultado = np.full(len(serie), np.datetime64("NaT"), dtype="datetime64[ns]")
+    presentes = codigos >= 0
+    resultado[presentes] = datas[codigos[presentes]]
+    return resultado
+
+
+def indexar_duplicados(
+    titulos,
+    faturas,
+    valores: List[np.ndarray],
+    considerar: np.ndarray,
+    politica: str = POLITICA_DUPLICADOS
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encontra os pares (Título, Fatura) repetidos e aplica a política.
+
+    Chaves e valores de cada linha viram códigos de hash (``pd.factorize`` e
+    ``pd.util.hash_pandas_object``); uma repetição com o mesmo hash de valores
+    da ocorrência mantida é cópia idêntica, com outro hash é versão divergente.
+
+    Args:
+        titulos: Coluna Título
+        faturas: Coluna Fatura
+        valores: Colunas comparadas entre as ocorrências (mesmo tamanho)
+        considerar: Linhas que entram na verificação (as demais são ignoradas)
+        politica: Uma de POLITICAS_DUPLICADOS
+
+    Returns:
+        Tupla de máscaras (cópias descartadas, versões divergentes
+        descartadas, ocorrências mantidas de pares com versões divergentes)
+
+    Raises:
+        ValueError: Se a política não for conhecida
+    """
+    if politica not in POLITICAS_DUPLICADOS:
+        raise ValueError(
+            f"Política de duplicados inválida: {politica!r} (use {', '.join(POLITICAS_DUPLICADOS)})"
+        )
+
+    n = len(considerar)
+    duplicado, conflito, marcado = (np.zeros(n, dtype=bool) for _ in range(3))
+    linhas = np.flatnonzero(considerar)
+    if len(linhas) == 0:
+        return duplicado, conflito, marcado
+
+    codigos_titulo, _ = pd.factorize(titulos)
+    codigos_fatura, distintas = pd.factorize(faturas)
+    chave = codigos_titulo.astype(np.int64) * (len(distintas) + 1) + codigos_fatura
+    grupo, chaves = pd.factorize(chave[linhas])
+    if len(chaves) == len(linhas):
+        return duplicado, conflito, marcado
+
+    # Só as linhas de chaves repetidas têm os valores comparados
+    repetidas = np.bincount(grupo)[grupo] > 1
+    linhas, grupo = linhas[repetidas], grupo[repetidas]
+    hashes = pd.util.hash_pandas_object(
+        pd.DataFrame({k: coluna[linhas] for k, coluna in enumerate(valores)}), index=False
+    ).to_numpy()
+
+    manter = ~pd.Index(grupo).duplicated(keep="last" if politica == POLITICA_ULTIMO else "first")
+    hash_mantido = np.empty(len(chaves), dtype=np.uint64)
+    hash_mantido[grupo[manter]] = hashes[manter]
+    divergente = hashes != hash_mantido[grupo]
+
+    # Versões distintas de cada par: quantos hashes diferentes a chave tem
+    versoes = np.bincount(
+        grupo[~pd.DataFrame({"grupo": grupo, "hash": hashes}).duplicated().to_numpy()],
+        minlength=len(chaves)
+    )
+
+    duplicado[linhas] = ~manter & ~divergente
+    conflito[linhas] = ~manter & divergente
+    marcado[linhas] = manter & (versoes[grupo] > 1)
+    return duplicado, conflito, marcado
@@ -7,7 +7,15 @@ import streamlit as st
 import pandas as pd
 from typing import Optional
 from ..config import config
-from ..utils.formatters import preparar_dataframe_visualizacao, calcular_total_formatado
+from ..services.agregados import GraficosTitulos
+from ..services.anotacoes import AnotacaoService, OPCOES_ACORDO
+from ..services.ingest_jobs import IngestJob
+from ..services.validacao import RelatorioValidacao
+from ..utils import perfil
+from ..utils.formatters import (
+    preparar_dataframe_visualizacao, calcular_total_formatado,
+    formatar_coluna_data, formatar_coluna_valor
+)
 
 
 class MainViewComponents:
@@ -37,6 +45,30 @@ class MainViewComponents:
         """
         st.success(f"Arquivo '{nome_arquivo}' processado com sucesso.")
     
+    @staticmethod
+    @st.fragment(run_every=1.0)
+    def progresso_processamento(job: IngestJob) -> None:
+        """
+        Acompanha um processamento de PDF em segundo plano.
+        
+        O fragmento é atualizado a cada segundo sem reexecutar o app; quando o
+        job termina, um rerun completo troca o dataset exibido.
+        
+        Args:
+            job: Job de processamento do upload
+        """
+        if not job.em_andamento:
+            st.rerun()
+        
+        restante = job.segundos_restantes()
+        texto = (
+            f"Processando '{job.nome_arquivo}': página {job.paginas_processadas}"
+            f"/{job.total_paginas or '?'} · {job.titulos_encontrados} títulos"
+        )
+        if restante is not None:
+            texto += f" · ~{restante:.0f}s restantes"
+        st.progress(job.fracao, text=texto)
+    
     @staticmethod
     def subtitulo_resultados(total_registros: int) -> None:
         """
@@ -56,10 +88,12 @@ class MainViewComponents:
             df: DataFrame com os dados
         """
         # Preparar dados para visualização
-        df_formatado = preparar_dataframe_visualizacao(df)
+        with perfil.etapa("preparar_dataframe_visualizacao"):
+            df_formatado = preparar_dataframe_visualizacao(df)
         
         # Exibir tabela
-        st.dataframe(df_formatado, use_container_width=True)
+        with perfil.etapa("st.dataframe"):
+            st.dataframe(df_formatado, use_container_width=True)
     
     @staticmethod
     def metrica_total(df: pd.DataFrame, coluna: str = "R$ Total") -> None:
@@ -78,6 +112,9 @@ class MainViewComponents:
         """
         Exibe botão para download do CSV filtrado.
         
+        Por ser um widget, deve ser desenhado no corpo do fragmento de filtros
+        (a sidebar), e não no placeholder dos resultados.
+        
         Args:
             df: DataFrame com os dados
             nome_arquivo: Nome do arquivo para download
@@ -94,13 +131,18 @@ class MainViewComponents:
         )
     
     @staticmethod
-    def exibir_interface_principal(df: pd.DataFrame, arquivo_processado: Optional[str] = None) -> None:
+    def exibir_cabecalho(
+        arquivo_processado: Optional[str] = None,
+        job: Optional[IngestJob] = None,
+        rejeicoes: Optional[pd.DataFrame] = None
+    ) -> None:
         """
-        Exibe toda a interface principal da aplicação.
+        Exibe o título e o estado do upload; roda apenas no rerun completo.
         
         Args:
-            df: DataFrame com os dados filtrados
             arquivo_processado: Nome do arquivo processado (se houver)
+            job: Processamento de upload em andamento (se houver)
+            rejeicoes: Linhas do upload rejeitadas na validação (se houver)
         """
 
         # Exibir logo
@@ -111,26 +153,215 @@ class MainViewComponents:
         # Título
         MainViewComponents.titulo_principal()
         
+        # Progresso ou falha do upload em segundo plano
+        if job is not None and job.em_andamento:
+            MainViewComponents.progresso_processamento(job)
+        elif job is not None and job.status == IngestJob.ERRO:
+            MainViewComponents.exibir_erro(
+                f"Falha ao processar '{job.nome_arquivo}': {job.erro}"
+            )
+        
         # Mensagem de sucesso se arquivo foi processado
         if arquivo_processado:
             MainViewComponents.mensagem_sucesso_upload(arquivo_processado)
         
-        # Verificar se há dados para exibir
-        if df.empty:
-            st.warning("Nenhum dado encontrado com os filtros aplicados.")
+        # Linhas do PDF rejeitadas na validação
+        if rejeicoes is not None and not rejeicoes.empty:
+            MainViewComponents.relatorio_rejeicoes(rejeicoes)
+    
+    @staticmethod
+    def relatorio_rejeicoes(rejeicoes: pd.DataFrame) -> None:
+        """
+        Exibe o resumo das linhas do PDF rejeitadas na validação.
+        
+        Args:
+            rejeicoes: DataFrame com Página, Linha, Título, Fatura, Motivo e,
+                em uploads com vários PDFs, Origem
+        """
+        linhas = RelatorioValidacao.contar_linhas(rejeicoes)
+        resumo = ", ".join(
+            f"{quantidade} {motivo}" for motivo, quantidade in rejeicoes["Motivo"].value_counts().items()
+        )
+        st.warning(f"⚠️ {linhas} linha(s) do PDF rejeitada(s) na validação: {resumo}.")
+        with st.expander("Ver linhas rejeitadas"):
+            st.dataframe(rejeicoes, use_container_width=True, hide_index=True)
+    
+    @staticmethod
+    def painel_graficos(graficos: GraficosTitulos) -> None:
+        """
+        Exibe os gráficos de total em aberto por período, maiores devedores e
+        lojas (funcionários).
+        
+        As séries já chegam agregadas e reduzidas (``AgregadosService``): o
+        navegador recebe no máximo algumas dezenas de pontos por gráfico.
+        
+        Args:
+            graficos: Séries fatiadas dos agregados do dataset
+        """
+        import altair as alt
+        
+        st.caption(
+            "Gráficos por cliente, período (meses inteiros) e loja; "
+            "os demais filtros valem só para a tabela."
+        )
+        coluna_periodo, coluna_devedores = st.columns(2)
+        
+        with coluna_periodo:
+            st.markdown(f"**Total em aberto por {graficos.granularidade} de vencimento**")
+            if graficos.por_periodo.empty:
+                st.info("Sem títulos com vencimento no período.")
+            else:
+                st.bar_chart(graficos.por_periodo, x_label="Vencimento", y_label="R$")
+        
+        with coluna_devedores:
+            st.markdown(f"**Maiores devedores (top {len(graficos.maiores_devedores)})**")
+            if graficos.maiores_devedores.empty:
+                st.info("Sem devedores no período.")
+            else:
+                dados = graficos.maiores_devedores.rename_axis("Cliente").reset_index()
+                st.altair_chart(
+                    alt.Chart(dados).mark_bar().encode(
+                        x=alt.X("R$ Total:Q", title="R$"),
+                        y=alt.Y("Cliente:N", sort="-x", title=None),
+                        tooltip=["Cliente", alt.Tooltip("R$ Total:Q", format=",.2f")],
+                    ),
+                    use_container_width=True
+                )
+        
+        if not graficos.por_loja.empty:
+            st.markdown("**Total em aberto de funcionários por loja**")
+            st.bar_chart(graficos.por_loja, x_label="Loja", y_label="R$")
+    
+    @staticmethod
+    def tabela_maiores_devedores(devedores: pd.DataFrame) -> None:
+        """
+        Exibe os maiores devedores a partir do resumo por cliente.
+        
+        Args:
+            devedores: Linhas do resumo por cliente, já filtradas e ordenadas
+        """
+        st.markdown(f"**Maiores devedores ({len(devedores)} clientes)**")
+        st.caption(
+            "Todos os títulos em aberto de cada cliente: só os filtros de "
+            "cliente, funcionários e loja se aplicam a esta tabela."
+        )
+        if devedores.empty:
+            st.info("Nenhum cliente com os filtros aplicados.")
             return
         
-        # Subtítulo com número de registros
-        MainViewComponents.subtitulo_resultados(len(df))
+        hoje = pd.Timestamp.today().normalize()
+        atraso = (hoje - devedores["Vencimento mais antigo"]).dt.days.clip(lower=0)
+        tabela = preparar_dataframe_visualizacao(devedores.assign(**{"Dias de atraso": atraso}))
+        tabela["Juros/Multa"] = formatar_coluna_valor(tabela["Juros/Multa"])
+        tabela["Vencimento mais antigo"] = formatar_coluna_data(tabela["Vencimento mais antigo"])
+        st.dataframe(tabela, use_container_width=True, hide_index=True)
+    
+    @staticmethod
+    def exibir_interface_principal(
+        df: pd.DataFrame,
+        area: Optional[object] = None,
+        graficos: Optional[GraficosTitulos] = None,
+        devedores: Optional[pd.DataFrame] = None
+    ) -> None:
+        """
+        Exibe os resultados filtrados.
+        
+        Quando chamado de um fragmento da sidebar, ``area`` é um ``st.empty()``
+        criado no corpo principal; seu conteúdo é substituído a cada rerun do
+        fragmento.
         
-        # Tabela de dados
-        MainViewComponents.tabela_dados(df)
+        Args:
+            df: DataFrame com os dados filtrados
+            area: Placeholder onde desenhar os resultados (opcional)
+            graficos: Séries dos gráficos (opcional; sem elas, o painel não
+                é exibido)
+            devedores: Maiores devedores do resumo por cliente (opcional)
+        """
+        with (area.container() if area is not None else st.container()):
+            # Verificar se há dados para exibir
+            if df.empty:
+                st.warning("Nenhum dado encontrado com os filtros aplicados.")
+                return
+            
+            # Subtítulo com número de registros
+            MainViewComponents.subtitulo_resultados(len(df))
+            
+            # Tabela de dados
+            MainViewComponents.tabela_dados(df)
+            
+            # Métrica de total
+            with perfil.etapa("metrica_total"):
+                MainViewComponents.metrica_total(df)
+            
+            # Gráficos a partir dos agregados
+            if graficos is not None:
+                with perfil.etapa("painel_graficos"):
+                    MainViewComponents.painel_graficos(graficos)
+            
+            # Maiores devedores a partir do resumo por cliente
+            if devedores is not None:
+                with perfil.etapa("maiores_devedores"):
+                    MainViewComponents.tabela_maiores_devedores(devedores)
+    
+    @staticmethod
+    def formulario_anotacao(df: pd.DataFrame, anotacoes: pd.DataFrame) -> None:
+        """
+        Exibe o formulário de anotações por título.
         
-        # Métrica de total
-        MainViewComponents.metrica_total(df)
+        Fica fora do fragmento de filtros; ao salvar, o app é reexecutado
+        para que a tabela reflita a anotação.
         
-        # Botão de download
-        MainViewComponents.botao_download(df)
+        Args:
+            df: DataFrame preparado com todos os títulos
+            anotacoes: Anotações atuais (AnotacaoService.carregar)
+        """
+        with st.expander("📝 Anotações por título"):
+            cliente = st.selectbox(
+                "Cliente", sorted(df["Cliente"].dropna().unique().tolist()), key="anotacao_cliente"
+            )
+            titulos = df.loc[df["Cliente"] == cliente, ["Título", "Fatura"]].fillna("").astype(str)
+            opcoes = list(titulos.itertuples(index=False, name=None))
+            if not opcoes:
+                return
+            titulo, fatura = st.selectbox(
+                "Título / Fatura", opcoes,
+                format_func=lambda par: f"{par[0]} / {par[1]}",
+                key="anotacao_titulo"
+            )
+            
+            atual = anotacoes[
+                (anotacoes["Título"] == titulo) &
+                (anotacoes["Fatura"] == fatura) &
+                (anotacoes["Cliente"] == cliente)
+            ]
+            atual = atual.iloc[0] if not atual.empty else None
+            
+            with st.form("form_anotacao"):
+                cobrado = st.checkbox("Já cobrado", value=bool(atual["Cobrado"]) if atual is not None else False)
+                cobrancas = st.number_input(
+                    "Quantidade de cobranças", min_value=0, step=1,
+                    value=int(atual["Cobranças"]) if atual is not None else 0
+                )
+                acao_judicial = st.checkbox(
+                    "Ação judicial", value=bool(atual["Ação judicial"]) if atual is not None else False
+                )
+                acordo = st.selectbox(
+                    "Acordo comercial", OPCOES_ACORDO,
+                    index=OPCOES_ACORDO.index(atual["Acordo"]) if atual is not None and atual["Acordo"] in OPCOES_ACORDO else 0,
+                    format_func=lambda opcao: opcao or "Nenhum"
+                )
+                observacao = st.text_area("Observação", value=atual["Observação"] if atual is not None else "")
+                
+                if st.form_submit_button("Salvar anotação"):
+                    AnotacaoService.salvar(
+                        titulo, fatura, cliente,
+                        cobrado=cobrado,
+                        cobrancas=cobrancas,
+                        acao_judicial=acao_judicial,
+                        acordo=acordo,
+                        observacao=observacao
+                    )
+                    st.rerun()
     
     @staticmethod
     def exibir_erro(mensagem: str) -> None:
@@ -1,31 +1,38 @@
 """
 Componentes da interface lateral (sidebar).
+
+Com exceção do upload, os componentes escrevem no container ativo e devem ser
+chamados dentro de ``with st.sidebar``; assim os filtros podem rodar em um
+``st.fragment`` sem reexecutar o app inteiro.
 """
 
 import streamlit as st
 import pandas as pd
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 from ..config import FiltroRelatorio, config
 from ..services.data_filter import DataFilterService
-from ..services.pdf_processor import PDFProcessorService
-from ..utils.funcionarios import FUNCIONARIOS_POR_LOJA
+from ..services.dataset_session import DatasetAtivo, DatasetSessionService
+from ..services.ordenacao import COLUNAS_ORDENACAO, Chave
+from ..utils import perfil
+from ..utils.funcionarios import LOJA_TODAS, obter_diretorio
 
 
 class SidebarComponents:
     """Componentes da sidebar da aplicação."""
     
     @staticmethod
-    def upload_arquivo() -> Optional[object]:
+    def upload_arquivos() -> List:
         """
-        Componente para upload de arquivo PDF.
+        Componente para upload de um ou mais PDFs (por exemplo, um por loja).
         
         Returns:
-            Arquivo enviado ou None
+            Arquivos enviados (lista vazia se nenhum)
         """
         return st.sidebar.file_uploader(
-            "Carregar relatório em PDF",
-            type=config.TIPOS_ARQUIVO_PERMITIDOS
-        )
+            "Carregar relatórios em PDF",
+            type=config.TIPOS_ARQUIVO_PERMITIDOS,
+            accept_multiple_files=True
+        ) or []
     
     @staticmethod
     def filtro_cliente(opcoes_clientes: list) -> str:
@@ -38,7 +45,7 @@ class SidebarComponents:
         Returns:
             Cliente selecionado
         """
-        return st.sidebar.selectbox(
+        return st.selectbox(
             "Filtrar por cliente",
             ["Todos"] + opcoes_clientes
         )
@@ -54,7 +61,7 @@ class SidebarComponents:
         Returns:
             Título selecionado
         """
-        return st.sidebar.selectbox(
+        return st.selectbox(
             "Buscar por Título",
             ["Todos"] + opcoes_titulos,
             index=0
@@ -62,32 +69,32 @@ class SidebarComponents:
     
     @staticmethod
     def filtro_atrasados() -> Tuple[bool, Optional[int], bool, bool, bool]:
-        atrasados = st.sidebar.checkbox("Mostrar apenas títulos atrasados")
+        atrasados = st.checkbox("Mostrar apenas títulos atrasados")
         tempo = None
         mes_corrente = False
         ja_cobrado = False
         a_cobrar = False
 
         if atrasados:
-            mes_corrente = st.sidebar.checkbox("Mês corrente (slider em semanas)")
-            tempo = st.sidebar.slider(
+            mes_corrente = st.checkbox("Mês corrente (slider em semanas)")
+            tempo = st.slider(
                 "Tempo de atraso",
                 min_value=1,
                 max_value=12 if not mes_corrente else 4,
                 step=1,
                 format="%d " + ("mês(es)" if not mes_corrente else "semana(s)")
             )
-            ja_cobrado = st.sidebar.checkbox("Já cobrados")
-            a_cobrar = st.sidebar.checkbox("A cobrar")
+            ja_cobrado = st.checkbox("Já cobrados")
+            a_cobrar = st.checkbox("A cobrar")
 
         return atrasados, tempo, mes_corrente, ja_cobrado, a_cobrar
 
     @staticmethod
     def filtro_cobrancas_futuras() -> Tuple[bool, Optional[int]]:
-        futuras = st.sidebar.checkbox("Cobranças futuras")
+        futuras = st.checkbox("Cobranças futuras")
         dias = None
         if futuras:
-            dias = st.sidebar.select_slider(
+            dias = st.select_slider(
                 "Próximos dias",
                 options=[7, 14, 21, 30],
                 value=30
@@ -106,8 +113,8 @@ class SidebarComponents:
         Returns:
             Tupla com (data_inicio, data_fim)
         """
-        st.sidebar.caption("**Escolha o intervalo de vencimento**")
-        left_column, right_column = st.sidebar.columns(2)
+        st.caption("**Escolha o intervalo de vencimento**")
+        left_column, right_column = st.columns(2)
         with left_column:
             data_inicio = st.date_input("Data inicial", data_min)
         with right_column:
@@ -115,12 +122,12 @@ class SidebarComponents:
         
         # Mostrar intervalo selecionado
         if DataFilterService.validar_intervalo_data(data_inicio, data_fim):
-            st.sidebar.caption(
+            st.caption(
                 f"De: {data_inicio.strftime('%d/%m/%Y')} "
                 f"até: {data_fim.strftime('%d/%m/%Y')}"
             )
         else:
-            st.sidebar.caption("Selecione um intervalo de datas válido.")
+            st.caption("Selecione um intervalo de datas válido.")
         
         return data_inicio, data_fim
     
@@ -139,7 +146,7 @@ class SidebarComponents:
         if valor_min == valor_max:
             return valor_min, valor_max
         
-        return st.sidebar.slider(
+        return st.slider(
             "Filtrar por valor total (R$)",
             min_value=valor_min,
             max_value=valor_max,
@@ -150,35 +157,104 @@ class SidebarComponents:
     
     @staticmethod
     def filtro_funcionarios() -> Tuple[bool, Optional[str]]:
-        somente_func = st.sidebar.checkbox("Filtrar somente funcionários")
+        somente_func = st.checkbox("Filtrar somente funcionários")
         loja = None
 
         if somente_func:
-            opcoes_lojas = sorted(["Todas"] + list(FUNCIONARIOS_POR_LOJA.keys()))
-            loja = st.sidebar.selectbox("Filtrar por loja", opcoes_lojas, index=4)
+            opcoes_lojas = sorted([LOJA_TODAS] + obter_diretorio().lojas)
+            loja = st.selectbox(
+                "Filtrar por loja", opcoes_lojas, index=opcoes_lojas.index(LOJA_TODAS)
+            )
 
         return somente_func, loja
 
     @staticmethod
-    def construir_sidebar(df: pd.DataFrame) -> Tuple[object, FiltroRelatorio]:
+    def controles_ordenacao() -> Tuple[Chave, ...]:
         """
-        Constrói toda a sidebar com todos os componentes.
+        Componente para ordenar a tabela por até três colunas.
+        
+        Returns:
+            Pares (coluna, crescente), em ordem de prioridade (vazio para a
+            ordem do relatório)
+        """
+        colunas = st.multiselect(
+            "Ordenar tabela por",
+            list(COLUNAS_ORDENACAO),
+            placeholder="Ordem do relatório"
+        )
+        
+        # Cada coluna aparece uma vez; a direção é um controle à parte
+        return tuple(
+            (coluna, not st.checkbox(f"{coluna} decrescente", key=f"ordenacao_decrescente_{coluna}"))
+            for coluna in colunas
+        )
+    
+    @staticmethod
+    def relatorio_perfil(registro: dict, historico: List[dict]) -> None:
+        """
+        Exibe o tempo e a memória de cada etapa do último rerun.
         
         Args:
-            df: DataFrame com os dados para extrair opções
+            registro: Rerun atual (``perfil.finalizar``)
+            historico: Últimos reruns da sessão (``perfil.historico``)
+        """
+        restante = registro["total_ms"] - sum(e["ms"] for e in registro["etapas"])
+        etapas = pd.DataFrame(
+            registro["etapas"] + [{"Etapa": "(widgets e demais)", "ms": restante}],
+            columns=["Etapa", "ms", "Δ memória (MB)", "Pico (MB)"]
+        ).astype({"Δ memória (MB)": float, "Pico (MB)": float})
+        
+        st.divider()
+        st.caption(
+            f"⏱️ Perfil do rerun ({registro['tipo']}, modo {registro['modo']}): "
+            f"{registro['total_ms']:.0f} ms"
+        )
+        st.dataframe(
+            etapas.round(1), hide_index=True, use_container_width=True,
+            column_config={"ms": st.column_config.ProgressColumn(
+                "ms", format="%.1f", min_value=0, max_value=max(registro["total_ms"], 1)
+            )}
+        )
+        if "arquivo" in registro:
+            st.caption(f"cProfile: {registro['arquivo']}")
+        
+        with st.expander(f"Histórico ({len(historico)} reruns)"):
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        "Quando": r["quando"].strftime("%H:%M:%S"),
+                        "Tipo": r["tipo"],
+                        "Total (ms)": round(r["total_ms"], 1),
+                        "Etapa mais lenta": max(r["etapas"], key=lambda e: e["ms"])["Etapa"] if r["etapas"] else "",
+                    }
+                    for r in reversed(historico)
+                ]),
+                hide_index=True, use_container_width=True
+            )
+    
+    @staticmethod
+    def construir_sidebar(dataset: DatasetAtivo) -> FiltroRelatorio:
+        """
+        Constrói os filtros da sidebar.
+        
+        O upload é renderizado antes, por ``upload_arquivos``, para que o
+        dataset seja resolvido uma única vez por rerun. As opções de cada
+        filtro vêm do cache do dataset.
+        
+        Args:
+            dataset: Dataset ativo, usado para extrair as opções
             
         Returns:
-            Tupla com (arquivo_upload, filtros_configurados)
+            Filtros configurados
         """
-        # Upload de arquivo
-        arquivo_upload = SidebarComponents.upload_arquivo()
-
         # Passo 1: filtro de cliente
-        opcoes_gerais = DataFilterService.obter_opcoes_filtros(df)
+        with perfil.etapa("obter_opcoes_filtros"):
+            opcoes_gerais = DatasetSessionService.opcoes_filtros(dataset)
         cliente_selecionado = SidebarComponents.filtro_cliente(opcoes_gerais["clientes"])
 
         # Passo 2: obter opções com base no cliente
-        opcoes_filtradas = DataFilterService.obter_opcoes_filtros(df, cliente=cliente_selecionado)
+        with perfil.etapa("obter_opcoes_filtros (cliente)"):
+            opcoes_filtradas = DatasetSessionService.opcoes_filtros(dataset, cliente=cliente_selecionado)
 
         # Filtros subsequentes com base no cliente
         titulo_selecionado = SidebarComponents.filtro_titulo(opcoes_filtradas["titulos"])
@@ -216,4 +292,4 @@ class SidebarComponents:
         )
 
 
-        return arquivo_upload, filtros
+        return filtros
@@ -71,7 +71,8 @@ def preparar_dataframe_visualizacao(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame formatado para visualização
     """
-    df_formatado = df.copy()
+    # Cópia rasa: as colunas formatadas são substituídas, não alteradas
+    df_formatado = df.copy(deep=False)
     
     # Formatar datas
     if "Vencimento" in df_formatado.columns:
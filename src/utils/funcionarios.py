@@ -1,64 +1,193 @@
 # src/utils/funcionarios.py
 
-from typing import Dict, List
-
-# Dicionário base: loja → lista de funcionários
-FUNCIONARIOS_POR_LOJA: Dict[str, List[str]] = {
-    "Diretoria": [
-        "CLAUDIA SIQUEIRA GOMES ALVES",
-        "TASSO GOMES ALVES",
-        "ADEMIR RODRIGUES ALVES"
-    ],
-    "Betel": [
-        "Cosme Nascimento dos Santos",
-        "Vonivon Soares dos Santos",
-        "Kléber Brito Moreira",
-        "Cristiane Santos Guimarães",
-        "Miranda de Almeida Santos",
-        "Jeferson de Jesus Cruz",
-        "Alisson Souza de Almeida",
-        "Mirian Gonçalves dos Santos", 
-        "Leandro Pereira Vieira",
-        "Cleyton Santos Silva",
-        "Jeferson Santos de Jesus",
-        "Everaldo de Jesus Santos",
-        "Daniel do Rosário Santos",
-        "Ramon Pereria dos Santos", 
-        "Larissa Santos Ferreira",
-        "Alex Santos de Almeida",
-        "Jacó Cruz dos Santos",
-        "Maria Fernanda Nery Santos",
-        "Nerisvaldo Soares dos Santos",
-        "Joildes Nascimento do Carmo Júnio",
-        "Diego Santana Ferreira",
-        "Lindoilson Santos Costa",
-        "Cleiton Santos de Almeida",
-        "Fábio de Jesus dos Santos",
-        "Lucas Nunes dos Santos",
-        "Wellington de Almeida Reis",
-        "Marcela Santos Santana",
-        "Wemerson dos Santos Silva",
-        "Cláudio Argolo dos Santos"
-    ],
-    "ACTT_Materiais": [
-        "Juliano Silva Santana",
-        "Egnailson Soares dos Santos",
-        "Marcio Mauricio Luz Silva Júnior",
-        "Deuslir de Andrade Viana"
-    ],
-    "ACTT_Madeiras": [
-        "Maisa de Almeida Santos",
-        "Lindomar Gusmão Lima",
-        "Luis Fernando de Andrade Silva",
-        "Amilton José dos Santos Júnior",
-        "Célio Menezes de Oliveira"
-    ]
-    # Adicione mais lojas e nomes conforme necessário
-}
-
-# Mapeamento reverso: funcionário → loja principal
-FUNCIONARIO_PARA_LOJA: Dict[str, str] = {
-    nome: loja
-    for loja, nomes in FUNCIONARIOS_POR_LOJA.items()
-    for nome in nomes
-}
+"""
+Diretório de funcionários por loja.
+
+Os nomes vêm de um arquivo local, sem precisar alterar o código: CSV com as
+colunas Loja e Nome ou JSON no formato {"loja": ["nome", ...]}. O arquivo é
+carregado em um índice nome normalizado → loja e recarregado sozinho quando
+sua data de modificação muda.
+
+A normalização (sem o sufixo "(FUNCIONÁRIO)", sem acentos, em minúsculas) é
+a mesma aplicada aos nomes de ``Cliente``; a de cada cliente é feita uma única
+vez e reaproveitada entre recargas do diretório.
+"""
+
+import csv
+import json
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import config
+
+
+# Arquivo padrão do diretório (CSV)
+CAMINHO_DIRETORIO = config.CAMINHO_CSV.parent / "funcionarios.csv"
+
+# Alternativa em JSON, usada quando o CSV não existe
+CAMINHO_DIRETORIO_JSON = CAMINHO_DIRETORIO.with_suffix(".json")
+
+# Opção do filtro de loja que não restringe a loja
+LOJA_TODAS = "Todas"
+
+# Limite de nomes de clientes normalizados mantidos em memória
+MAX_NOMES_NORMALIZADOS = 500_000
+
+_SUFIXO_FUNCIONARIO = re.compile(r"\s*\(FUNCION[AÁ]RIO\)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class DiretorioFuncionarios:
+    """Funcionários por loja e o índice de busca já normalizado."""
+
+    por_loja: Dict[str, List[str]]
+    indice: Dict[str, str]
+    modificado_em: int = 0
+    caminho: Optional[Path] = None
+
+    @property
+    def lojas(self) -> List[str]:
+        """Lojas do diretório, em ordem alfabética."""
+        return sorted(self.por_loja)
+
+    def loja_de(self, nome: str) -> Optional[str]:
+        """Loja do funcionário ou None se o nome não estiver no diretório."""
+        return self.indice.get(normalizar_nome(nome))
+
+
+def normalizar_nome(nome: str) -> str:
+    """
+    Normaliza um nome para comparação.
+
+    Remove o sufixo "(FUNCIONÁRIO)", os acentos e espaços repetidos e passa
+    para minúsculas.
+
+    Args:
+        nome: Nome do cliente ou do funcionário
+
+    Returns:
+        Nome normalizado
+    """
+    sem_sufixo = _SUFIXO_FUNCIONARIO.sub("", nome).lower()
+    sem_acento = unicodedata.normalize("NFKD", sem_sufixo).encode("ascii", errors="ignore").decode("ascii")
+    return " ".join(sem_acento.split())
+
+
+def carregar_diretorio(caminho: Optional[Path] = None) -> DiretorioFuncionarios:
+    """
+    Lê o arquivo do diretório e monta o índice normalizado.
+
+    Args:
+        caminho: Arquivo CSV ou JSON, pela extensão (padrão: caminho_diretorio())
+
+    Returns:
+        DiretorioFuncionarios; vazio se o arquivo não existir
+    """
+    caminho = Path(caminho or caminho_diretorio())
+    try:
+        modificado_em = caminho.stat().st_mtime_ns
+        if caminho.suffix.lower() == ".json":
+            por_loja = {
+                str(loja): [str(nome).strip() for nome in nomes]
+                for loja, nomes in json.loads(caminho.read_text(encoding="utf-8")).items()
+            }
+        else:
+            por_loja: Dict[str, List[str]] = {}
+            with open(caminho, newline="", encoding="utf-8-sig") as arquivo:
+                for linha in csv.DictReader(arquivo):
+                    loja, nome = (linha.get("Loja") or "").strip(), (linha.get("Nome") or "").strip()
+                    if loja and nome:
+                        por_loja.setdefault(loja, []).append(nome)
+    except FileNotFoundError:
+        print(f"Diretório de funcionários não encontrado: {caminho}")
+        return DiretorioFuncionarios(por_loja={}, indice={}, caminho=caminho)
+
+    indice = {
+        normalizar_nome(nome): loja
+        for loja, nomes in por_loja.items()
+        for nome in nomes
+    }
+    return DiretorioFuncionarios(por_loja=por_loja, indice=indice, modificado_em=modificado_em, caminho=caminho)
+
+
+def caminho_diretorio() -> Path:
+    """
+    Arquivo do diretório em uso: o CSV se existir, senão o JSON.
+
+    Returns:
+        CAMINHO_DIRETORIO, ou CAMINHO_DIRETORIO_JSON quando só ele existe
+    """
+    if not CAMINHO_DIRETORIO.exists() and CAMINHO_DIRETORIO_JSON.exists():
+        return CAMINHO_DIRETORIO_JSON
+    return CAMINHO_DIRETORIO
+
+
+def obter_diretorio() -> DiretorioFuncionarios:
+    """
+    Retorna o diretório vigente, recarregando-o se o arquivo mudou.
+
+    A verificação é um ``stat`` do arquivo (CSV ou JSON, ver
+    ``caminho_diretorio``); a releitura só acontece quando o arquivo ou a data
+    de modificação é diferente do carregado.
+
+    Returns:
+        DiretorioFuncionarios atual
+    """
+    global _diretorio
+    caminho = caminho_diretorio()
+    try:
+        modificado_em = caminho.stat().st_mtime_ns
+    except FileNotFoundError:
+        modificado_em = 0
+
+    def _desatualizado() -> bool:
+        return _diretorio is None or (_diretorio.caminho, _diretorio.modificado_em) != (caminho, modificado_em)
+
+    if _desatualizado():
+        with _lock:
+            if _desatualizado():
+                _diretorio = carregar_diretorio(caminho)
+    return _diretorio
+
+
+def lojas_dos_clientes(clientes: pd.Series) -> pd.Series:
+    """
+    Loja de cada título cujo cliente é funcionário (None para os demais).
+
+    Cada cliente distinto é normalizado uma única vez por processo; trocar o
+    diretório não normaliza o dataset de novo, só refaz a busca no índice.
+
+    Args:
+        clientes: Coluna Cliente do dataset
+
+    Returns:
+        Série com a loja de cada linha, no mesmo índice de ``clientes``
+    """
+    indice = obter_diretorio().indice
+    codigos, distintos = pd.factorize(clientes)
+
+    if len(_nomes_normalizados) > MAX_NOMES_NORMALIZADOS:
+        _nomes_normalizados.clear()
+
+    lojas_distintas = []
+    for nome in distintos:
+        normalizado = _nomes_normalizados.get(nome)
+        if normalizado is None:
+            normalizado = _nomes_normalizados[nome] = normalizar_nome(nome)
+        lojas_distintas.append(indice.get(normalizado))
+
+    # O código -1 (cliente ausente) cai no None acrescentado ao final
+    lojas = np.array(lojas_distintas + [None], dtype=object)[codigos]
+    return pd.Series(lojas, index=clientes.index, dtype=object)
+
+
+_diretorio: Optional[DiretorioFuncionarios] = None
+_nomes_normalizados: Dict[str, str] = {}
+_lock = threading.Lock()
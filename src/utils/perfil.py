@@ -0,0 +1,207 @@
+# src/utils/perfil.py
+
+"""
+Perfilamento opcional de cada rerun do app.
+
+Desligado por padrão. Liga com a variável de ambiente ``RELATORIO_PERFIL`` ou
+com o parâmetro de URL ``?perfil=``:
+    - ``1``: mede o tempo de cada etapa (``with etapa("nome")``) e a variação
+      da memória residente do processo;
+    - ``memoria``: mede a memória alocada pelo Python e pelo numpy
+      (``tracemalloc``), com o acréscimo e o pico de cada etapa. O
+      ``tracemalloc`` deixa o código várias vezes mais lento, então os
+      tempos desse modo servem só para comparar etapas entre si;
+    - ``cprofile``: tempos, e um arquivo ``.prof`` do cProfile por rerun em
+      ``perfis/`` (ao lado do CSV).
+
+A memória é medida no processo inteiro: com várias sessões ativas ao mesmo
+tempo os números se misturam. O ``tracemalloc`` ligado pelo modo ``memoria``
+é desligado no primeiro rerun completo sem esse modo.
+
+Com o perfil desligado, ``etapa`` custa uma consulta ao ``session_state``.
+"""
+
+import cProfile
+import os
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+import streamlit as st
+
+from ..config import config
+
+
+# Variável de ambiente e parâmetro de URL que ligam o perfil
+VARIAVEL_AMBIENTE = "RELATORIO_PERFIL"
+PARAMETRO_URL = "perfil"
+
+MODO_TEMPOS = "1"
+MODO_MEMORIA = "memoria"
+MODO_CPROFILE = "cprofile"
+
+# Quantidade de reruns mantidos no histórico da sessão
+TAMANHO_HISTORICO = 20
+
+# Diretório dos arquivos .prof
+DIRETORIO_PERFIS = config.CAMINHO_CSV.parent / "perfis"
+
+_CHAVE_RERUN = "perfil_rerun"
+_CHAVE_HISTORICO = "perfil_historico"
+
+
+def modo_perfil() -> Optional[str]:
+    """
+    Modo de perfil pedido pela URL ou, na falta dela, pelo ambiente.
+
+    Returns:
+        MODO_TEMPOS, MODO_MEMORIA, MODO_CPROFILE ou None se desligado
+    """
+    valor = st.query_params.get(PARAMETRO_URL) or os.environ.get(VARIAVEL_AMBIENTE, "")
+    valor = valor.strip().lower()
+    if valor in (MODO_MEMORIA, MODO_CPROFILE):
+        return valor
+    if valor in ("1", "true", "sim"):
+        return MODO_TEMPOS
+    return None
+
+
+def iniciar(tipo: str, forcar: bool = False) -> None:
+    """
+    Abre o registro do rerun, se o perfil estiver ligado.
+
+    Args:
+        tipo: "completo" (rerun do app) ou "fragmento" (rerun dos filtros)
+        forcar: Descarta um registro ainda aberto (usado no rerun completo)
+    """
+    global _tracemalloc_proprio
+    modo = modo_perfil()
+    # Fora do modo memória, o tracemalloc ligado por ele deixa de pesar no processo
+    if forcar and modo != MODO_MEMORIA and _tracemalloc_proprio:
+        tracemalloc.stop()
+        _tracemalloc_proprio = False
+    if modo is None:
+        st.session_state.pop(_CHAVE_RERUN, None)
+        return
+    if not forcar and _CHAVE_RERUN in st.session_state:
+        return
+
+    if modo == MODO_MEMORIA and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _tracemalloc_proprio = True
+
+    perfilador = None
+    if modo == MODO_CPROFILE:
+        perfilador = cProfile.Profile()
+        perfilador.enable()
+
+    st.session_state[_CHAVE_RERUN] = {
+        "tipo": tipo,
+        "modo": modo,
+        "inicio": time.perf_counter(),
+        "quando": datetime.now(),
+        "etapas": [],
+        "cprofile": perfilador,
+    }
+
+
+def etapa(nome: str) -> ContextManager[None]:
+    """
+    Mede uma etapa do rerun atual.
+
+    Args:
+        nome: Nome exibido na tabela
+
+    Returns:
+        Context manager; nulo quando o perfil está desligado
+    """
+    registro = st.session_state.get(_CHAVE_RERUN)
+    if registro is None:
+        return nullcontext()
+    if registro["modo"] == MODO_MEMORIA and tracemalloc.is_tracing():
+        return _medir_alocacoes(registro["etapas"], nome)
+    return _medir(registro["etapas"], nome)
+
+
+def finalizar() -> Optional[Dict]:
+    """
+    Fecha o registro do rerun e o acrescenta ao histórico da sessão.
+
+    Returns:
+        Registro com tipo, total e etapas, ou None se o perfil está desligado
+    """
+    registro = st.session_state.pop(_CHAVE_RERUN, None)
+    if registro is None:
+        return None
+
+    registro["total_ms"] = (time.perf_counter() - registro["inicio"]) * 1000
+    perfilador = registro.pop("cprofile")
+    if perfilador is not None:
+        perfilador.disable()
+        DIRETORIO_PERFIS.mkdir(parents=True, exist_ok=True)
+        destino = DIRETORIO_PERFIS / f"rerun-{registro['quando']:%Y%m%d-%H%M%S-%f}.prof"
+        perfilador.dump_stats(destino)
+        registro["arquivo"] = str(destino)
+
+    historico = st.session_state.setdefault(_CHAVE_HISTORICO, deque(maxlen=TAMANHO_HISTORICO))
+    historico.append(registro)
+    return registro
+
+
+def historico() -> List[Dict]:
+    """Registros dos últimos reruns da sessão, do mais antigo ao mais recente."""
+    return list(st.session_state.get(_CHAVE_HISTORICO, ()))
+
+
+@contextmanager
+def _medir(etapas: List[Dict], nome: str) -> Iterator[None]:
+    memoria_inicial = _memoria_residente()
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracao = time.perf_counter() - inicio
+        memoria_final = _memoria_residente()
+        etapas.append({
+            "Etapa": nome,
+            "ms": duracao * 1000,
+            "Δ memória (MB)": (
+                (memoria_final - memoria_inicial) / 1024 / 1024
+                if memoria_inicial is not None and memoria_final is not None else None
+            ),
+            "Pico (MB)": None,
+        })
+
+
+@contextmanager
+def _medir_alocacoes(etapas: List[Dict], nome: str) -> Iterator[None]:
+    memoria_inicial, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracao = time.perf_counter() - inicio
+        memoria_final, pico = tracemalloc.get_traced_memory()
+        etapas.append({
+            "Etapa": nome,
+            "ms": duracao * 1000,
+            "Δ memória (MB)": (memoria_final - memoria_inicial) / 1024 / 1024,
+            "Pico (MB)": max(pico - memoria_inicial, 0) / 1024 / 1024,
+        })
+
+
+def _memoria_residente() -> Optional[int]:
+    """Memória residente do processo em bytes (Linux); None se indisponível."""
+    try:
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * _TAMANHO_PAGINA
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+_TAMANHO_PAGINA = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_tracemalloc_proprio = False